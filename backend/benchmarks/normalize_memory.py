@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import multiprocessing as mp
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from reconcile.models import ReconcileParams
+from reconcile.normalizers import _normalize_exchange_common, _normalize_unity
+from reconcile.parsers import _prepare_binance_to_standard
+from reconcile.profiling import _rss_bytes, _rss_sampler
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "XRPUSDT", "DOGEUSDT", "ADAUSDT"]
+EXTRA_RAW_COLS = 12
+RSS_SAMPLE_SECONDS = 0.005
+
+
+def _synthetic_unity(rows: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    ts = pd.Timestamp("2026-01-01") + pd.to_timedelta(np.sort(rng.integers(0, 30 * 86400, rows)), unit="s")
+    df = pd.DataFrame({
+        "ID": np.arange(rows),
+        "Instrument": np.asarray([f"{s[:-4]}/USDT" for s in SYMBOLS], dtype=object)[rng.integers(0, len(SYMBOLS), rows)],
+        "Side": np.where(rng.random(rows) < 0.5, "BUY", "SELL"),
+        "Transact time": ts.strftime("%d.%m.%Y %H:%M:%S (UTC+5)"),
+        "Price": np.round(rng.uniform(1, 1000, rows), 2),
+        "Absolute amount": np.round(rng.uniform(0.001, 10, rows), 3),
+        "Net commission amount": np.round(rng.uniform(0, 1, rows), 4),
+    })
+    for i in range(EXTRA_RAW_COLS):
+        df[f"Extra {i}"] = rng.integers(0, 1000, rows).astype(str)
+    return df
+
+
+def _synthetic_binance(rows: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    ts = pd.Timestamp("2026-01-01") + pd.to_timedelta(np.sort(rng.integers(0, 30 * 86400, rows)), unit="s")
+    df = pd.DataFrame({
+        "Date(UTC)": ts.strftime("%d.%m.%Y %H:%M:%S"),
+        "Pair": np.asarray(SYMBOLS, dtype=object)[rng.integers(0, len(SYMBOLS), rows)],
+        "Side": np.where(rng.random(rows) < 0.5, "BUY", "SELL"),
+        "Price": np.round(rng.uniform(1, 1000, rows), 2),
+        "Executed": np.round(rng.uniform(0.001, 10, rows), 3),
+        "Trade ID": np.arange(rows),
+        "Fee": np.round(rng.uniform(0, 1, rows), 4),
+        "Fee Coin": "USDT",
+    })
+    for i in range(EXTRA_RAW_COLS):
+        df[f"Extra {i}"] = rng.integers(0, 1000, rows).astype(str)
+    return df
+
+
+def _stage_unity(rows: int, seed: int) -> Callable[[], Any]:
+    raw = _synthetic_unity(rows, seed)
+    params = ReconcileParams()
+    return lambda: _normalize_unity(raw, params)
+
+
+def _stage_binance(rows: int, seed: int) -> Callable[[], Any]:
+    raw = _synthetic_binance(rows, seed)
+    params = ReconcileParams()
+    return lambda: _normalize_exchange_common(_prepare_binance_to_standard(raw), params)
+
+
+STAGES: Dict[str, Callable[[int, int], Callable[[], Any]]] = {
+    "normalize_unity": _stage_unity,
+    "normalize_binance": _stage_binance,
+}
+
+
+def _measure(stage: str, rows: int, seed: int, queue: Any) -> None:
+    run = STAGES[stage](rows, seed)
+    gc.collect()
+    base = _rss_bytes()
+    with _rss_sampler(RSS_SAMPLE_SECONDS) as samples:
+        t0 = time.perf_counter()
+        result = run()
+        seconds = time.perf_counter() - t0
+    del result
+
+    peak = max(base, max(r for _, r in samples))
+    delta = peak - base
+    queue.put({
+        "stage": stage,
+        "rows": rows,
+        "seconds": round(seconds, 3),
+        "rss_base_mb": round(base / 2**20, 1),
+        "rss_peak_mb": round(peak / 2**20, 1),
+        "rss_delta_mb": round(delta / 2**20, 1),
+        "rss_delta_mb_per_1m_rows": round(delta / 2**20 * 1_000_000 / max(rows, 1), 1),
+    })
+
+
+def run_benchmark(rows: int, stages: List[str], seed: int = 0) -> List[Dict[str, Any]]:
+    ctx = mp.get_context("spawn")
+    results = []
+    for stage in stages:
+        queue = ctx.Queue()
+        proc = ctx.Process(target=_measure, args=(stage, rows, seed, queue))
+        proc.start()
+        results.append(queue.get())
+        proc.join()
+    return results
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Peak RSS of reconcile normalization per 1M rows")
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--stage", action="append", choices=sorted(STAGES), default=None)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    for res in run_benchmark(args.rows, args.stage or list(STAGES), args.seed):
+        print(json.dumps(res, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
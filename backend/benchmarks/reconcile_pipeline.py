@@ -0,0 +1,417 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import hashlib
+import json
+import multiprocessing as mp
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from reconcile import ReconcileParams, prepare_reconcile_report, write_pending_report
+from reconcile.profiling import _rss_bytes, _rss_sampler
+
+BASE_SYMBOLS = [
+    "BTCUSDT", "ETHUSDT", "SOLUSDT", "XRPUSDT", "DOGEUSDT", "ADAUSDT",
+    "BNBUSDT", "TRXUSDT", "LTCUSDT", "DOTUSDT", "LINKUSDT", "AVAXUSDT",
+]
+OKX_CONTRACT_VALUES = [0.01, 0.1, 1.0, 0.001, 0.0001]
+EXCHANGE_TYPES = ["BINANCE", "OKX", "BYBIT"]
+STAGE_ORDER = [
+    "read",
+    "prepare",
+    "normalize",
+    "okx_contracts",
+    "spill",
+    "strict",
+    "fuzzy",
+    "notional",
+    "status",
+    "volume",
+    "pretty",
+    "xlsx_styling",
+    "xlsx_write",
+    "archive_write",
+]
+UNITY_OFFSET_HOURS = 5
+OKX_OFFSET_HOURS = 8
+TIME_FORMAT = "%d.%m.%Y %H:%M:%S"
+RSS_SAMPLE_SECONDS = 0.005
+DATA_DIR = Path(tempfile.gettempdir()) / "reconcile_bench"
+HISTORY_PATH = DATA_DIR / "reconcile_history.json"
+REGRESSION_TOLERANCE = 0.25
+REGRESSION_MIN_SECONDS = 0.05
+
+
+@dataclass(frozen=True)
+class SyntheticConfig:
+    rows: int = 100_000
+    symbols: int = 6
+    days: int = 3
+    split_fill_ratio: float = 0.1
+    max_split_fills: int = 4
+    time_skew_ratio: float = 0.1
+    time_skew_seconds: int = 90
+    price_noise_ratio: float = 0.05
+    missing_ratio: float = 0.02
+    extra_ratio: float = 0.02
+    seed: int = 0
+
+
+def _symbols(n: int) -> List[str]:
+    extra = [f"SYN{i}USDT" for i in range(max(n - len(BASE_SYMBOLS), 0))]
+    return (BASE_SYMBOLS + extra)[:max(n, 1)]
+
+
+def _synthetic_fills(cfg: SyntheticConfig) -> pd.DataFrame:
+    rng = np.random.default_rng(cfg.seed)
+    symbols = np.asarray(_symbols(cfg.symbols), dtype=object)
+
+    n_orders = max(int(cfg.rows / (1 + cfg.split_fill_ratio * (cfg.max_split_fills - 1) / 2)), 1)
+    fills_per_order = np.ones(n_orders, dtype=np.int64)
+    split = rng.random(n_orders) < cfg.split_fill_ratio
+    fills_per_order[split] = rng.integers(2, max(cfg.max_split_fills, 2) + 1, int(split.sum()))
+    order_idx = np.repeat(np.arange(n_orders), fills_per_order)[: cfg.rows]
+
+    order_time = pd.Timestamp("2026-01-01") + pd.to_timedelta(
+        np.sort(rng.integers(0, cfg.days * 86400, n_orders)), unit="s"
+    )
+    order_symbol = symbols[rng.integers(0, len(symbols), n_orders)]
+    order_side = np.where(rng.random(n_orders) < 0.5, "BUY", "SELL")
+    order_price = np.round(rng.uniform(0.1, 1000, n_orders), 2)
+
+    return pd.DataFrame({
+        "trade_id": np.arange(len(order_idx)) + 10_000_000,
+        "order_id": order_idx + 1_000_000,
+        "time": order_time[order_idx],
+        "symbol": order_symbol[order_idx],
+        "side": order_side[order_idx],
+        "price": order_price[order_idx],
+        "qty": rng.integers(1, 5000, len(order_idx)) / 1000,
+    })
+
+
+def _synthetic_unity(fills: pd.DataFrame, cfg: SyntheticConfig, exchange_type: str) -> pd.DataFrame:
+    rng = np.random.default_rng(cfg.seed + 1)
+    n = len(fills)
+    u = fills[rng.random(n) >= cfg.missing_ratio].copy()
+
+    skew = rng.random(len(u)) < cfg.time_skew_ratio
+    u.loc[skew, "time"] += pd.to_timedelta(
+        rng.integers(-cfg.time_skew_seconds, cfg.time_skew_seconds + 1, int(skew.sum())), unit="s"
+    )
+    noise = rng.random(len(u)) < cfg.price_noise_ratio
+    u.loc[noise, "price"] = u.loc[noise, "price"] * (1 + rng.uniform(-5e-7, 5e-7, int(noise.sum())))
+
+    n_extra = int(n * cfg.extra_ratio)
+    if n_extra:
+        extra = fills.sample(n=n_extra, random_state=cfg.seed, replace=n_extra > n).copy()
+        extra["qty"] = rng.integers(1, 5000, n_extra) / 1000
+        u = pd.concat([u, extra], ignore_index=True)
+
+    u = u.sample(frac=1.0, random_state=cfg.seed).reset_index(drop=True)
+    local = u["time"] + pd.Timedelta(hours=UNITY_OFFSET_HOURS)
+    return pd.DataFrame({
+        "ID": np.arange(len(u)) + 1,
+        "Instrument": "[" + exchange_type + "]" + u["symbol"].astype(str) + ".SPOT",
+        "Side": u["side"].to_numpy(),
+        "Transact time": local.dt.strftime(TIME_FORMAT) + f" (UTC+{UNITY_OFFSET_HOURS})",
+        "Price": u["price"].to_numpy(),
+        "Absolute amount": u["qty"].to_numpy(),
+        "Net commission amount": np.round(u["qty"].to_numpy() * u["price"].to_numpy() * 0.001, 6),
+    })
+
+
+def _okx_contract_values(cfg: SyntheticConfig) -> Dict[str, float]:
+    return {s: OKX_CONTRACT_VALUES[i % len(OKX_CONTRACT_VALUES)] for i, s in enumerate(_symbols(cfg.symbols))}
+
+
+def _synthetic_exchange(fills: pd.DataFrame, cfg: SyntheticConfig, exchange_type: str) -> pd.DataFrame:
+    utc = fills["time"].dt.strftime(TIME_FORMAT)
+    fee = np.round(fills["qty"].to_numpy() * fills["price"].to_numpy() * 0.001, 6)
+    if exchange_type == "BINANCE":
+        return pd.DataFrame({
+            "Date(UTC)": utc,
+            "Pair": fills["symbol"],
+            "Side": fills["side"],
+            "Price": fills["price"],
+            "Executed": fills["qty"],
+            "Trade ID": fills["trade_id"],
+            "Order ID": fills["order_id"],
+            "Fee": fee,
+            "Fee Coin": "USDT",
+        })
+    if exchange_type == "BYBIT":
+        return pd.DataFrame({
+            "Market": fills["symbol"],
+            "Direction": np.where(fills["side"] == "BUY", "Open Long", "Close Long"),
+            "Filled Quantity": np.round(fills["qty"] * 100, 6),
+            "Filled Price": fills["price"],
+            "Transaction Time(UTC+0)": utc,
+            "Transaction ID": fills["trade_id"],
+        })
+    cv = fills["symbol"].map(_okx_contract_values(cfg)).to_numpy()
+    return pd.DataFrame({
+        "id": fills["trade_id"],
+        "Order id": fills["order_id"],
+        "Time": (fills["time"] + pd.Timedelta(hours=OKX_OFFSET_HOURS)).dt.strftime(TIME_FORMAT),
+        "Symbol": fills["symbol"].str[:-4] + "-USDT-SWAP",
+        "Action": np.where(fills["side"] == "BUY", "Buy", "Sell"),
+        "Amount": np.round(fills["qty"].to_numpy() / cv, 6),
+        "Trading Unit": "cont",
+        "Filled Price": fills["price"],
+        "Fee": -fee,
+        "Fee Unit": "USDT",
+    })
+
+
+def _write_xlsx(df: pd.DataFrame, path: Path, title: Optional[str] = None) -> None:
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    if title:
+        ws.append([title])
+    ws.append(list(df.columns))
+    for row in df.itertuples(index=False, name=None):
+        ws.append(list(row))
+    wb.save(path)
+
+
+def _config_key(cfg: SyntheticConfig) -> str:
+    return hashlib.sha256(json.dumps([asdict(cfg), TIME_FORMAT], sort_keys=True).encode()).hexdigest()[:12]
+
+
+def generate_inputs(cfg: SyntheticConfig, exchange_type: str, data_dir: Path = DATA_DIR) -> Tuple[Path, Path]:
+    out = Path(data_dir) / f"{exchange_type.lower()}_{cfg.rows}_{_config_key(cfg)}"
+    unity_path = out / "unity.xlsx"
+    exchange_path = out / ("okx.xlsx" if exchange_type == "OKX" else f"{exchange_type.lower()}.csv")
+    if unity_path.exists() and exchange_path.exists():
+        return unity_path, exchange_path
+
+    out.mkdir(parents=True, exist_ok=True)
+    fills = _synthetic_fills(cfg)
+    exchange = _synthetic_exchange(fills, cfg, exchange_type)
+    if exchange_type == "BINANCE":
+        exchange.to_csv(exchange_path, sep=";", index=False)
+    elif exchange_type == "BYBIT":
+        exchange.to_csv(exchange_path, index=False)
+    else:
+        _write_xlsx(exchange, exchange_path, title=f"Trade history UTC+{OKX_OFFSET_HOURS}")
+    _write_xlsx(_synthetic_unity(fills, cfg, exchange_type), unity_path)
+    return unity_path, exchange_path
+
+
+def _stage_memory(spans: List[Tuple[str, float, float]], samples: List[Tuple[float, int]]) -> Dict[str, int]:
+    if not samples:
+        return {}
+    times = np.asarray([t for t, _ in samples])
+    rss = np.asarray([r for _, r in samples], dtype=np.int64)
+    peaks: Dict[str, int] = {}
+    for name, t0, t1 in spans:
+        lo = max(int(np.searchsorted(times, t0, side="left")) - 1, 0)
+        hi = max(int(np.searchsorted(times, t1, side="right")), lo + 1)
+        peaks[name] = max(peaks.get(name, 0), int(rss[lo:hi].max()))
+    return peaks
+
+
+def _measure(
+    unity_path: Path,
+    exchange_path: Path,
+    exchange_type: str,
+    params_dict: Dict[str, Any],
+    report_dir: Path,
+    queue: Any,
+) -> None:
+    params = ReconcileParams(**params_dict)
+    gc.collect()
+    base = _rss_bytes()
+    with _rss_sampler(RSS_SAMPLE_SECONDS) as samples:
+        t0 = time.perf_counter()
+        pending = prepare_reconcile_report(unity_path, exchange_path, report_dir, exchange_type, params)
+        result = write_pending_report(pending)
+        seconds = time.perf_counter() - t0
+
+    peaks = _stage_memory(pending.timings.spans, samples)
+    stages = {
+        name: {
+            "seconds": round(pending.timings.seconds[name], 3),
+            "rows": pending.timings.rows.get(name, 0),
+            "rss_peak_mb": round(peaks.get(name, base) / 2**20, 1),
+            "rss_delta_mb": round((peaks.get(name, base) - base) / 2**20, 1),
+        }
+        for name in sorted(pending.timings.seconds, key=lambda s: STAGE_ORDER.index(s) if s in STAGE_ORDER else len(STAGE_ORDER))
+    }
+    summary = result.summary
+    queue.put({
+        "rows_exchange": summary.rows_exchange,
+        "rows_unity": summary.rows_unity,
+        "matched_strict": summary.matched_strict,
+        "matched_fuzzy": summary.matched_fuzzy,
+        "matched_notional": summary.matched_notional,
+        "missing_in_unity": summary.missing_in_unity,
+        "extra_in_unity": summary.extra_in_unity,
+        "total_seconds": round(seconds, 3),
+        "rss_base_mb": round(base / 2**20, 1),
+        "rss_peak_mb": round(max(r for _, r in samples) / 2**20, 1),
+        "stages": stages,
+    })
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return out.stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(
+    cfg: SyntheticConfig,
+    exchange_type: str,
+    params_dict: Optional[Dict[str, Any]] = None,
+    data_dir: Path = DATA_DIR,
+) -> Dict[str, Any]:
+    params_dict = dict(params_dict or {})
+    unity_path, exchange_path = generate_inputs(cfg, exchange_type, data_dir)
+    report_dir = Path(tempfile.mkdtemp(prefix="reconcile_bench_report_"))
+    try:
+        ctx = mp.get_context("spawn")
+        queue = ctx.Queue()
+        proc = ctx.Process(
+            target=_measure, args=(unity_path, exchange_path, exchange_type, params_dict, report_dir, queue)
+        )
+        proc.start()
+        measured = queue.get()
+        proc.join()
+    finally:
+        shutil.rmtree(report_dir, ignore_errors=True)
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_revision": _git_revision(),
+        "exchange_type": exchange_type,
+        "config": asdict(cfg),
+        "params": params_dict,
+        **measured,
+    }
+
+
+def _history_key(entry: Dict[str, Any]) -> str:
+    return json.dumps([entry["exchange_type"], entry["config"], entry["params"]], sort_keys=True)
+
+
+def load_history(path: Path = HISTORY_PATH) -> List[Dict[str, Any]]:
+    if not path.exists():
+        return []
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def append_history(entries: List[Dict[str, Any]], path: Path = HISTORY_PATH) -> None:
+    history = load_history(path) + entries
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(history, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def find_regressions(
+    entry: Dict[str, Any],
+    history: List[Dict[str, Any]],
+    tolerance: float = REGRESSION_TOLERANCE,
+) -> List[str]:
+    key = _history_key(entry)
+    previous = [h for h in history if _history_key(h) == key]
+    if not previous:
+        return []
+    prev = previous[-1]
+
+    out: List[str] = []
+    checks = [("total", prev.get("total_seconds", 0.0), entry["total_seconds"])]
+    checks += [
+        (name, prev.get("stages", {}).get(name, {}).get("seconds", 0.0), s["seconds"])
+        for name, s in entry["stages"].items()
+    ]
+    for name, before, now in checks:
+        if before >= REGRESSION_MIN_SECONDS and now > before * (1 + tolerance):
+            out.append(f"{entry['exchange_type']} {name}: {before:.3f}s -> {now:.3f}s")
+    before_mb, now_mb = prev.get("rss_peak_mb", 0.0), entry["rss_peak_mb"]
+    if before_mb and now_mb > before_mb * (1 + tolerance):
+        out.append(f"{entry['exchange_type']} rss_peak: {before_mb:.1f}MB -> {now_mb:.1f}MB")
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Per-stage timings and peak RSS of the reconcile pipeline on synthetic exports")
+    ap.add_argument("--rows", type=int, default=SyntheticConfig.rows)
+    ap.add_argument("--exchange", action="append", choices=EXCHANGE_TYPES, default=None)
+    ap.add_argument("--symbols", type=int, default=SyntheticConfig.symbols)
+    ap.add_argument("--days", type=int, default=SyntheticConfig.days)
+    ap.add_argument("--split-fill-ratio", type=float, default=SyntheticConfig.split_fill_ratio)
+    ap.add_argument("--time-skew-ratio", type=float, default=SyntheticConfig.time_skew_ratio)
+    ap.add_argument("--time-skew-seconds", type=int, default=SyntheticConfig.time_skew_seconds)
+    ap.add_argument("--price-noise-ratio", type=float, default=SyntheticConfig.price_noise_ratio)
+    ap.add_argument("--missing-ratio", type=float, default=SyntheticConfig.missing_ratio)
+    ap.add_argument("--extra-ratio", type=float, default=SyntheticConfig.extra_ratio)
+    ap.add_argument("--seed", type=int, default=SyntheticConfig.seed)
+    ap.add_argument("--params-json", default="{}", help="ReconcileParams overrides, e.g. '{\"execution_mode\": \"chunked\"}'")
+    ap.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    ap.add_argument("--history", type=Path, default=HISTORY_PATH)
+    ap.add_argument("--no-history", action="store_true")
+    ap.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE)
+    ap.add_argument("--fail-on-regression", action="store_true")
+    args = ap.parse_args()
+
+    cfg = SyntheticConfig(
+        rows=args.rows,
+        symbols=args.symbols,
+        days=args.days,
+        split_fill_ratio=args.split_fill_ratio,
+        time_skew_ratio=args.time_skew_ratio,
+        time_skew_seconds=args.time_skew_seconds,
+        price_noise_ratio=args.price_noise_ratio,
+        missing_ratio=args.missing_ratio,
+        extra_ratio=args.extra_ratio,
+        seed=args.seed,
+    )
+    params_dict = json.loads(args.params_json)
+    history = load_history(args.history)
+
+    entries = []
+    regressions: List[str] = []
+    for exchange_type in args.exchange or EXCHANGE_TYPES:
+        entry = run_benchmark(cfg, exchange_type, params_dict, args.data_dir)
+        regressions += find_regressions(entry, history, args.tolerance)
+        entries.append(entry)
+        print(json.dumps(entry, ensure_ascii=False))
+
+    if not args.no_history:
+        append_history(entries, args.history)
+    for msg in regressions:
+        print(f"REGRESSION {msg}", file=sys.stderr)
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -20,3 +20,8 @@ TEMP_DIR = str(_BACKEND_DIR / "temp_uploads")
 
 CACHE_TTL_MINUTES = int(os.getenv("CACHE_TTL_MINUTES", "30"))
 CACHE_MAX_ITEMS = int(os.getenv("CACHE_MAX_ITEMS", "15"))
+
+PARSE_CACHE_DIR = str(_BACKEND_DIR / "client_reports" / "parse_cache")
+PARSE_CACHE_MAX_MB = int(os.getenv("PARSE_CACHE_MAX_MB", "2048"))
+
+REPORT_EXPORT_WORKERS = int(os.getenv("REPORT_EXPORT_WORKERS", "1"))
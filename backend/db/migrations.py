@@ -189,6 +189,18 @@ def init_database():
             safe_ddl(cur, "CREATE INDEX IF NOT EXISTS idx_podft_snapshot_trades_value_date ON podft_snapshot_trades(value_date)")
             safe_ddl(cur, "CREATE INDEX IF NOT EXISTS idx_podft_snapshot_trades_created_at ON podft_snapshot_trades(created_at DESC)")
 
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS okx_contract_values (
+                    symbol TEXT PRIMARY KEY,
+                    contract_value DOUBLE PRECISION NOT NULL,
+                    confidence DOUBLE PRECISION NOT NULL DEFAULT 0,
+                    samples INTEGER NOT NULL DEFAULT 1,
+                    last_seen DATE,
+                    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+                )
+            """)
+            safe_ddl(cur, "CREATE INDEX IF NOT EXISTS idx_okx_contract_values_last_seen ON okx_contract_values(last_seen DESC)")
+
         log.info("Core DB initialized.")
     except Exception as e:
         log.error("init_database error: %s", e, exc_info=True)
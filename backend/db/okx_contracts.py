@@ -0,0 +1,55 @@
+import logging
+from typing import Optional
+
+from psycopg2.extras import RealDictCursor
+
+from core.database import get_db_connection
+
+log = logging.getLogger(__name__)
+
+
+def get_okx_contract_values() -> Optional[list]:
+    conn = get_db_connection()
+    if not conn:
+        return None
+    try:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(
+                "SELECT symbol, contract_value, confidence, samples, last_seen FROM okx_contract_values ORDER BY symbol"
+            )
+            return [dict(r) for r in cur.fetchall()]
+    except Exception as e:
+        log.error("get_okx_contract_values error: %s", e, exc_info=True)
+        return None
+    finally:
+        conn.close()
+
+
+def save_okx_contract_values(values: list) -> int:
+    conn = get_db_connection()
+    if not conn:
+        return 0
+    try:
+        with conn.cursor() as cur:
+            for v in values:
+                cur.execute(
+                    """
+                    INSERT INTO okx_contract_values (symbol, contract_value, confidence, samples, last_seen)
+                    VALUES (%s, %s, %s, %s, %s)
+                    ON CONFLICT (symbol) DO UPDATE SET
+                        contract_value = EXCLUDED.contract_value,
+                        confidence     = EXCLUDED.confidence,
+                        samples        = EXCLUDED.samples,
+                        last_seen      = GREATEST(okx_contract_values.last_seen, EXCLUDED.last_seen),
+                        updated_at     = NOW()
+                    """,
+                    (v["symbol"], v["contract_value"], v["confidence"], v["samples"], v["last_seen"]),
+                )
+        conn.commit()
+        return len(values)
+    except Exception as e:
+        log.error("save_okx_contract_values error: %s", e, exc_info=True)
+        conn.rollback()
+        return 0
+    finally:
+        conn.close()
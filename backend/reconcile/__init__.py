@@ -1,10 +1,30 @@
-from .models import ReconcileParams, ReconcileSummary, ReconcileResult
-from .engine import reconcile_to_report, reconcile_to_report_with_preview
+from .cache import ParsedUploadCache
+from .contracts import OKX_CONTRACT_REGISTRY, OkxContractRegistry
+from .models import BatchReconcileResult, PendingReport, ReconcileParams, ReconcileSummary, ReconcileResult
+from .engine import (
+    prepare_reconcile_report,
+    reconcile_to_report,
+    reconcile_to_report_with_preview,
+    write_pending_report,
+)
+from .batch import reconcile_batch_to_report
+from .results import RESULT_TABLES, read_result_page, save_result_tables
 
 __all__ = [
+    "ParsedUploadCache",
+    "OKX_CONTRACT_REGISTRY",
+    "OkxContractRegistry",
+    "PendingReport",
     "ReconcileParams",
     "ReconcileSummary",
     "ReconcileResult",
+    "BatchReconcileResult",
     "reconcile_to_report",
+    "reconcile_batch_to_report",
     "reconcile_to_report_with_preview",
+    "prepare_reconcile_report",
+    "write_pending_report",
+    "RESULT_TABLES",
+    "read_result_page",
+    "save_result_tables",
 ]
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .cache import ParsedUploadCache
+from .engine import (
+    _execution_mode,
+    _finish_reconcile,
+    _load_exchange_standard,
+    _load_unity_raw,
+    _normalize_inputs,
+    _strict_match,
+    _write_pending_report,
+)
+from .models import BatchReconcileResult, PendingReport, ReconcileParams, ReconcileResult, StageTimings
+from .normalizers import _normalize_unity
+from .profiling import _stage, _stage_rows
+from .reporter import _export_batch_report, _report_suffix
+from .results import save_result_tables
+from .utils import _extract_venue_from_unity, _map_symbols
+
+BATCH_EXCHANGE_TYPES = ("BINANCE", "OKX", "BYBIT")
+UNITY_VENUE_ALIASES: Dict[str, str] = {"OKEX": "OKX"}
+
+
+def _batch_exchanges(exchange_files: Sequence[Tuple[str, Path]]) -> List[Tuple[str, Path]]:
+    out: List[Tuple[str, Path]] = []
+    for exchange_type, path in exchange_files:
+        t = (exchange_type or "").upper().strip()
+        if t not in BATCH_EXCHANGE_TYPES:
+            raise ValueError(f"Unsupported exchange_type: {exchange_type}")
+        if any(t == seen for seen, _ in out):
+            raise ValueError(f"Duplicate exchange_type in batch: {t}")
+        out.append((t, Path(path)))
+    if not out:
+        raise ValueError("Batch reconcile needs at least one exchange file")
+    return out
+
+
+def _unity_venues(unity_raw: pd.DataFrame) -> np.ndarray:
+    venues = _map_symbols(unity_raw["Instrument"], _extract_venue_from_unity).to_numpy(dtype=object)
+    return np.array([UNITY_VENUE_ALIASES.get(v, v) for v in venues], dtype=object)
+
+
+def _prepare_venue(
+    unity_raw: pd.DataFrame,
+    unity_part: pd.DataFrame,
+    used_unity_offset: int,
+    exchange_type: str,
+    exchange_path: Path,
+    report_dir: Path,
+    params: ReconcileParams,
+    parse_cache: Optional[ParsedUploadCache],
+    unity_reused: Sequence[str],
+) -> PendingReport:
+    reused_stages: List[str] = list(unity_reused)
+    timings = StageTimings(profile=params.profile_stages)
+    exchange_raw, tz = _load_exchange_standard(exchange_path, exchange_type, params, parse_cache, reused_stages, timings)
+    unity_raw_part = unity_raw.loc[unity_part.index] if params.export_debug_sheets else unity_raw.iloc[:0]
+    exchange_name, unity_raw_part, exchange_raw, unity_n, exchange_n, contract_map, used_unity_offset = _normalize_inputs(
+        unity_raw_part, exchange_raw, exchange_type, params, tz, timings, unity_norm=(unity_part, used_unity_offset)
+    )
+    stage = (
+        exchange_name, unity_raw_part, exchange_raw, unity_n, exchange_n, contract_map, used_unity_offset,
+        *_strict_match(unity_n, exchange_n, params, timings),
+    )
+    return _finish_reconcile(stage, report_dir, params, reused_stages, timings)
+
+
+def _reconcile_venue(
+    unity_raw: pd.DataFrame,
+    unity_part: pd.DataFrame,
+    used_unity_offset: int,
+    exchange_type: str,
+    exchange_path: Path,
+    report_dir: Path,
+    params: ReconcileParams,
+    parse_cache: Optional[ParsedUploadCache],
+    unity_reused: Sequence[str],
+) -> Tuple[PendingReport, ReconcileResult, Path]:
+    pending = _prepare_venue(
+        unity_raw,
+        unity_part,
+        used_unity_offset,
+        exchange_type,
+        exchange_path,
+        report_dir,
+        params,
+        parse_cache,
+        unity_reused,
+    )
+    return pending, _write_pending_report(pending), save_result_tables(pending)
+
+
+def _run_batch(
+    unity_xlsx_path: Path,
+    exchange_files: Sequence[Tuple[str, Path]],
+    report_dir: Path,
+    params: ReconcileParams,
+    parse_cache: Optional[ParsedUploadCache] = None,
+) -> BatchReconcileResult:
+    if _execution_mode(params) == "chunked":
+        raise ValueError("Batch reconcile does not support execution_mode=chunked")
+    exchanges = _batch_exchanges(exchange_files)
+
+    timings = StageTimings(profile=params.profile_stages)
+    unity_reused: List[str] = []
+    unity_raw = _load_unity_raw(unity_xlsx_path, params, parse_cache, unity_reused, timings)
+    with _stage(timings, "normalize"):
+        unity_n, used_unity_offset = _normalize_unity(unity_raw, params)
+        venues = _unity_venues(unity_raw)
+    _stage_rows(timings, "normalize", len(unity_n))
+
+    workers = int(params.batch_workers) if int(params.batch_workers) > 0 else len(exchanges)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reconcile-batch") as pool:
+        futures = {
+            exchange_type: pool.submit(
+                _reconcile_venue,
+                unity_raw,
+                unity_n.take(np.flatnonzero(venues == exchange_type)),
+                used_unity_offset,
+                exchange_type,
+                exchange_path,
+                report_dir,
+                params,
+                parse_cache,
+                unity_reused,
+            )
+            for exchange_type, exchange_path in exchanges
+        }
+        done = {exchange_type: f.result() for exchange_type, f in futures.items()}
+
+    unassigned = unity_n.take(np.flatnonzero(~np.isin(venues, [t for t, _ in exchanges])))
+    batch_id = str(uuid.uuid4())
+    report_path = report_dir / f"unity_batch_{batch_id}{_report_suffix(params)}"
+    _export_batch_report(
+        report_path,
+        summaries={p.summary.exchange_name: r.summary for p, r, _ in done.values()},
+        tables={p.summary.exchange_name: p.tables for p, _, _ in done.values()},
+        unassigned_unity=unassigned,
+        rows_unity=int(len(unity_n)),
+        params=params,
+        timings=timings,
+    )
+    return BatchReconcileResult(
+        batch_id=batch_id,
+        report_path=report_path,
+        results={exchange_type: r for exchange_type, (_, r, _) in done.items()},
+        rows_unity=int(len(unity_n)),
+        rows_unity_unassigned=int(len(unassigned)),
+        tables_dirs={exchange_type: d for exchange_type, (_, _, d) in done.items()},
+    )
+
+
+def reconcile_batch_to_report(
+    unity_xlsx_path: Path,
+    exchange_files: Sequence[Tuple[str, Path]],
+    report_dir: Path,
+    params: Optional[ReconcileParams] = None,
+    parse_cache: Optional[ParsedUploadCache] = None,
+) -> BatchReconcileResult:
+    return _run_batch(unity_xlsx_path, exchange_files, report_dir, params or ReconcileParams(), parse_cache)
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+log = logging.getLogger(__name__)
+
+CACHE_FORMAT_VERSION = 2
+
+
+@lru_cache(maxsize=64)
+def _file_sha256_cached(path: str, size: int, mtime_ns: int) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _file_sha256(path: Path) -> str:
+    st = os.stat(path)
+    return _file_sha256_cached(str(path), st.st_size, st.st_mtime_ns)
+
+
+def _make_cache_key(*parts: Any) -> str:
+    raw = json.dumps([CACHE_FORMAT_VERSION, *parts], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _restore_object_nans(df: pd.DataFrame) -> pd.DataFrame:
+    for c in df.columns:
+        if df[c].dtype == object:
+            df[c] = df[c].where(df[c].notna(), np.nan)
+    return df
+
+
+class ParsedUploadCache:
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self.root = Path(root)
+        self.max_bytes = int(max_bytes)
+        self._lock = threading.Lock()
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _entry_dir(self, key: str) -> Path:
+        return self.root / key
+
+    def get_frames(self, key: str) -> Optional[Tuple[Dict[str, pd.DataFrame], Dict[str, Any]]]:
+        entry = self._entry_dir(key)
+        meta_path = entry / "meta.json"
+        with self._lock:
+            if not meta_path.exists():
+                return None
+            os.utime(entry, None)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            frames = {
+                name: _restore_object_nans(pd.read_parquet(entry / f"{name}.parquet"))
+                for name in meta.get("frames", [])
+            }
+        except Exception as e:
+            log.warning("parse cache entry %s is unreadable, dropping: %s", key, e)
+            with self._lock:
+                shutil.rmtree(entry, ignore_errors=True)
+            return None
+        return frames, meta.get("meta", {})
+
+    def put_frames(self, key: str, frames: Dict[str, pd.DataFrame], meta: Optional[Dict[str, Any]] = None) -> bool:
+        tmp = self.root / f".tmp_{key}_{uuid.uuid4().hex}"
+        try:
+            tmp.mkdir(parents=True)
+            for name, df in frames.items():
+                df.to_parquet(tmp / f"{name}.parquet", index=True)
+            (tmp / "meta.json").write_text(
+                json.dumps({"frames": list(frames.keys()), "meta": meta or {}}, ensure_ascii=False, default=str),
+                encoding="utf-8",
+            )
+        except Exception as e:
+            log.info("parse cache skipped for %s: %s", key, e)
+            shutil.rmtree(tmp, ignore_errors=True)
+            return False
+
+        with self._lock:
+            entry = self._entry_dir(key)
+            shutil.rmtree(entry, ignore_errors=True)
+            os.replace(tmp, entry)
+            self._evict_locked()
+        return True
+
+    def _evict_locked(self) -> None:
+        entries = []
+        total = 0
+        for p in self.root.iterdir():
+            if not p.is_dir() or p.name.startswith(".tmp_"):
+                continue
+            size = sum(f.stat().st_size for f in p.iterdir() if f.is_file())
+            entries.append((p.stat().st_mtime, size, p))
+            total += size
+
+        entries.sort()
+        while total > self.max_bytes and len(entries) > 1:
+            _, size, p = entries.pop(0)
+            shutil.rmtree(p, ignore_errors=True)
+            total -= size
@@ -0,0 +1,531 @@
+from __future__ import annotations
+
+import shutil
+import uuid
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from .cache import ParsedUploadCache, _restore_object_nans
+from .contracts import _contract_registry
+from .engine import (
+    _combine_matches,
+    _exchange_settings,
+    _match_residuals,
+    _merge_fuzzy_stats,
+    _time_range_warning,
+    _volume_counts,
+)
+from .matcher import _fuzzy_strategy, _reconcile_multiset_by_key
+from .models import PendingReport, ReconcileParams, ReconcileSummary, StageTimings
+from .normalizers import (
+    MATCH_KEY_PARTS,
+    TICK_SOURCES,
+    UNITY_USECOLS,
+    _assign_notional_codes,
+    _infer_okx_contract_value_map,
+    _match_key_display,
+    _normalize_exchange_common,
+    _normalize_unity,
+    _pack_key_codes,
+    _unity_for_exchange,
+)
+from .parsers import (
+    BINANCE_COLUMNS,
+    BYBIT_COLUMNS,
+    OKX_COLUMNS,
+    _prepare_binance_to_standard,
+    _prepare_bybit_to_standard,
+    _prepare_okx_to_standard,
+    _text_cols,
+    _usecols,
+)
+from .profiling import _stage, _stage_profile, _stage_rows
+from .readers import _iter_exchange_file, _iter_okx_xlsx, _iter_unity_xlsx
+from .reporter import _build_pretty_tables, _report_suffix, _to_arrow, _volume_pretty
+from .results import RESULT_ROW_GROUP_ROWS
+from .utils import _qround_float, _to_numeric_series
+from .volume import _agg_volume, _compare_volume, _merge_volume_aggs, _volume_levels
+
+CHUNK_ROW_GROUP_ROWS = 65_536
+CHUNK_BUCKET_SLACK_SECONDS = 60
+CHUNKED_XLSX_DETAIL_ROWS = 100_000
+CHUNKED_PART_TABLES = {"matches": "matched", "missing": "missing", "extra": "extra"}
+STRICT_KEY_COLUMNS = [
+    *MATCH_KEY_PARTS, *(TICK_SOURCES[p][0] for p in MATCH_KEY_PARTS if p in TICK_SOURCES), "trade_dt_utc"
+]
+
+SpillGroup = Tuple[Path, int, Optional[int], Optional[int]]
+
+
+def _spill_run(df: pd.DataFrame, path: Path, groups: List[SpillGroup]) -> None:
+    if df.empty:
+        return
+    df = df.sort_values("trade_dt_utc", kind="mergesort", na_position="last")
+    t = df["trade_dt_utc"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+    n_valid = int(df["trade_dt_utc"].notna().sum())
+    table = _to_arrow(df, preserve_index=True)
+
+    with pq.ParquetWriter(path, table.schema) as writer:
+        rg = 0
+        for start in range(0, n_valid, CHUNK_ROW_GROUP_ROWS):
+            stop = min(start + CHUNK_ROW_GROUP_ROWS, n_valid)
+            writer.write_table(table.slice(start, stop - start), row_group_size=stop - start)
+            groups.append((path, rg, int(t[start]), int(t[stop - 1])))
+            rg += 1
+        if n_valid < len(df):
+            writer.write_table(table.slice(n_valid), row_group_size=len(df) - n_valid)
+            groups.append((path, rg, None, None))
+
+
+def _spill_frame(df: pd.DataFrame, spill_dir: Path, side: str, chunk_rows: int, groups: List[SpillGroup]) -> None:
+    for start in range(0, len(df), chunk_rows):
+        seq = len({g[0] for g in groups})
+        _spill_run(df.iloc[start:start + chunk_rows], spill_dir / f"{side}-{seq:05d}.parquet", groups)
+
+
+def _parquet_file(path: Path, files: Dict[Path, pq.ParquetFile]) -> pq.ParquetFile:
+    pf = files.get(path)
+    if pf is None:
+        pf = files[path] = pq.ParquetFile(path)
+    return pf
+
+
+def _read_groups(groups: List[SpillGroup], files: Dict[Path, pq.ParquetFile]) -> pd.DataFrame:
+    frames = [_parquet_file(path, files).read_row_group(rg).to_pandas() for path, rg, _, _ in groups]
+    if not frames:
+        return pd.DataFrame()
+    return _restore_object_nans(pd.concat(frames) if len(frames) > 1 else frames[0])
+
+
+def _read_key_columns(groups: List[SpillGroup], files: Dict[Path, pq.ParquetFile]) -> Tuple[pd.DataFrame, np.ndarray]:
+    frames = []
+    owners = []
+    for g, (path, rg, _, _) in enumerate(groups):
+        frames.append(_parquet_file(path, files).read_row_group(rg, columns=STRICT_KEY_COLUMNS, use_pandas_metadata=True).to_pandas())
+        owners.append(np.full(len(frames[-1]), g, dtype=np.int32))
+    if not frames:
+        return pd.DataFrame(columns=STRICT_KEY_COLUMNS), np.empty(0, dtype=np.int32)
+    df = _restore_object_nans(pd.concat(frames) if len(frames) > 1 else frames[0])
+    order = np.argsort(df.index.to_numpy(), kind="mergesort")
+    return df.take(order), np.concatenate(owners)[order]
+
+
+def _read_window(groups: List[SpillGroup], files: Dict[Path, pq.ParquetFile], lo: int, hi: int) -> pd.DataFrame:
+    df = _read_groups([g for g in groups if g[2] is not None and g[3] >= lo and g[2] < hi], files)
+    if df.empty:
+        return df
+    t = df["trade_dt_utc"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+    return df[(t >= lo) & (t < hi)]
+
+
+def _iter_exchange_standard(
+    exchange_path: Path,
+    exchange_type: str,
+    params: ReconcileParams,
+    timings: Optional[StageTimings] = None,
+) -> Iterator[Tuple[pd.DataFrame, Optional[int]]]:
+    chunk_rows = max(int(params.chunk_rows), 1)
+    if exchange_type == "OKX":
+        reader = _iter_okx_xlsx(exchange_path, _usecols(OKX_COLUMNS), chunk_rows)
+        prepare = _prepare_okx_to_standard
+    else:
+        columns = BINANCE_COLUMNS if exchange_type == "BINANCE" else BYBIT_COLUMNS
+        prepare = _prepare_binance_to_standard if exchange_type == "BINANCE" else _prepare_bybit_to_standard
+        delimiter = params.binance_delimiter if exchange_type == "BINANCE" else None
+        reader = (
+            (raw, None)
+            for raw in _iter_exchange_file(exchange_path, delimiter, _usecols(columns), _text_cols(columns), chunk_rows)
+        )
+    while True:
+        with _stage(timings, "read"):
+            item = next(reader, None)
+        if item is None:
+            return
+        raw, tz = item
+        _stage_rows(timings, "read", len(raw))
+        with _stage(timings, "prepare"):
+            std = prepare(raw)
+        _stage_rows(timings, "prepare", len(std))
+        yield std, tz
+
+
+def _unity_symbol_totals(unity_n: pd.DataFrame) -> pd.DataFrame:
+    return unity_n.groupby("symbol").agg(qty=("qty", "sum"), trade_dt_utc=("trade_dt_utc", "max"))
+
+
+def _okx_symbol_totals(okx_std: pd.DataFrame) -> pd.DataFrame:
+    qty = _to_numeric_series(okx_std["Quantity"]).abs().rename("Quantity")
+    return qty.groupby([okx_std["Symbol"], okx_std["Side"]], dropna=False, sort=False).sum().reset_index()
+
+
+def _spill_inputs(
+    unity_xlsx_path: Path,
+    exchange_path: Path,
+    exchange_type: str,
+    params: ReconcileParams,
+    spill_dir: Path,
+    timings: Optional[StageTimings] = None,
+) -> Tuple[str, Optional[Dict[str, float]], int, List[SpillGroup], List[SpillGroup]]:
+    chunk_rows = max(int(params.chunk_rows), 1)
+    unity_params = params
+    used_unity_offset = 0
+    u_groups: List[SpillGroup] = []
+    u_totals: List[pd.DataFrame] = []
+    reader = _iter_unity_xlsx(unity_xlsx_path, None if params.export_debug_sheets else UNITY_USECOLS, chunk_rows)
+    while True:
+        with _stage(timings, "read"):
+            unity_raw = next(reader, None)
+        if unity_raw is None:
+            break
+        _stage_rows(timings, "read", len(unity_raw))
+        with _stage(timings, "normalize"):
+            unity_n, used_unity_offset = _normalize_unity(unity_raw, unity_params)
+            unity_n = _unity_for_exchange(unity_n, exchange_type, params)
+        _stage_rows(timings, "normalize", len(unity_n))
+        if unity_params.unity_utc_offset_hours is None and unity_raw["Transact time"].notna().any():
+            unity_params = replace(params, unity_utc_offset_hours=used_unity_offset)
+        if exchange_type == "OKX":
+            u_totals.append(_unity_symbol_totals(unity_n))
+        with _stage(timings, "spill"):
+            _spill_frame(unity_n, spill_dir, "unity", chunk_rows, u_groups)
+
+    exchange_name, exchange_offset, symbol_mapper, action_filter = _exchange_settings(exchange_type, params, None)
+    contract_map: Optional[Dict[str, float]] = None
+    chunks = _iter_exchange_standard(exchange_path, exchange_type, params, timings)
+    if exchange_type == "OKX":
+        stash: List[Path] = []
+        e_totals: List[pd.DataFrame] = []
+        tz: Optional[int] = None
+        for exchange_std, tz in chunks:
+            e_totals.append(_okx_symbol_totals(exchange_std))
+            stash.append(spill_dir / f"okx-std-{len(stash):05d}.pkl")
+            with _stage(timings, "spill"):
+                exchange_std.to_pickle(stash[-1])
+        exchange_name, exchange_offset, symbol_mapper, action_filter = _exchange_settings(exchange_type, params, tz)
+        okx_totals = pd.concat(e_totals, ignore_index=True)
+        with _stage(timings, "okx_contracts"):
+            contract_map = _infer_okx_contract_value_map(
+                pd.concat(u_totals).rename_axis("symbol").reset_index(),
+                okx_totals,
+                symbol_mapper,
+                action_filter,
+                params,
+                _contract_registry(params),
+            )
+        _stage_rows(timings, "okx_contracts", len(okx_totals))
+        chunks = ((pd.read_pickle(path), tz) for path in stash)
+
+    ex_groups: List[SpillGroup] = []
+    for exchange_std, _ in chunks:
+        trading_unit_col = "Trading Unit" if exchange_type == "OKX" and "Trading Unit" in exchange_std.columns else None
+        with _stage(timings, "normalize"):
+            exchange_n = _normalize_exchange_common(
+                exchange_std,
+                params,
+                time_offset_hours=exchange_offset,
+                symbol_mapper=symbol_mapper,
+                action_filter=action_filter,
+                contract_value_map=contract_map,
+                trading_unit_col=trading_unit_col,
+            )
+        _stage_rows(timings, "normalize", len(exchange_n))
+        with _stage(timings, "spill"):
+            _spill_frame(exchange_n, spill_dir, "exchange", chunk_rows, ex_groups)
+
+    return exchange_name, contract_map, used_unity_offset, u_groups, ex_groups
+
+
+def _global_strict(
+    u_groups: List[SpillGroup],
+    ex_groups: List[SpillGroup],
+    files: Dict[Path, pq.ParquetFile],
+    params: ReconcileParams,
+    timings: Optional[StageTimings] = None,
+) -> Tuple[pd.DataFrame, pd.Series]:
+    unity_k, u_owner = _read_key_columns(u_groups, files)
+    exchange_k, _ = _read_key_columns(ex_groups, files)
+    owner = pd.Series(u_owner, index=unity_k.index)
+    if unity_k.empty or exchange_k.empty:
+        return pd.DataFrame(columns=["exchange_idx", "unity_idx", "key"]), owner
+
+    _stage_rows(timings, "strict", len(unity_k) + len(exchange_k))
+    with _stage(timings, "strict"):
+        unity_k["match_code"], exchange_k["match_code"] = _pack_key_codes(unity_k, exchange_k, MATCH_KEY_PARTS, params)
+        matched, _, _ = _reconcile_multiset_by_key(unity_k, exchange_k, "match_code")
+        if not matched.empty:
+            matched["key"] = _match_key_display(exchange_k.loc[matched["exchange_idx"]], params).to_numpy()
+    return matched, owner
+
+
+def _strict_partners(
+    new_u: pd.DataFrame,
+    unity_idx: np.ndarray,
+    owner: pd.Series,
+    u_groups: List[SpillGroup],
+    files: Dict[Path, pq.ParquetFile],
+) -> pd.DataFrame:
+    pos = new_u.index.get_indexer(unity_idx)
+    local = new_u.take(pos[pos >= 0])
+    far = unity_idx[pos < 0]
+    if not len(far):
+        return local
+    fetched = _read_groups([u_groups[g] for g in np.unique(owner.loc[far].to_numpy())], files)
+    return _concat_rows(local, fetched.loc[far])
+
+
+def _match_window(
+    unity_w: pd.DataFrame,
+    exchange_w: pd.DataFrame,
+    params: ReconcileParams,
+    fuzzy_stats: Dict[str, Any],
+    timings: Optional[StageTimings] = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    _assign_notional_codes(unity_w, exchange_w, params)
+    return _match_residuals(exchange_w, exchange_w, unity_w, params, fuzzy_stats, timings)
+
+
+def _unmatched(df: pd.DataFrame, matched: pd.Index) -> pd.DataFrame:
+    if df.empty or not len(matched):
+        return df
+    return df.take(np.flatnonzero(matched.get_indexer(df.index) < 0))
+
+
+def _concat_rows(*frames: pd.DataFrame) -> pd.DataFrame:
+    frames = tuple(f for f in frames if not f.empty)
+    return pd.concat(frames) if frames else pd.DataFrame()
+
+
+def _split_carry(df: pd.DataFrame, cut: Optional[int]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    if cut is None or df.empty:
+        return df.iloc[:0], df
+    keep = (df["trade_dt_utc"] >= pd.Timestamp(cut)).to_numpy()
+    return df[keep], df[~keep]
+
+
+def _write_part(parts_dir: Path, name: str, seq: int, df: Optional[pd.DataFrame]) -> None:
+    if df is None or df.empty:
+        return
+    out = parts_dir / name
+    out.mkdir(parents=True, exist_ok=True)
+    pq.write_table(
+        _to_arrow(df, preserve_index=False), out / f"part-{seq:05d}.parquet", row_group_size=RESULT_ROW_GROUP_ROWS
+    )
+
+
+def _read_parts_head(parts_dir: Path, name: str, limit: int) -> pd.DataFrame:
+    frames = []
+    total = 0
+    for path in sorted((parts_dir / name).glob("part-*.parquet")):
+        if total >= limit:
+            break
+        df = _restore_object_nans(pd.read_parquet(path))
+        frames.append(df.head(limit - total))
+        total += len(frames[-1])
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def _prepare_reconcile_chunked(
+    unity_xlsx_path: Path,
+    exchange_path: Path,
+    report_dir: Path,
+    exchange_type: str,
+    params: ReconcileParams,
+    parse_cache: Optional[ParsedUploadCache] = None,
+) -> PendingReport:
+    exchange_type = exchange_type.upper().strip()
+    if exchange_type not in {"BINANCE", "OKX", "BYBIT"}:
+        raise ValueError(f"Unsupported exchange_type: {exchange_type}")
+
+    window = int(params.chunk_window_minutes) * 60 * 10**9
+    overlap = (int(params.time_window_seconds) + CHUNK_BUCKET_SLACK_SECONDS) * 10**9
+    if window <= overlap:
+        raise ValueError(
+            f"chunk_window_minutes должен быть больше time_window_seconds + {CHUNK_BUCKET_SLACK_SECONDS} секунд"
+        )
+
+    report_id = str(uuid.uuid4())
+    spill_dir = report_dir / f".spill_{report_id}"
+    parts_dir = report_dir / f"unity_vs_{exchange_type.lower()}_{report_id}_parts"
+    spill_dir.mkdir(parents=True, exist_ok=True)
+    timings = StageTimings(profile=params.profile_stages)
+
+    try:
+        exchange_name, contract_map, used_unity_offset, u_groups, ex_groups = _spill_inputs(
+            unity_xlsx_path, exchange_path, exchange_type, params, spill_dir, timings
+        )
+
+        files: Dict[Path, pq.ParquetFile] = {}
+        strict, u_owner = _global_strict(u_groups, ex_groups, files, params, timings)
+        strict_e = pd.Index(strict["exchange_idx"].to_numpy(dtype=np.int64))
+        strict_u = pd.Index(strict["unity_idx"].to_numpy(dtype=np.int64))
+        carry_u = pd.DataFrame()
+        carry_e = pd.DataFrame()
+        counts = {"strict": 0, "fuzzy": 0, "notional": 0, "missing": 0, "extra": 0, "rows_u": 0, "rows_e": 0}
+        totals = {"qty_u": 0.0, "qty_e": 0.0, "not_u": 0.0, "not_e": 0.0}
+        ranges: Dict[str, List[Any]] = {"u": [], "e": []}
+        aggs: Dict[str, List[pd.DataFrame]] = {"e": [], "u": []}
+        window_stats: List[Dict[str, Any]] = []
+        fuzzy_partitions = 0
+        n_windows = 0
+
+        def _account(new_u: pd.DataFrame, new_e: pd.DataFrame) -> None:
+            for side, new in (("u", new_u), ("e", new_e)):
+                if new.empty:
+                    continue
+                counts[f"rows_{side}"] += len(new)
+                totals[f"qty_{side}"] += float(np.nansum(new["qty"]))
+                totals[f"not_{side}"] += float(np.nansum(new["notional"]))
+                ranges[side].extend([new["trade_dt_utc"].min(), new["trade_dt_utc"].max()])
+                if params.enable_volume_recon:
+                    _stage_rows(timings, "volume", len(new))
+                    with _stage(timings, "volume"):
+                        aggs[side].append(_agg_volume(new, by_side=params.volume_group_by_side))
+
+        def _process(new_u: pd.DataFrame, new_e: pd.DataFrame, cut: Optional[int]) -> None:
+            nonlocal carry_u, carry_e, fuzzy_partitions, n_windows
+            _account(new_u, new_e)
+            pos = strict_e.get_indexer(new_e.index)
+            strict_w = strict.take(pos[pos >= 0])
+            unity_w = _concat_rows(carry_u, _unmatched(new_u, strict_u))
+            exchange_w = _concat_rows(carry_e, _unmatched(new_e, strict_e))
+            if unity_w.empty and exchange_w.empty and strict_w.empty:
+                carry_u, carry_e = unity_w, exchange_w
+                return
+
+            matched_fuzzy = pd.DataFrame(columns=["exchange_idx", "unity_idx", "score"])
+            matched_notional = pd.DataFrame(columns=["exchange_idx", "unity_idx", "key"])
+            if unity_w.empty or exchange_w.empty:
+                missing, extra = exchange_w, unity_w
+            else:
+                stats: Dict[str, Any] = {}
+                matched_fuzzy, matched_notional, missing, extra = _match_window(unity_w, exchange_w, params, stats, timings)
+                window_stats.append(stats)
+                fuzzy_partitions += int(stats.get("fuzzy_partitions", 0))
+            counts["strict"] += len(strict_w)
+            counts["fuzzy"] += len(matched_fuzzy)
+            counts["notional"] += len(matched_notional)
+
+            carry_e, missing = _split_carry(missing, cut)
+            carry_u, extra = _split_carry(extra, cut)
+            counts["missing"] += len(missing)
+            counts["extra"] += len(extra)
+
+            matched_all = _combine_matches(strict_w, matched_fuzzy, matched_notional)
+            partners = _strict_partners(new_u, strict_w["unity_idx"].to_numpy(dtype=np.int64), u_owner, u_groups, files)
+            _stage_rows(timings, "pretty", len(matched_all) + len(missing) + len(extra))
+            with _stage(timings, "pretty"):
+                pretty = _build_pretty_tables(
+                    matched_all=matched_all,
+                    exchange_n=_concat_rows(exchange_w, new_e.take(np.flatnonzero(pos >= 0))),
+                    unity_n=_concat_rows(unity_w, partners),
+                    missing_in_unity=missing,
+                    extra_in_unity=extra,
+                    ex_status=pd.DataFrame(),
+                    uni_status=pd.DataFrame(),
+                    volume_by_symbol=None,
+                    volume_by_symbol_side=None,
+                    exchange_name=exchange_name,
+                    params=params,
+                )
+                for table, key in CHUNKED_PART_TABLES.items():
+                    _write_part(parts_dir, table, n_windows, pretty[key])
+            n_windows += 1
+
+        bounds = np.array([(g[2], g[3]) for g in u_groups + ex_groups if g[2] is not None], dtype=np.int64).reshape(-1, 2)
+        lo = int(bounds[:, 0].min()) // window * window if len(bounds) else 0
+        while len(bounds):
+            if carry_u.empty and carry_e.empty:
+                pending = bounds[bounds[:, 1] >= lo]
+                if not len(pending):
+                    break
+                lo = max(lo, int(pending[:, 0].min()) // window * window)
+            hi = lo + window
+            _process(_read_window(u_groups, files, lo, hi), _read_window(ex_groups, files, lo, hi), hi - overlap)
+            lo = hi
+            if lo > int(bounds[:, 1].max()) and carry_u.empty and carry_e.empty:
+                break
+
+        _process(
+            _read_groups([g for g in u_groups if g[2] is None], files),
+            _read_groups([g for g in ex_groups if g[2] is None], files),
+            None,
+        )
+    finally:
+        shutil.rmtree(spill_dir, ignore_errors=True)
+
+    fuzzy_stats: Dict[str, Any] = {}
+    _merge_fuzzy_stats(window_stats, fuzzy_stats)
+
+    volume_by_symbol = None
+    volume_by_symbol_side = None
+    vol_counts = _volume_counts(None, None, None)
+    if params.enable_volume_recon:
+        with _stage(timings, "volume"):
+            by_side = params.volume_group_by_side
+            agg_ex_sym, agg_ex_ss = _volume_levels(_merge_volume_aggs(aggs["e"], by_side=by_side), by_side)
+            agg_u_sym, agg_u_ss = _volume_levels(_merge_volume_aggs(aggs["u"], by_side=by_side), by_side)
+            volume_by_symbol = _compare_volume(agg_ex_sym, agg_u_sym, by_side=False, params=params)
+            vol_counts = _volume_counts(volume_by_symbol, agg_ex_sym, agg_u_sym)
+            if by_side:
+                volume_by_symbol_side = _compare_volume(agg_ex_ss, agg_u_ss, by_side=True, params=params)
+
+    ex_min, ex_max = (min(ranges["e"]), max(ranges["e"])) if ranges["e"] else (pd.NaT, pd.NaT)
+    u_min, u_max = (min(ranges["u"]), max(ranges["u"])) if ranges["u"] else (pd.NaT, pd.NaT)
+    warning = _time_range_warning(ex_min, ex_max, u_min, u_max, exchange_name, used_unity_offset)
+    if contract_map:
+        warning = (warning + " | " if warning else "") + f"OKX contracts→base: {contract_map}"
+    if max(counts["strict"] + counts["fuzzy"] + counts["notional"], counts["missing"], counts["extra"]) > CHUNKED_XLSX_DETAIL_ROWS:
+        warning = (warning + " | " if warning else "") + (
+            f"Детальные листы содержат первые {CHUNKED_XLSX_DETAIL_ROWS} строк, полные данные: {parts_dir.name}"
+        )
+
+    summary = ReconcileSummary(
+        exchange_name=exchange_name,
+        rows_exchange=counts["rows_e"],
+        rows_unity=counts["rows_u"],
+        matched_strict=counts["strict"],
+        matched_fuzzy=counts["fuzzy"],
+        matched_notional=counts["notional"],
+        missing_in_unity=counts["missing"],
+        extra_in_unity=counts["extra"],
+        **vol_counts,
+        volume_total_qty_exchange=_qround_float(totals["qty_e"], params.qty_decimals),
+        volume_total_qty_unity=_qround_float(totals["qty_u"], params.qty_decimals),
+        volume_total_notional_exchange=_qround_float(totals["not_e"], params.notional_decimals),
+        volume_total_notional_unity=_qround_float(totals["not_u"], params.notional_decimals),
+        exchange_time_range_utc=f"{ex_min} → {ex_max}",
+        unity_time_range_utc=f"{u_min} → {u_max}",
+        warning=warning,
+        fuzzy_strategy=_fuzzy_strategy(params),
+        fuzzy_components=int(fuzzy_stats.get("fuzzy_components", 0)),
+        fuzzy_component_max_size=int(fuzzy_stats.get("fuzzy_component_max_size", 0)),
+        fuzzy_component_mean_size=float(fuzzy_stats.get("fuzzy_component_mean_size", 0.0)),
+        fuzzy_components_over_limit=int(fuzzy_stats.get("fuzzy_components_over_limit", 0)),
+        fuzzy_partitions=fuzzy_partitions,
+        chunk_windows=n_windows,
+        stage_profile=_stage_profile(timings),
+    )
+
+    pretty: Dict[str, Optional[pd.DataFrame]] = {
+        key: _read_parts_head(parts_dir, table, CHUNKED_XLSX_DETAIL_ROWS) for table, key in CHUNKED_PART_TABLES.items()
+    }
+    pretty["ex_status"] = pd.DataFrame()
+    pretty["uni_status"] = pd.DataFrame()
+    pretty["vol_sym"] = _volume_pretty(volume_by_symbol, exchange_name)
+    pretty["vol_ss"] = _volume_pretty(volume_by_symbol_side, exchange_name)
+
+    report_path = report_dir / f"unity_vs_{exchange_name.lower()}_{report_id}{_report_suffix(params)}"
+    return PendingReport(
+        report_id=report_id,
+        report_path=report_path,
+        summary=summary,
+        params=params,
+        tables=pretty,
+        parts_dir=parts_dir,
+        timings=timings,
+    )
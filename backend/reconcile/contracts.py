@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import logging
+import math
+import threading
+from dataclasses import replace
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .models import OkxContractValue, ReconcileParams
+
+log = logging.getLogger(__name__)
+
+OKX_CONTRACT_SNAP_TOL = 0.10
+OKX_CONTRACT_DISPUTE_FACTOR = 0.5
+
+ContractLoader = Callable[[], Optional[Iterable[Dict[str, Any]]]]
+ContractSaver = Callable[[List[Dict[str, Any]]], None]
+
+
+def _contract_confidence(ratio: float, candidates: Iterable[float], rel_tol: float = OKX_CONTRACT_SNAP_TOL) -> float:
+    if not math.isfinite(ratio) or ratio <= 0:
+        return 0.0
+    err = min((abs(ratio - c) / c for c in candidates if c > 0), default=None)
+    if err is None or err > rel_tol:
+        return 0.0
+    return round(1.0 - err / rel_tol, 6)
+
+
+def _same_value(a: float, b: float) -> bool:
+    return math.isclose(a, b, rel_tol=1e-9, abs_tol=0.0)
+
+
+def _later(a: Optional[date], b: Optional[date]) -> Optional[date]:
+    if a is None or b is None:
+        return a or b
+    return max(a, b)
+
+
+def _merge_contract(old: Optional[OkxContractValue], new: OkxContractValue) -> Optional[OkxContractValue]:
+    if old is None:
+        return new
+    if _same_value(old.contract_value, new.contract_value):
+        merged = replace(
+            old,
+            confidence=max(old.confidence, new.confidence),
+            samples=old.samples + new.samples,
+            last_seen=_later(old.last_seen, new.last_seen),
+        )
+        return merged if merged != old else None
+    if new.confidence > old.confidence:
+        return new
+    return None
+
+
+def _from_row(row: Dict[str, Any]) -> OkxContractValue:
+    return OkxContractValue(
+        symbol=str(row["symbol"]).strip().upper(),
+        contract_value=float(row["contract_value"]),
+        confidence=float(row.get("confidence") or 0.0),
+        samples=int(row.get("samples") or 1),
+        last_seen=row.get("last_seen"),
+    )
+
+
+def _to_row(value: OkxContractValue) -> Dict[str, Any]:
+    return {
+        "symbol": value.symbol,
+        "contract_value": value.contract_value,
+        "confidence": value.confidence,
+        "samples": value.samples,
+        "last_seen": value.last_seen,
+    }
+
+
+class OkxContractRegistry:
+    def __init__(self, loader: Optional[ContractLoader] = None, saver: Optional[ContractSaver] = None) -> None:
+        self._loader = loader
+        self._saver = saver
+        self._lock = threading.Lock()
+        self._values: Dict[str, OkxContractValue] = {}
+        self._loaded = loader is None
+
+    def attach(self, loader: Optional[ContractLoader], saver: Optional[ContractSaver]) -> None:
+        with self._lock:
+            self._loader = loader
+            self._saver = saver
+            self._loaded = loader is None
+
+    def _ensure_loaded_locked(self) -> None:
+        if self._loaded:
+            return
+        try:
+            rows = self._loader()
+        except Exception as e:
+            log.warning("okx contract registry load failed: %s", e)
+            return
+        if rows is None:
+            return
+        stored = {v.symbol: v for v in map(_from_row, rows)}
+        for sym, value in self._values.items():
+            merged = _merge_contract(stored.get(sym), value)
+            if merged is not None:
+                stored[sym] = merged
+        self._values = stored
+        self._loaded = True
+
+    def known(self, min_confidence: float) -> Dict[str, float]:
+        with self._lock:
+            self._ensure_loaded_locked()
+            return {sym: v.contract_value for sym, v in self._values.items() if v.confidence >= min_confidence}
+
+    def snapshot(self) -> Dict[str, OkxContractValue]:
+        with self._lock:
+            self._ensure_loaded_locked()
+            return dict(self._values)
+
+    def learn(self, observations: Iterable[OkxContractValue], disputed: Iterable[str] = ()) -> List[OkxContractValue]:
+        changed: Dict[str, OkxContractValue] = {}
+        with self._lock:
+            self._ensure_loaded_locked()
+            for sym in disputed:
+                old = self._values.get(sym)
+                if old is not None:
+                    lowered = replace(old, confidence=round(old.confidence * OKX_CONTRACT_DISPUTE_FACTOR, 6))
+                    self._values[sym] = changed[sym] = lowered
+            for obs in observations:
+                merged = _merge_contract(self._values.get(obs.symbol), obs)
+                if merged is not None:
+                    self._values[obs.symbol] = changed[obs.symbol] = merged
+            saver = self._saver
+        if changed and saver is not None:
+            try:
+                saver([_to_row(v) for v in changed.values()])
+            except Exception as e:
+                log.warning("okx contract registry save failed: %s", e)
+        return list(changed.values())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values = {}
+            self._loaded = self._loader is None
+
+
+OKX_CONTRACT_REGISTRY = OkxContractRegistry()
+
+
+def _contract_registry(params: ReconcileParams) -> Optional[OkxContractRegistry]:
+    return OKX_CONTRACT_REGISTRY if params.okx_contract_registry else None
@@ -1,20 +1,162 @@
 from __future__ import annotations
 
+import logging
+import multiprocessing as mp
+import os
+import threading
 import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import replace
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+
+from .cache import ParsedUploadCache, _file_sha256, _make_cache_key
+from .contracts import _contract_registry
+from .models import NORMALIZE_PARAM_FIELDS, PendingReport, ReconcileParams, ReconcileSummary, ReconcileResult, StageTimings
+from .profiling import _cprofiled, _stage, _stage_profile, _stage_rows
+from .utils import _qround_float, _extract_symbol_basic, _extract_symbol_from_okx
+from .readers import _read_binance_file, _read_bybit_file, _read_okx_xlsx, _read_unity_xlsx
+from .parsers import (
+    BINANCE_COLUMNS,
+    BYBIT_COLUMNS,
+    OKX_COLUMNS,
+    _prepare_binance_to_standard,
+    _prepare_bybit_to_standard,
+    _prepare_okx_to_standard,
+    _text_cols,
+    _usecols,
+)
+from .normalizers import (
+    UNITY_USECOLS,
+    _assign_match_codes,
+    _carry_columns,
+    _infer_okx_contract_value_map,
+    _match_key_display,
+    _normalize_exchange_common,
+    _normalize_unity,
+    _unity_for_exchange,
+    _notional_key_display,
+)
+from .matcher import _fuzzy_engine, _fuzzy_strategy, _reconcile_multiset_by_key, _reconcile_fuzzy, _split_after_fuzzy
+from .volume import _agg_volume, _compare_volume, _top_key_diffs, _volume_levels
+from .reporter import _build_pretty_tables, _export_report, _report_suffix
+
+log = logging.getLogger(__name__)
+
+EXECUTION_MODES = {"serial", "parallel", "chunked"}
+FUZZY_PARTITION_COLS = ["trade_dt_utc", "symbol", "side", "qty", "price"]
+
+_PARTITION_POOL: Optional[ProcessPoolExecutor] = None
+_PARTITION_POOL_WORKERS = 0
+_PARTITION_POOL_LOCK = threading.Lock()
+
+
+def _read_exchange_standard(
+    exchange_path: Path,
+    exchange_type: str,
+    params: ReconcileParams,
+    timings: Optional[StageTimings] = None,
+) -> Tuple[pd.DataFrame, Optional[int]]:
+    if exchange_type == "BINANCE":
+        with _stage(timings, "read"):
+            raw = _read_binance_file(
+                exchange_path,
+                params.binance_delimiter,
+                usecols=_usecols(BINANCE_COLUMNS),
+                text_cols=_text_cols(BINANCE_COLUMNS),
+            )
+        prepare, tz = _prepare_binance_to_standard, None
+    elif exchange_type == "BYBIT":
+        with _stage(timings, "read"):
+            raw = _read_bybit_file(exchange_path, usecols=_usecols(BYBIT_COLUMNS), text_cols=_text_cols(BYBIT_COLUMNS))
+        prepare, tz = _prepare_bybit_to_standard, None
+    else:
+        with _stage(timings, "read"):
+            raw, tz = _read_okx_xlsx(exchange_path, usecols=_usecols(OKX_COLUMNS))
+        prepare = _prepare_okx_to_standard
+    _stage_rows(timings, "read", len(raw))
+    with _stage(timings, "prepare"):
+        exchange_std = prepare(raw)
+    _stage_rows(timings, "prepare", len(exchange_std))
+    return exchange_std, tz
+
+
+def _load_unity_raw(
+    unity_xlsx_path: Path,
+    params: ReconcileParams,
+    parse_cache: Optional[ParsedUploadCache],
+    reused_stages: Optional[List[str]] = None,
+    timings: Optional[StageTimings] = None,
+) -> pd.DataFrame:
+    usecols = None if params.export_debug_sheets else UNITY_USECOLS
+    if parse_cache is None:
+        with _stage(timings, "read"):
+            unity_raw = _read_unity_xlsx(unity_xlsx_path, usecols)
+        _stage_rows(timings, "read", len(unity_raw))
+        return unity_raw
+
+    key = _make_cache_key("unity_raw", _file_sha256(unity_xlsx_path), unity_xlsx_path.suffix.lower(), usecols)
+    hit = parse_cache.get_frames(key)
+    if hit is not None:
+        if reused_stages is not None:
+            reused_stages.append("read_unity")
+        return hit[0]["unity_raw"]
+
+    with _stage(timings, "read"):
+        unity_raw = _read_unity_xlsx(unity_xlsx_path, usecols)
+    _stage_rows(timings, "read", len(unity_raw))
+    parse_cache.put_frames(key, {"unity_raw": unity_raw})
+    return unity_raw
+
+
+def _load_exchange_standard(
+    exchange_path: Path,
+    exchange_type: str,
+    params: ReconcileParams,
+    parse_cache: Optional[ParsedUploadCache],
+    reused_stages: Optional[List[str]] = None,
+    timings: Optional[StageTimings] = None,
+) -> Tuple[pd.DataFrame, Optional[int]]:
+    if parse_cache is None:
+        return _read_exchange_standard(exchange_path, exchange_type, params, timings)
+
+    delimiter = params.binance_delimiter if exchange_type == "BINANCE" else None
+    key = _make_cache_key(
+        "exchange_std", _file_sha256(exchange_path), exchange_path.suffix.lower(), exchange_type, delimiter
+    )
+    hit = parse_cache.get_frames(key)
+    if hit is not None:
+        if reused_stages is not None:
+            reused_stages.append("read_exchange")
+        frames, meta = hit
+        tz = meta.get("tz_offset")
+        return frames["exchange_std"], (int(tz) if tz is not None else None)
+
+    exchange_std, tz = _read_exchange_standard(exchange_path, exchange_type, params, timings)
+    parse_cache.put_frames(key, {"exchange_std": exchange_std}, {"tz_offset": tz})
+    return exchange_std, tz
+
 
-from .models import ReconcileParams, ReconcileSummary, ReconcileResult
-from .utils import _qround_float, _qround_str, _extract_symbol_basic, _extract_symbol_from_okx
-from .readers import _read_binance_file, _read_bybit_file, _read_okx_xlsx
-from .parsers import _prepare_binance_to_standard, _prepare_bybit_to_standard, _prepare_okx_to_standard
-from .normalizers import _normalize_unity, _normalize_exchange_common, _infer_okx_contract_value_map
-from .matcher import _reconcile_multiset_by_key, _reconcile_fuzzy
-from .volume import _agg_volume, _compare_volume, _top_key_diffs
-from .reporter import _build_pretty_tables, _export_report_xlsx
+def _exchange_settings(
+    exchange_type: str,
+    params: ReconcileParams,
+    tz: Optional[int],
+) -> Tuple[str, int, Callable[[Any], str], Optional[set]]:
+    if exchange_type == "BINANCE":
+        return "Binance", 0, _extract_symbol_basic, {"BUY", "SELL"}
+
+    if exchange_type == "BYBIT":
+        action_filter = {"BUY", "SELL"} if params.bybit_filter_trade_actions else None
+        return "Bybit", int(params.bybit_utc_offset_hours or 0), _extract_symbol_basic, action_filter
+
+    exchange_offset = int(params.okx_utc_offset_hours) if params.okx_utc_offset_hours is not None else (int(tz) if tz is not None else 0)
+    action_filter = {"BUY", "SELL"} if params.okx_filter_trade_actions else None
+    return "OKX", exchange_offset, _extract_symbol_from_okx, action_filter
 
 
 def _reconcile_core(
@@ -22,51 +164,46 @@ def _reconcile_core(
     exchange_path: Path,
     exchange_type: str,
     params: ReconcileParams,
+    parse_cache: Optional[ParsedUploadCache] = None,
+    reused_stages: Optional[List[str]] = None,
+    timings: Optional[StageTimings] = None,
 ) -> Tuple[str, pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame, Optional[Dict[str, float]], int]:
     exchange_type = exchange_type.upper().strip()
     if exchange_type not in {"BINANCE", "OKX", "BYBIT"}:
         raise ValueError(f"Unsupported exchange_type: {exchange_type}")
 
-    unity_raw = pd.read_excel(unity_xlsx_path)
+    unity_raw = _load_unity_raw(unity_xlsx_path, params, parse_cache, reused_stages, timings)
+    exchange_raw, tz = _load_exchange_standard(exchange_path, exchange_type, params, parse_cache, reused_stages, timings)
 
-    exchange_offset = 0
-    symbol_mapper: Callable[[Any], str] = lambda x: str(x).upper().strip() if x is not None else ""
-    action_filter: Optional[set] = None
-    contract_map: Optional[Dict[str, float]] = None
-    trading_unit_col: Optional[str] = None
+    return _normalize_inputs(unity_raw, exchange_raw, exchange_type, params, tz, timings)
 
-    if exchange_type == "BINANCE":
-        exchange_raw0 = _read_binance_file(exchange_path, params.binance_delimiter)
-        exchange_raw = _prepare_binance_to_standard(exchange_raw0)
-
-        exchange_name = "Binance"
-        exchange_offset = 0
-        symbol_mapper = _extract_symbol_basic
-        action_filter = {"BUY", "SELL"}
-
-    elif exchange_type == "BYBIT":
-        exchange_raw0 = _read_bybit_file(exchange_path)
-        exchange_raw = _prepare_bybit_to_standard(exchange_raw0)
 
-        exchange_name = "Bybit"
-        exchange_offset = int(params.bybit_utc_offset_hours or 0)
-        symbol_mapper = _extract_symbol_basic
-        action_filter = {"BUY", "SELL"} if params.bybit_filter_trade_actions else None
-
-    else:
-        okx_df, tz = _read_okx_xlsx(exchange_path)
-        exchange_raw = _prepare_okx_to_standard(okx_df)
+def _normalize_inputs(
+    unity_raw: pd.DataFrame,
+    exchange_raw: pd.DataFrame,
+    exchange_type: str,
+    params: ReconcileParams,
+    tz: Optional[int],
+    timings: Optional[StageTimings] = None,
+    unity_norm: Optional[Tuple[pd.DataFrame, int]] = None,
+) -> Tuple[str, pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame, Optional[Dict[str, float]], int]:
+    exchange_name, exchange_offset, symbol_mapper, action_filter = _exchange_settings(exchange_type, params, tz)
+    contract_map: Optional[Dict[str, float]] = None
+    trading_unit_col: Optional[str] = None
 
-        exchange_name = "OKX"
-        detected = tz
-        exchange_offset = int(params.okx_utc_offset_hours) if params.okx_utc_offset_hours is not None else (int(detected) if detected is not None else 0)
-        symbol_mapper = _extract_symbol_from_okx
-        action_filter = {"BUY", "SELL"} if params.okx_filter_trade_actions else None
+    with _stage(timings, "normalize"):
+        unity_n, used_unity_offset = unity_norm if unity_norm is not None else _normalize_unity(unity_raw, params)
+        unity_n = _unity_for_exchange(unity_n, exchange_type, params)
 
-        unity_n, used_unity_offset = _normalize_unity(unity_raw, params)
-        contract_map = _infer_okx_contract_value_map(unity_n, exchange_raw, symbol_mapper, action_filter, params)
+    if exchange_type == "OKX":
+        with _stage(timings, "okx_contracts"):
+            contract_map = _infer_okx_contract_value_map(
+                unity_n, exchange_raw, symbol_mapper, action_filter, params, _contract_registry(params)
+            )
+        _stage_rows(timings, "okx_contracts", len(exchange_raw))
         trading_unit_col = "Trading Unit" if "Trading Unit" in exchange_raw.columns else None
 
+    with _stage(timings, "normalize"):
         exchange_n = _normalize_exchange_common(
             exchange_raw,
             params,
@@ -76,73 +213,314 @@ def _reconcile_core(
             contract_value_map=contract_map,
             trading_unit_col=trading_unit_col,
         )
-        return exchange_name, unity_raw, exchange_raw, unity_n, exchange_n, contract_map, used_unity_offset
+    _stage_rows(timings, "normalize", len(unity_n) + len(exchange_n))
+    return exchange_name, unity_raw, exchange_raw, unity_n, exchange_n, contract_map, used_unity_offset
 
-    unity_n, used_unity_offset = _normalize_unity(unity_raw, params)
 
-    if exchange_type == "BYBIT":
-        unity_n["qty"] = unity_n["qty"] * 100
-        unity_n["qty_r"] = unity_n["qty"].map(lambda x: _qround_str(x, params.qty_decimals))
-        unity_n["notional"] = unity_n["qty"] * unity_n["price"]
-        unity_n["notional_r"] = unity_n["notional"].map(lambda x: _qround_str(x, params.notional_decimals))
-
-        unity_n["match_key"] = (
-            unity_n["symbol"].astype(str) + "|" +
-            unity_n["side"].astype(str) + "|" +
-            unity_n["qty_r"].astype(str) + "|" +
-            unity_n["price_r"].astype(str)
-        )
+MATCH_STATUS_LABELS = {
+    "STRICT": "СОВПАЛО_STRICT",
+    "FUZZY": "СОВПАЛО_FUZZY",
+    "NOTIONAL": "СОВПАЛО_ОБЪЕМ",
+}
 
-        if params.notional_use_minute_bucket:
-            unity_n["notional_key"] = (
-                unity_n["symbol"].astype(str) + "|" +
-                unity_n["side"].astype(str) + "|" +
-                unity_n["minute_utc"].astype(str) + "|" +
-                unity_n["notional_r"].astype(str)
-            )
-        else:
-            unity_n["notional_key"] = (
-                unity_n["symbol"].astype(str) + "|" +
-                unity_n["side"].astype(str) + "|" +
-                unity_n["notional_r"].astype(str)
-            )
 
-    exchange_n = _normalize_exchange_common(
-        exchange_raw,
-        params,
-        time_offset_hours=exchange_offset,
-        symbol_mapper=symbol_mapper,
-        action_filter=action_filter,
-        contract_value_map=None,
-        trading_unit_col=None,
-    )
-    return exchange_name, unity_raw, exchange_raw, unity_n, exchange_n, None, used_unity_offset
+def _status_frame(
+    df: pd.DataFrame,
+    default_status: str,
+    matched_col: str,
+    matched_all: pd.DataFrame,
+    own_idx_col: str,
+    other_idx_col: str,
+) -> pd.DataFrame:
+    out = _carry_columns(df, list(df.columns))
+    status = np.full(len(out), default_status, dtype=object)
+    matched_other = np.full(len(out), np.nan, dtype=np.float64)
 
+    if not matched_all.empty:
+        pos = out.index.get_indexer(matched_all[own_idx_col].astype(np.int64))
+        status[pos] = matched_all["match_type"].map(MATCH_STATUS_LABELS).to_numpy(dtype=object)
+        matched_other[pos] = matched_all[other_idx_col].to_numpy(dtype=np.float64)
 
-def _run_reconcile(
+    out["status"] = status
+    out[matched_col] = matched_other
+    return out
+
+
+def _frame_to_ipc(df: pd.DataFrame) -> bytes:
+    table = pa.Table.from_pandas(df, preserve_index=True)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _frame_from_ipc(buf: bytes) -> pd.DataFrame:
+    return pa.ipc.open_stream(buf).read_all().to_pandas()
+
+
+def _partition_pool(workers: int) -> ProcessPoolExecutor:
+    global _PARTITION_POOL, _PARTITION_POOL_WORKERS
+    with _PARTITION_POOL_LOCK:
+        if _PARTITION_POOL is None or _PARTITION_POOL_WORKERS != workers:
+            if _PARTITION_POOL is not None:
+                _PARTITION_POOL.shutdown(wait=False)
+            _PARTITION_POOL = ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn"))
+            _PARTITION_POOL_WORKERS = workers
+        return _PARTITION_POOL
+
+
+def _reset_partition_pool() -> None:
+    global _PARTITION_POOL
+    with _PARTITION_POOL_LOCK:
+        if _PARTITION_POOL is not None:
+            _PARTITION_POOL.shutdown(wait=False, cancel_futures=True)
+        _PARTITION_POOL = None
+
+
+def _fuzzy_partition_task(
+    missing_buf: bytes,
+    extra_buf: bytes,
+    params: ReconcileParams,
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    stats: Dict[str, Any] = {}
+    matched, _, _ = _reconcile_fuzzy(_frame_from_ipc(missing_buf), _frame_from_ipc(extra_buf), params, stats=stats)
+    return matched, stats
+
+
+def _symbol_buckets(missing: pd.DataFrame, extra: pd.DataFrame, n_buckets: int) -> Tuple[np.ndarray, np.ndarray, int]:
+    codes, uniques = pd.factorize(pd.concat([missing["symbol"], extra["symbol"]], ignore_index=True).astype(str))
+    sizes = np.bincount(codes, minlength=len(uniques))
+    n_buckets = max(1, min(n_buckets, len(uniques)))
+
+    bucket_of = np.zeros(len(uniques), dtype=np.int64)
+    load = np.zeros(n_buckets, dtype=np.int64)
+    for sym in np.argsort(-sizes, kind="mergesort").tolist():
+        b = int(np.argmin(load))
+        bucket_of[sym] = b
+        load[b] += sizes[sym]
+
+    rows_bucket = bucket_of[codes]
+    return rows_bucket[: len(missing)], rows_bucket[len(missing):], n_buckets
+
+
+def _merge_fuzzy_stats(parts: List[Dict[str, Any]], stats: Dict[str, Any]) -> None:
+    parts = [p for p in parts if "fuzzy_components" in p]
+    if not parts:
+        return
+    n = sum(int(p["fuzzy_components"]) for p in parts)
+    total = sum(round(float(p["fuzzy_component_mean_size"]) * int(p["fuzzy_components"])) for p in parts)
+    stats["fuzzy_components"] = n
+    stats["fuzzy_component_max_size"] = max(int(p["fuzzy_component_max_size"]) for p in parts)
+    stats["fuzzy_component_mean_size"] = float(total / n) if n else 0.0
+    stats["fuzzy_components_over_limit"] = sum(int(p["fuzzy_components_over_limit"]) for p in parts)
+
+
+def _reconcile_fuzzy_parallel(
+    missing_exchange: pd.DataFrame,
+    extra_unity: pd.DataFrame,
+    params: ReconcileParams,
+    stats: Dict[str, Any],
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    workers = int(params.parallel_workers) or (os.cpu_count() or 1)
+    m_bucket, e_bucket, n_buckets = _symbol_buckets(missing_exchange, extra_unity, workers)
+
+    m_slim = missing_exchange[FUZZY_PARTITION_COLS]
+    e_slim = extra_unity[FUZZY_PARTITION_COLS]
+    tasks = []
+    for b in range(n_buckets):
+        m_part = m_slim[m_bucket == b]
+        e_part = e_slim[e_bucket == b]
+        if len(m_part) and len(e_part):
+            tasks.append((_frame_to_ipc(m_part), _frame_to_ipc(e_part)))
+
+    try:
+        pool = _partition_pool(workers)
+        results = list(pool.map(_fuzzy_partition_task, *zip(*tasks), [params] * len(tasks))) if tasks else []
+    except BrokenProcessPool as e:
+        log.warning("fuzzy partition pool failed, falling back to serial matching: %s", e)
+        _reset_partition_pool()
+        return _reconcile_fuzzy(missing_exchange, extra_unity, params, stats=stats)
+
+    stats["fuzzy_partitions"] = len(tasks)
+    _merge_fuzzy_stats([r[1] for r in results], stats)
+
+    matched_parts = [r[0] for r in results if not r[0].empty]
+    if not matched_parts:
+        return pd.DataFrame(columns=["exchange_idx", "unity_idx", "score"]), missing_exchange, extra_unity
+
+    matched = pd.concat(matched_parts, ignore_index=True)
+    time_order = missing_exchange.sort_values("trade_dt_utc", kind="mergesort").index
+    rank = pd.Series(np.arange(len(time_order), dtype=np.int64), index=time_order)
+    order = np.argsort(rank.loc[matched["exchange_idx"].to_numpy()].to_numpy(), kind="mergesort")
+    matched = matched.iloc[order].reset_index(drop=True)
+    return _split_after_fuzzy(matched, missing_exchange, extra_unity)
+
+
+def _execution_mode(params: ReconcileParams) -> str:
+    mode = (params.execution_mode or "serial").strip().lower()
+    if mode not in EXECUTION_MODES:
+        raise ValueError(f"Unsupported execution_mode: {params.execution_mode}")
+    return mode
+
+
+def _use_parallel_fuzzy(missing_exchange: pd.DataFrame, extra_unity: pd.DataFrame, params: ReconcileParams) -> bool:
+    if _execution_mode(params) != "parallel" or _fuzzy_engine(params) == "legacy":
+        return False
+    if missing_exchange.empty or extra_unity.empty:
+        return False
+    return len(missing_exchange) + len(extra_unity) >= int(params.parallel_min_rows)
+
+
+def _run_strict_stage(
     unity_xlsx_path: Path,
     exchange_path: Path,
-    report_dir: Path,
     exchange_type: str,
     params: ReconcileParams,
-) -> Tuple[ReconcileResult, Optional[Dict[str, List[Dict[str, Any]]]]]:
+    parse_cache: Optional[ParsedUploadCache],
+    reused_stages: List[str],
+    timings: Optional[StageTimings] = None,
+) -> Tuple[str, pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame, Optional[Dict[str, float]], int, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
     exchange_name, unity_raw, exchange_raw, unity_n, exchange_n, contract_map, used_unity_offset = _reconcile_core(
         unity_xlsx_path=unity_xlsx_path,
         exchange_path=exchange_path,
         exchange_type=exchange_type,
         params=params,
+        parse_cache=parse_cache,
+        reused_stages=reused_stages,
+        timings=timings,
+    )
+
+    return (
+        exchange_name, unity_raw, exchange_raw, unity_n, exchange_n, contract_map, used_unity_offset,
+        *_strict_match(unity_n, exchange_n, params, timings),
+    )
+
+
+def _strict_match(
+    unity_n: pd.DataFrame,
+    exchange_n: pd.DataFrame,
+    params: ReconcileParams,
+    timings: Optional[StageTimings] = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    _stage_rows(timings, "strict", len(unity_n) + len(exchange_n))
+    with _stage(timings, "strict"):
+        _assign_match_codes(unity_n, exchange_n, params)
+
+        matched_strict, missing_in_unity, extra_in_unity = _reconcile_multiset_by_key(unity_n, exchange_n, "match_code")
+        if not matched_strict.empty:
+            matched_strict["key"] = _match_key_display(exchange_n.loc[matched_strict["exchange_idx"]], params).to_numpy()
+    return matched_strict, missing_in_unity, extra_in_unity
+
+
+def _contract_registry_key(exchange_type: str, params: ReconcileParams) -> Optional[List[Tuple[str, float]]]:
+    registry = _contract_registry(params)
+    if exchange_type != "OKX" or registry is None or not params.okx_contract_value_autodetect:
+        return None
+    return sorted(registry.known(params.okx_contract_registry_min_confidence).items())
+
+
+def _load_strict_stage(
+    unity_xlsx_path: Path,
+    exchange_path: Path,
+    exchange_type: str,
+    params: ReconcileParams,
+    parse_cache: Optional[ParsedUploadCache],
+    reused_stages: List[str],
+    timings: Optional[StageTimings] = None,
+) -> Tuple[str, pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame, Optional[Dict[str, float]], int, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    if parse_cache is None:
+        return _run_strict_stage(unity_xlsx_path, exchange_path, exchange_type, params, None, reused_stages, timings)
+
+    key = _make_cache_key(
+        "strict_stage",
+        _file_sha256(unity_xlsx_path),
+        _file_sha256(exchange_path),
+        exchange_type.upper().strip(),
+        {f: getattr(params, f) for f in NORMALIZE_PARAM_FIELDS},
+        _contract_registry_key(exchange_type.upper().strip(), params),
+    )
+    hit = parse_cache.get_frames(key)
+    if hit is not None:
+        frames, meta = hit
+        unity_n = frames["unity_n"]
+        exchange_n = frames["exchange_n"]
+        reused_stages.extend(["read_unity", "read_exchange", "normalize", "strict"])
+        return (
+            str(meta["exchange_name"]),
+            frames.get("unity_raw", pd.DataFrame()),
+            frames.get("exchange_raw", pd.DataFrame()),
+            unity_n,
+            exchange_n,
+            meta.get("contract_map"),
+            int(meta["used_unity_offset"]),
+            frames["matched_strict"],
+            exchange_n.loc[frames["missing_idx"]["idx"].to_numpy()].copy(),
+            unity_n.loc[frames["extra_idx"]["idx"].to_numpy()].copy(),
+        )
+
+    stage = _run_strict_stage(unity_xlsx_path, exchange_path, exchange_type, params, parse_cache, reused_stages, timings)
+    (
+        exchange_name, unity_raw, exchange_raw, unity_n, exchange_n, contract_map, used_unity_offset,
+        matched_strict, missing_in_unity, extra_in_unity,
+    ) = stage
+
+    frames = {
+        "unity_n": unity_n,
+        "exchange_n": exchange_n,
+        "matched_strict": matched_strict,
+        "missing_idx": pd.DataFrame({"idx": missing_in_unity.index.to_numpy(dtype=np.int64)}),
+        "extra_idx": pd.DataFrame({"idx": extra_in_unity.index.to_numpy(dtype=np.int64)}),
+    }
+    if params.export_debug_sheets:
+        frames["unity_raw"] = unity_raw
+        frames["exchange_raw"] = exchange_raw
+    parse_cache.put_frames(
+        key,
+        frames,
+        {"exchange_name": exchange_name, "contract_map": contract_map, "used_unity_offset": used_unity_offset},
     )
+    return stage
 
-    matched_strict, missing_in_unity, extra_in_unity = _reconcile_multiset_by_key(unity_n, exchange_n, "match_key")
 
+def _match_residuals(
+    exchange_n: pd.DataFrame,
+    missing_in_unity: pd.DataFrame,
+    extra_in_unity: pd.DataFrame,
+    params: ReconcileParams,
+    fuzzy_stats: Dict[str, Any],
+    timings: Optional[StageTimings] = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
     matched_fuzzy = pd.DataFrame(columns=["exchange_idx", "unity_idx", "score"])
     if params.enable_fuzzy:
-        matched_fuzzy, missing_in_unity, extra_in_unity = _reconcile_fuzzy(missing_in_unity, extra_in_unity, params)
+        _stage_rows(timings, "fuzzy", len(missing_in_unity) + len(extra_in_unity))
+        with _stage(timings, "fuzzy"):
+            if _use_parallel_fuzzy(missing_in_unity, extra_in_unity, params):
+                matched_fuzzy, missing_in_unity, extra_in_unity = _reconcile_fuzzy_parallel(
+                    missing_in_unity, extra_in_unity, params, fuzzy_stats
+                )
+            else:
+                matched_fuzzy, missing_in_unity, extra_in_unity = _reconcile_fuzzy(
+                    missing_in_unity, extra_in_unity, params, stats=fuzzy_stats
+                )
 
     matched_notional = pd.DataFrame(columns=["exchange_idx", "unity_idx", "key"])
     if params.enable_notional_fallback:
-        matched_notional, missing_in_unity, extra_in_unity = _reconcile_multiset_by_key(extra_in_unity, missing_in_unity, "notional_key")
-
+        _stage_rows(timings, "notional", len(missing_in_unity) + len(extra_in_unity))
+        with _stage(timings, "notional"):
+            matched_notional, missing_in_unity, extra_in_unity = _reconcile_multiset_by_key(extra_in_unity, missing_in_unity, "notional_code")
+            if not matched_notional.empty:
+                matched_notional["key"] = _notional_key_display(
+                    exchange_n.loc[matched_notional["exchange_idx"]], params
+                ).to_numpy()
+
+    return matched_fuzzy, matched_notional, missing_in_unity, extra_in_unity
+
+
+def _combine_matches(
+    matched_strict: pd.DataFrame,
+    matched_fuzzy: pd.DataFrame,
+    matched_notional: pd.DataFrame,
+) -> pd.DataFrame:
     parts = []
     if not matched_strict.empty:
         parts.append(matched_strict.assign(match_type="STRICT").rename(columns={"key": "key_used"}))
@@ -151,84 +529,147 @@ def _run_reconcile(
     if not matched_notional.empty:
         parts.append(matched_notional.assign(match_type="NOTIONAL").rename(columns={"key": "key_used"}))
 
-    matched_all = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(
+    return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(
         columns=["exchange_idx", "unity_idx", "match_type", "key_used", "score"]
     )
 
-    ex_status = exchange_n.copy()
-    ex_status["status"] = "НЕТ_В_UNITY"
-    ex_status["matched_unity_idx"] = np.nan
-
-    uni_status = unity_n.copy()
-    uni_status["status"] = "ЛИШНЕЕ_В_UNITY"
-    uni_status["matched_exchange_idx"] = np.nan
-
-    def _apply_matches(mdf: pd.DataFrame, label: str) -> None:
-        if mdf is None or mdf.empty:
-            return
-        for _, r in mdf.iterrows():
-            eidx = int(r["exchange_idx"])
-            uidx = int(r["unity_idx"])
-            ex_status.loc[eidx, "status"] = f"СОВПАЛО_{label}"
-            ex_status.loc[eidx, "matched_unity_idx"] = uidx
-            uni_status.loc[uidx, "status"] = f"СОВПАЛО_{label}"
-            uni_status.loc[uidx, "matched_exchange_idx"] = eidx
-
-    _apply_matches(matched_strict, "STRICT")
-    _apply_matches(matched_fuzzy, "FUZZY")
-    _apply_matches(matched_notional, "ОБЪЕМ")
-
-    ex_range = f"{exchange_n['trade_dt_utc'].min()} → {exchange_n['trade_dt_utc'].max()}"
-    u_range = f"{unity_n['trade_dt_utc'].min()} → {unity_n['trade_dt_utc'].max()}"
-
-    warning = ""
-    ex_min = exchange_n["trade_dt_utc"].min()
-    ex_max = exchange_n["trade_dt_utc"].max()
-    u_min = unity_n["trade_dt_utc"].min()
-    u_max = unity_n["trade_dt_utc"].max()
 
+def _time_range_warning(
+    ex_min: Any,
+    ex_max: Any,
+    u_min: Any,
+    u_max: Any,
+    exchange_name: str,
+    used_unity_offset: int,
+) -> str:
     if pd.notna(ex_min) and pd.notna(ex_max) and pd.notna(u_min) and pd.notna(u_max):
         if u_min < ex_min or u_max > ex_max:
-            warning = (
+            return (
                 f"Unity time range выходит за диапазон {exchange_name}. "
                 f"Проверь период выгрузки/таймзону. "
                 f"Unity UTC offset: {used_unity_offset}"
             )
+    return ""
+
+
+def _volume_counts(
+    volume_by_symbol: Optional[pd.DataFrame],
+    agg_ex_sym: Optional[pd.DataFrame],
+    agg_u_sym: Optional[pd.DataFrame],
+) -> Dict[str, int]:
+    if volume_by_symbol is None:
+        return {
+            "volume_symbols_exchange": 0,
+            "volume_symbols_unity": 0,
+            "volume_symbols_ok": 0,
+            "volume_symbols_diff": 0,
+            "volume_symbols_only_exchange": 0,
+            "volume_symbols_only_unity": 0,
+        }
+    status = volume_by_symbol["status"]
+    return {
+        "volume_symbols_exchange": int(agg_ex_sym["symbol"].nunique()),
+        "volume_symbols_unity": int(agg_u_sym["symbol"].nunique()),
+        "volume_symbols_ok": int((status == "OK").sum()),
+        "volume_symbols_diff": int((status == "Расхождение").sum()),
+        "volume_symbols_only_exchange": int((status == "Только Биржа").sum()),
+        "volume_symbols_only_unity": int((status == "Только Unity").sum()),
+    }
+
+
+def _prepare_reconcile(
+    unity_xlsx_path: Path,
+    exchange_path: Path,
+    report_dir: Path,
+    exchange_type: str,
+    params: ReconcileParams,
+    parse_cache: Optional[ParsedUploadCache] = None,
+) -> PendingReport:
+    if _execution_mode(params) == "chunked":
+        from .chunked import _prepare_reconcile_chunked
+        return _prepare_reconcile_chunked(unity_xlsx_path, exchange_path, report_dir, exchange_type, params, parse_cache)
+
+    reused_stages: List[str] = []
+    timings = StageTimings(profile=params.profile_stages)
+    stage = _load_strict_stage(unity_xlsx_path, exchange_path, exchange_type, params, parse_cache, reused_stages, timings)
+    return _finish_reconcile(stage, report_dir, params, reused_stages, timings)
+
+
+def _finish_reconcile(
+    stage: Tuple[str, pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame, Optional[Dict[str, float]], int, pd.DataFrame, pd.DataFrame, pd.DataFrame],
+    report_dir: Path,
+    params: ReconcileParams,
+    reused_stages: List[str],
+    timings: StageTimings,
+) -> PendingReport:
+    (
+        exchange_name, unity_raw, exchange_raw, unity_n, exchange_n, contract_map, used_unity_offset,
+        matched_strict, missing_in_unity, extra_in_unity,
+    ) = stage
+
+    fuzzy_stats: Dict[str, Any] = {}
+    matched_fuzzy, matched_notional, missing_in_unity, extra_in_unity = _match_residuals(
+        exchange_n, missing_in_unity, extra_in_unity, params, fuzzy_stats, timings
+    )
+
+    _stage_rows(timings, "status", len(exchange_n) + len(unity_n))
+    with _stage(timings, "status"):
+        matched_all = _combine_matches(matched_strict, matched_fuzzy, matched_notional)
+        ex_status = _status_frame(exchange_n, "НЕТ_В_UNITY", "matched_unity_idx", matched_all, "exchange_idx", "unity_idx")
+        uni_status = _status_frame(unity_n, "ЛИШНЕЕ_В_UNITY", "matched_exchange_idx", matched_all, "unity_idx", "exchange_idx")
+
+    ex_range = f"{exchange_n['trade_dt_utc'].min()} → {exchange_n['trade_dt_utc'].max()}"
+    u_range = f"{unity_n['trade_dt_utc'].min()} → {unity_n['trade_dt_utc'].max()}"
+
+    warning = _time_range_warning(
+        exchange_n["trade_dt_utc"].min(),
+        exchange_n["trade_dt_utc"].max(),
+        unity_n["trade_dt_utc"].min(),
+        unity_n["trade_dt_utc"].max(),
+        exchange_name,
+        used_unity_offset,
+    )
 
     if contract_map:
         warning = (warning + " | " if warning else "") + f"OKX contracts→base: {contract_map}"
 
     volume_by_symbol = None
     volume_by_symbol_side = None
-    vol_symbols_exchange = 0
-    vol_symbols_unity = 0
-    vol_ok = 0
-    vol_diff = 0
-    vol_only_exchange = 0
-    vol_only_unity = 0
+    vol_counts = _volume_counts(None, None, None)
 
     if params.enable_volume_recon:
-        agg_ex_sym = _agg_volume(exchange_n, by_side=False)
-        agg_u_sym = _agg_volume(unity_n, by_side=False)
-        volume_by_symbol = _compare_volume(agg_ex_sym, agg_u_sym, by_side=False, params=params)
-
-        vol_symbols_exchange = int(agg_ex_sym["symbol"].nunique())
-        vol_symbols_unity = int(agg_u_sym["symbol"].nunique())
-        vol_ok = int((volume_by_symbol["status"] == "OK").sum())
-        vol_diff = int((volume_by_symbol["status"] == "Расхождение").sum())
-        vol_only_exchange = int((volume_by_symbol["status"] == "Только Биржа").sum())
-        vol_only_unity = int((volume_by_symbol["status"] == "Только Unity").sum())
-
-        if params.volume_group_by_side:
-            agg_ex_ss = _agg_volume(exchange_n, by_side=True)
-            agg_u_ss = _agg_volume(unity_n, by_side=True)
-            volume_by_symbol_side = _compare_volume(agg_ex_ss, agg_u_ss, by_side=True, params=params)
+        _stage_rows(timings, "volume", len(exchange_n) + len(unity_n))
+        with _stage(timings, "volume"):
+            by_side = params.volume_group_by_side
+            agg_ex_sym, agg_ex_ss = _volume_levels(_agg_volume(exchange_n, by_side=by_side), by_side)
+            agg_u_sym, agg_u_ss = _volume_levels(_agg_volume(unity_n, by_side=by_side), by_side)
+            volume_by_symbol = _compare_volume(agg_ex_sym, agg_u_sym, by_side=False, params=params)
+            vol_counts = _volume_counts(volume_by_symbol, agg_ex_sym, agg_u_sym)
+
+            if by_side:
+                volume_by_symbol_side = _compare_volume(agg_ex_ss, agg_u_ss, by_side=True, params=params)
 
     vol_total_qty_ex = float(np.nansum(exchange_n["qty"]))
     vol_total_qty_u = float(np.nansum(unity_n["qty"]))
     vol_total_not_ex = float(np.nansum(exchange_n["notional"]))
     vol_total_not_u = float(np.nansum(unity_n["notional"]))
 
+    _stage_rows(timings, "pretty", len(matched_all) + len(missing_in_unity) + len(extra_in_unity))
+    with _stage(timings, "pretty"):
+        pretty = _build_pretty_tables(
+            matched_all=matched_all,
+            exchange_n=exchange_n,
+            unity_n=unity_n,
+            missing_in_unity=missing_in_unity,
+            extra_in_unity=extra_in_unity,
+            ex_status=ex_status,
+            uni_status=uni_status,
+            volume_by_symbol=volume_by_symbol,
+            volume_by_symbol_side=volume_by_symbol_side,
+            exchange_name=exchange_name,
+            params=params,
+        )
+
     summary = ReconcileSummary(
         exchange_name=exchange_name,
         rows_exchange=int(len(exchange_n)),
@@ -238,12 +679,7 @@ def _run_reconcile(
         matched_notional=int(len(matched_notional)),
         missing_in_unity=int(len(missing_in_unity)),
         extra_in_unity=int(len(extra_in_unity)),
-        volume_symbols_exchange=vol_symbols_exchange,
-        volume_symbols_unity=vol_symbols_unity,
-        volume_symbols_ok=vol_ok,
-        volume_symbols_diff=vol_diff,
-        volume_symbols_only_exchange=vol_only_exchange,
-        volume_symbols_only_unity=vol_only_unity,
+        **vol_counts,
         volume_total_qty_exchange=_qround_float(vol_total_qty_ex, params.qty_decimals),
         volume_total_qty_unity=_qround_float(vol_total_qty_u, params.qty_decimals),
         volume_total_notional_exchange=_qround_float(vol_total_not_ex, params.notional_decimals),
@@ -251,47 +687,113 @@ def _run_reconcile(
         exchange_time_range_utc=ex_range,
         unity_time_range_utc=u_range,
         warning=warning,
-    )
-
-    pretty = _build_pretty_tables(
-        matched_all=matched_all,
-        exchange_n=exchange_n,
-        unity_n=unity_n,
-        missing_in_unity=missing_in_unity,
-        extra_in_unity=extra_in_unity,
-        ex_status=ex_status,
-        uni_status=uni_status,
-        volume_by_symbol=volume_by_symbol,
-        volume_by_symbol_side=volume_by_symbol_side,
-        exchange_name=exchange_name,
-        params=params,
+        fuzzy_strategy=_fuzzy_strategy(params),
+        fuzzy_components=int(fuzzy_stats.get("fuzzy_components", 0)),
+        fuzzy_component_max_size=int(fuzzy_stats.get("fuzzy_component_max_size", 0)),
+        fuzzy_component_mean_size=float(fuzzy_stats.get("fuzzy_component_mean_size", 0.0)),
+        fuzzy_components_over_limit=int(fuzzy_stats.get("fuzzy_components_over_limit", 0)),
+        fuzzy_partitions=int(fuzzy_stats.get("fuzzy_partitions", 0)),
+        reused_stages=tuple(reused_stages),
+        stage_profile=_stage_profile(timings),
     )
 
     report_id = str(uuid.uuid4())
-    report_path = report_dir / f"unity_vs_{exchange_name.lower()}_{report_id}.xlsx"
-
-    top_diffs_strict = _top_key_diffs(unity_n, exchange_n, "match_key", limit=50) if params.export_debug_sheets else None
-    top_diffs_notional = _top_key_diffs(unity_n, exchange_n, "notional_key", limit=50) if params.export_debug_sheets else None
-
-    _export_report_xlsx(
+    report_path = report_dir / f"unity_vs_{exchange_name.lower()}_{report_id}{_report_suffix(params)}"
+
+    debug: Dict[str, Any] = {}
+    if params.export_debug_sheets:
+        debug = {
+            "top_diffs_strict": _top_key_diffs(
+                unity_n.assign(match_key=_match_key_display(unity_n, params)),
+                exchange_n.assign(match_key=_match_key_display(exchange_n, params)),
+                "match_key",
+                limit=50,
+            ),
+            "top_diffs_notional": _top_key_diffs(
+                unity_n.assign(notional_key=_notional_key_display(unity_n, params)),
+                exchange_n.assign(notional_key=_notional_key_display(exchange_n, params)),
+                "notional_key",
+                limit=50,
+            ),
+            "raw_exchange": exchange_raw,
+            "raw_unity": unity_raw,
+        }
+
+    return PendingReport(
+        report_id=report_id,
         report_path=report_path,
         summary=summary,
         params=params,
-        exchange_name=exchange_name,
-        matched_pretty=pretty["matched"],
-        missing_pretty=pretty["missing"],
-        extra_pretty=pretty["extra"],
-        ex_status_pretty=pretty["ex_status"],
-        unity_status_pretty=pretty["uni_status"],
-        volume_by_symbol_pretty=pretty["vol_sym"],
-        volume_by_symbol_side_pretty=pretty["vol_ss"],
-        top_diffs_strict=top_diffs_strict,
-        top_diffs_notional=top_diffs_notional,
-        raw_exchange=exchange_raw if params.export_debug_sheets else None,
-        raw_unity=unity_raw if params.export_debug_sheets else None,
+        tables=pretty,
+        debug=debug,
+        timings=timings,
+    )
+
+
+def _write_pending_report(
+    pending: PendingReport,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> ReconcileResult:
+    tables = pending.tables
+    _export_report(
+        report_path=pending.report_path,
+        summary=pending.summary,
+        params=pending.params,
+        exchange_name=pending.summary.exchange_name,
+        matched_pretty=tables["matched"],
+        missing_pretty=tables["missing"],
+        extra_pretty=tables["extra"],
+        ex_status_pretty=tables["ex_status"],
+        unity_status_pretty=tables["uni_status"],
+        volume_by_symbol_pretty=tables["vol_sym"],
+        volume_by_symbol_side_pretty=tables["vol_ss"],
+        progress=progress,
+        timings=pending.timings,
+        **pending.debug,
     )
+    if pending.timings.profile:
+        pending.summary = replace(pending.summary, stage_profile=_stage_profile(pending.timings))
+    return ReconcileResult(
+        report_id=pending.report_id,
+        report_path=pending.report_path,
+        summary=pending.summary,
+        parts_dir=pending.parts_dir,
+    )
+
 
-    return ReconcileResult(report_id=report_id, report_path=report_path, summary=summary), pretty
+def _run_reconcile(
+    unity_xlsx_path: Path,
+    exchange_path: Path,
+    report_dir: Path,
+    exchange_type: str,
+    params: ReconcileParams,
+    parse_cache: Optional[ParsedUploadCache] = None,
+) -> Tuple[ReconcileResult, Dict[str, Any]]:
+    pending = _prepare_reconcile(unity_xlsx_path, exchange_path, report_dir, exchange_type, params, parse_cache)
+    return _write_pending_report(pending), pending.tables
+
+
+def prepare_reconcile_report(
+    unity_xlsx_path: Path,
+    exchange_path: Path,
+    report_dir: Path,
+    exchange_type: str = "BINANCE",
+    params: Optional[ReconcileParams] = None,
+    parse_cache: Optional[ParsedUploadCache] = None,
+    profile_path: Optional[Path] = None,
+) -> PendingReport:
+    params = params or ReconcileParams()
+    with _cprofiled(profile_path):
+        return _prepare_reconcile(unity_xlsx_path, exchange_path, report_dir, exchange_type, params, parse_cache)
+
+
+def write_pending_report(
+    pending: PendingReport,
+    progress: Optional[Callable[[int, int], None]] = None,
+    profile_path: Optional[Path] = None,
+) -> ReconcileResult:
+    with _cprofiled(profile_path):
+        return _write_pending_report(pending, progress)
 
 
 def reconcile_to_report(
@@ -300,9 +802,10 @@ def reconcile_to_report(
     report_dir: Path,
     exchange_type: str = "BINANCE",
     params: Optional[ReconcileParams] = None,
+    parse_cache: Optional[ParsedUploadCache] = None,
 ) -> ReconcileResult:
     params = params or ReconcileParams()
-    result, _ = _run_reconcile(unity_xlsx_path, exchange_path, report_dir, exchange_type, params)
+    result, _ = _run_reconcile(unity_xlsx_path, exchange_path, report_dir, exchange_type, params, parse_cache)
     return result
 
 
@@ -313,9 +816,10 @@ def reconcile_to_report_with_preview(
     exchange_type: str = "BINANCE",
     params: Optional[ReconcileParams] = None,
     preview_limit: int = 2000,
+    parse_cache: Optional[ParsedUploadCache] = None,
 ) -> Tuple[ReconcileResult, Dict[str, List[Dict[str, Any]]]]:
     params = params or ReconcileParams()
-    result, pretty = _run_reconcile(unity_xlsx_path, exchange_path, report_dir, exchange_type, params)
+    result, pretty = _run_reconcile(unity_xlsx_path, exchange_path, report_dir, exchange_type, params, parse_cache)
 
     def _preview_df(df: Optional[pd.DataFrame]) -> List[Dict[str, Any]]:
         if df is None:
@@ -4,21 +4,21 @@ from typing import Any, Dict, List, Optional, Set, Tuple
 
 import numpy as np
 import pandas as pd
+from scipy.optimize import linear_sum_assignment
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
 
 from .models import ReconcileParams
 from .utils import _within_tol
 
 
-def _group_indices_sorted(df: pd.DataFrame, key_col: str) -> Dict[Any, List[int]]:
-    if df.empty:
-        return {}
-    df_sorted = df.sort_values("trade_dt_utc", kind="mergesort")
-    idx_map = df_sorted.groupby(key_col, sort=False).indices
-    res: Dict[Any, List[int]] = {}
-    idx_values = df_sorted.index.to_numpy()
-    for k, pos in idx_map.items():
-        res[k] = idx_values[pos].tolist()
-    return res
+def _rank_within_key(df: pd.DataFrame, key_col: str) -> Tuple[np.ndarray, np.ndarray, pd.Index, np.ndarray]:
+    d = df[[key_col, "trade_dt_utc"]].sort_values("trade_dt_utc", kind="mergesort")
+    d = d[d[key_col].notna()]
+    codes, uniques = pd.factorize(d[key_col].to_numpy())
+    codes = codes.astype(np.int64, copy=False)
+    rank = pd.Series(codes).groupby(codes, sort=False).cumcount().to_numpy(dtype=np.int64)
+    return d.index.to_numpy(), codes, pd.Index(uniques), rank
 
 
 def _reconcile_multiset_by_key(
@@ -27,39 +27,79 @@ def _reconcile_multiset_by_key(
     key_col: str,
 ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
 
-    u_groups = _group_indices_sorted(unity_n, key_col)
-    e_groups = _group_indices_sorted(exchange_n, key_col)
+    e_idx, e_codes, e_keys, e_rank = _rank_within_key(exchange_n, key_col)
+    u_idx, u_codes, u_keys, u_rank = _rank_within_key(unity_n, key_col)
+
+    width = np.int64(max(len(e_idx), len(u_idx)) + 1)
+    u_ecode = e_keys.get_indexer(u_keys).astype(np.int64)[u_codes] if len(u_keys) else np.empty(0, dtype=np.int64)
+    in_e = u_ecode >= 0
 
-    matched: List[Tuple[int, int, str]] = []
-    missing_ex: List[int] = []
-    extra_unity: List[int] = []
+    e_pair = e_codes * width + e_rank
+    u_pair = np.where(in_e, u_ecode * width + u_rank, -1)
 
-    for k, e_idxs in e_groups.items():
-        u_idxs = u_groups.get(k, [])
-        n = min(len(e_idxs), len(u_idxs))
-        for i in range(n):
-            matched.append((int(e_idxs[i]), int(u_idxs[i]), str(k)))
-        if len(e_idxs) > n:
-            missing_ex.extend([int(x) for x in e_idxs[n:]])
-        if len(u_idxs) > n:
-            extra_unity.extend([int(x) for x in u_idxs[n:]])
+    pairs, e_pos, u_pos = np.intersect1d(e_pair, u_pair[in_e], assume_unique=True, return_indices=True)
+    u_pos = np.flatnonzero(in_e)[u_pos]
 
-    for k, u_idxs in u_groups.items():
-        if k not in e_groups:
-            extra_unity.extend([int(x) for x in u_idxs])
+    if len(pairs):
+        matched_df = pd.DataFrame({
+            "exchange_idx": e_idx[e_pos].astype(np.int64),
+            "unity_idx": u_idx[u_pos].astype(np.int64),
+            "key": e_keys[e_codes[e_pos]].astype(str),
+        })
+    else:
+        matched_df = pd.DataFrame(columns=["exchange_idx", "unity_idx", "key"])
+
+    e_left = np.ones(len(e_idx), dtype=bool)
+    e_left[e_pos] = False
+    e_left_pos = np.flatnonzero(e_left)
+    missing_ex = e_idx[e_left_pos[np.argsort(e_pair[e_left_pos], kind="mergesort")]]
+
+    u_left = np.ones(len(u_idx), dtype=bool)
+    u_left[u_pos] = False
+    shared = np.flatnonzero(u_left & in_e)
+    only_u = np.flatnonzero(u_left & ~in_e)
+    extra_unity = np.concatenate([
+        u_idx[shared[np.argsort(u_pair[shared], kind="mergesort")]],
+        u_idx[only_u[np.argsort(u_codes[only_u] * width + u_rank[only_u], kind="mergesort")]],
+    ])
 
-    matched_df = pd.DataFrame(matched, columns=["exchange_idx", "unity_idx", "key"])
     missing_df = exchange_n.loc[missing_ex].copy()
     extra_df = unity_n.loc[extra_unity].copy()
     return matched_df, missing_df, extra_df
 
 
+FUZZY_ENGINES = {"vectorized", "legacy"}
+FUZZY_STRATEGIES = {"greedy", "optimal"}
+
+FUZZY_PAIRS_PER_CHUNK = 2_000_000
+
+
+def _fuzzy_engine(params: ReconcileParams) -> str:
+    engine = (params.fuzzy_engine or "vectorized").strip().lower()
+    if engine not in FUZZY_ENGINES:
+        raise ValueError(f"Unsupported fuzzy_engine: {params.fuzzy_engine}")
+    return engine
+
+
+def _fuzzy_strategy(params: ReconcileParams) -> str:
+    strategy = (params.fuzzy_strategy or "greedy").strip().lower()
+    if strategy not in FUZZY_STRATEGIES:
+        raise ValueError(f"Unsupported fuzzy_strategy: {params.fuzzy_strategy}")
+    if strategy == "optimal" and _fuzzy_engine(params) == "legacy":
+        raise ValueError("fuzzy_strategy=optimal is not supported with fuzzy_engine=legacy")
+    return strategy
+
+
 def _reconcile_fuzzy(
     missing_exchange: pd.DataFrame,
     extra_unity: pd.DataFrame,
     params: ReconcileParams,
+    stats: Optional[Dict[str, Any]] = None,
 ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
 
+    engine = _fuzzy_engine(params)
+    strategy = _fuzzy_strategy(params)
+
     if missing_exchange.empty or extra_unity.empty:
         return (
             pd.DataFrame(columns=["exchange_idx", "unity_idx", "score"]),
@@ -67,6 +107,286 @@ def _reconcile_fuzzy(
             extra_unity,
         )
 
+    if strategy == "optimal":
+        matched_fuzzy = _fuzzy_match_vectorized(missing_exchange, extra_unity, params, optimal=True, stats=stats)
+    elif engine == "legacy":
+        matched_fuzzy = _fuzzy_match_iterrows(missing_exchange, extra_unity, params)
+    else:
+        matched_fuzzy = _fuzzy_match_vectorized(missing_exchange, extra_unity, params)
+
+    return _split_after_fuzzy(matched_fuzzy, missing_exchange, extra_unity)
+
+
+def _split_after_fuzzy(
+    matched_fuzzy: pd.DataFrame,
+    missing_exchange: pd.DataFrame,
+    extra_unity: pd.DataFrame,
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    if not matched_fuzzy.empty:
+        matched_b = set(matched_fuzzy["exchange_idx"].tolist())
+        matched_u = set(matched_fuzzy["unity_idx"].tolist())
+        missing_after = missing_exchange[~missing_exchange.index.isin(matched_b)].copy()
+        extra_after = extra_unity[~extra_unity.index.isin(matched_u)].copy()
+    else:
+        missing_after = missing_exchange
+        extra_after = extra_unity
+
+    return matched_fuzzy, missing_after, extra_after
+
+
+def _fuzzy_group_key(df: pd.DataFrame) -> pd.Series:
+    return df["symbol"].astype(str) + "|" + df["side"].astype(str)
+
+
+def _fuzzy_group_arrays(df: pd.DataFrame) -> Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+    d = df.sort_values("trade_dt_utc", kind="mergesort")
+    times = d["trade_dt_utc"]
+    qty = pd.to_numeric(d["qty"], errors="coerce")
+    price = pd.to_numeric(d["price"], errors="coerce")
+    valid = (times.notna() & qty.notna() & price.notna()).to_numpy()
+
+    rank = np.arange(len(d), dtype=np.int64)[valid]
+    grp = _fuzzy_group_key(d).to_numpy()[valid]
+    t_ns = times.to_numpy(dtype="datetime64[ns]").view(np.int64)[valid]
+    q = qty.to_numpy(dtype=np.float64)[valid]
+    pr = price.to_numpy(dtype=np.float64)[valid]
+    ids = d.index.to_numpy().astype(np.int64)[valid]
+
+    res: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = {}
+    if len(grp) == 0:
+        return res
+    for g, pos in pd.Series(grp).groupby(grp, sort=False).indices.items():
+        res[str(g)] = (t_ns[pos], q[pos], pr[pos], ids[pos], rank[pos])
+    return res
+
+
+def _fuzzy_window_pairs(left: np.ndarray, counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    b_pos = np.repeat(np.arange(len(counts), dtype=np.int64), counts)
+    starts = np.cumsum(counts) - counts
+    u_pos = np.arange(total, dtype=np.int64) - np.repeat(starts - left, counts)
+    return b_pos, u_pos
+
+
+def _fuzzy_candidates(
+    b: Tuple[np.ndarray, ...],
+    u: Tuple[np.ndarray, ...],
+    params: ReconcileParams,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    b_t, b_q, b_p = b[0], b[1], b[2]
+    u_t, u_q, u_p = u[0], u[1], u[2]
+    win_ns = int(pd.Timedelta(seconds=int(params.time_window_seconds)).value)
+
+    left = np.searchsorted(u_t, b_t - win_ns, side="left")
+    right = np.searchsorted(u_t, b_t + win_ns, side="right")
+    counts = np.maximum(right - left, 0)
+
+    out_b: List[np.ndarray] = []
+    out_u: List[np.ndarray] = []
+    out_s: List[np.ndarray] = []
+
+    bounds = np.cumsum(counts)
+    start = 0
+    while start < len(b_t):
+        base = int(bounds[start - 1]) if start > 0 else 0
+        stop = int(np.searchsorted(bounds, base + FUZZY_PAIRS_PER_CHUNK, side="right"))
+        stop = max(stop, start + 1)
+
+        bp_local, up = _fuzzy_window_pairs(left[start:stop], counts[start:stop])
+        bp = bp_local + start
+        start = stop
+        if len(bp) == 0:
+            continue
+
+        bq, uq = b_q[bp], u_q[up]
+        bpr, upr = b_p[bp], u_p[up]
+
+        qty_diff = np.abs(uq - bq)
+        price_diff = np.abs(upr - bpr)
+        ok = qty_diff <= np.maximum(params.qty_abs_tol, params.qty_rel_tol * np.abs(bq))
+        ok &= price_diff <= np.maximum(params.price_abs_tol, params.price_rel_tol * np.abs(bpr))
+        if not ok.any():
+            continue
+
+        bp, up = bp[ok], up[ok]
+        bq, uq, bpr, upr = bq[ok], uq[ok], bpr[ok], upr[ok]
+        qty_diff, price_diff = qty_diff[ok], price_diff[ok]
+
+        dt_sec = np.abs(u_t[up] - b_t[bp]) / 1e9
+        qty_den = np.where(np.abs(bq) > 0, np.abs(bq), 1.0)
+        price_den = np.where(np.abs(bpr) > 0, np.abs(bpr), 1.0)
+        score = dt_sec + 1000.0 * (qty_diff / qty_den) + 1000.0 * (price_diff / price_den)
+
+        out_b.append(bp)
+        out_u.append(up)
+        out_s.append(score)
+
+    if not out_b:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, np.empty(0, dtype=np.float64)
+    return np.concatenate(out_b), np.concatenate(out_u), np.concatenate(out_s)
+
+
+def _fuzzy_greedy_assign(
+    b_pos: np.ndarray,
+    u_pos: np.ndarray,
+    score: np.ndarray,
+    n_unity: int,
+) -> Tuple[List[int], List[int], List[float]]:
+    order = np.lexsort((u_pos, score, b_pos))
+    b_sorted = b_pos[order]
+    u_sorted = u_pos[order].tolist()
+    s_sorted = score[order].tolist()
+
+    starts = np.flatnonzero(np.r_[True, b_sorted[1:] != b_sorted[:-1]])
+    ends = np.r_[starts[1:], len(b_sorted)]
+
+    used = np.zeros(n_unity, dtype=bool)
+    res_b: List[int] = []
+    res_u: List[int] = []
+    res_s: List[float] = []
+    for st, en, bi in zip(starts.tolist(), ends.tolist(), b_sorted[starts].tolist()):
+        for k in range(st, en):
+            j = u_sorted[k]
+            if used[j]:
+                continue
+            used[j] = True
+            res_b.append(bi)
+            res_u.append(j)
+            res_s.append(s_sorted[k])
+            break
+    return res_b, res_u, res_s
+
+
+def _fuzzy_optimal_assign(
+    b_pos: np.ndarray,
+    u_pos: np.ndarray,
+    score: np.ndarray,
+    n_exchange: int,
+    n_unity: int,
+    max_component: int,
+    comp_sizes: List[int],
+) -> Tuple[List[int], List[int], List[float], int]:
+    graph = coo_matrix(
+        (np.ones(len(b_pos), dtype=np.int8), (b_pos, u_pos + n_exchange)),
+        shape=(n_exchange + n_unity, n_exchange + n_unity),
+    )
+    _, labels = connected_components(graph, directed=False)
+
+    edge_label = labels[b_pos]
+    order = np.lexsort((u_pos, b_pos, edge_label))
+    b_pos, u_pos, score, edge_label = b_pos[order], u_pos[order], score[order], edge_label[order]
+
+    starts = np.flatnonzero(np.r_[True, edge_label[1:] != edge_label[:-1]])
+    ends = np.r_[starts[1:], len(edge_label)]
+
+    res_b: List[int] = []
+    res_u: List[int] = []
+    res_s: List[float] = []
+    over_limit = 0
+
+    for st, en in zip(starts.tolist(), ends.tolist()):
+        if en - st == 1:
+            comp_sizes.append(2)
+            res_b.append(int(b_pos[st]))
+            res_u.append(int(u_pos[st]))
+            res_s.append(float(score[st]))
+            continue
+
+        cb, cu, cs = b_pos[st:en], u_pos[st:en], score[st:en]
+        rows, b_local = np.unique(cb, return_inverse=True)
+        cols, u_local = np.unique(cu, return_inverse=True)
+        comp_sizes.append(len(rows) + len(cols))
+
+        if len(rows) + len(cols) > max_component:
+            over_limit += 1
+            gb, gu, gs = _fuzzy_greedy_assign(cb, cu, cs, n_unity)
+            res_b.extend(gb)
+            res_u.extend(gu)
+            res_s.extend(gs)
+            continue
+
+        big = (float(cs.max()) + 1.0) * (min(len(rows), len(cols)) + 1)
+        cost = np.full((len(rows), len(cols)), big, dtype=np.float64)
+        cost[b_local, u_local] = cs
+        has_edge = np.zeros((len(rows), len(cols)), dtype=bool)
+        has_edge[b_local, u_local] = True
+
+        r_idx, c_idx = linear_sum_assignment(cost)
+        keep = has_edge[r_idx, c_idx]
+        r_idx, c_idx = r_idx[keep], c_idx[keep]
+        res_b.extend(rows[r_idx].tolist())
+        res_u.extend(cols[c_idx].tolist())
+        res_s.extend(cost[r_idx, c_idx].tolist())
+
+    return res_b, res_u, res_s, over_limit
+
+
+def _fuzzy_match_vectorized(
+    missing_exchange: pd.DataFrame,
+    extra_unity: pd.DataFrame,
+    params: ReconcileParams,
+    *,
+    optimal: bool = False,
+    stats: Optional[Dict[str, Any]] = None,
+) -> pd.DataFrame:
+    b_groups = _fuzzy_group_arrays(missing_exchange)
+    u_groups = _fuzzy_group_arrays(extra_unity)
+
+    ranks: List[np.ndarray] = []
+    e_ids: List[np.ndarray] = []
+    u_ids: List[np.ndarray] = []
+    scores: List[np.ndarray] = []
+    comp_sizes: List[int] = []
+    over_limit = 0
+
+    for grp, b in b_groups.items():
+        u = u_groups.get(grp)
+        if u is None:
+            continue
+        bp, up, sc = _fuzzy_candidates(b, u, params)
+        if len(bp) == 0:
+            continue
+        if optimal:
+            rb, ru, rs, n_over = _fuzzy_optimal_assign(
+                bp, up, sc, len(b[0]), len(u[0]), int(params.fuzzy_optimal_max_component), comp_sizes
+            )
+            over_limit += n_over
+        else:
+            rb, ru, rs = _fuzzy_greedy_assign(bp, up, sc, len(u[0]))
+        if not rb:
+            continue
+        rb_arr = np.asarray(rb, dtype=np.int64)
+        ru_arr = np.asarray(ru, dtype=np.int64)
+        ranks.append(b[4][rb_arr])
+        e_ids.append(b[3][rb_arr])
+        u_ids.append(u[3][ru_arr])
+        scores.append(np.asarray(rs, dtype=np.float64))
+
+    if stats is not None and optimal:
+        stats["fuzzy_components"] = len(comp_sizes)
+        stats["fuzzy_component_max_size"] = int(max(comp_sizes)) if comp_sizes else 0
+        stats["fuzzy_component_mean_size"] = float(np.mean(comp_sizes)) if comp_sizes else 0.0
+        stats["fuzzy_components_over_limit"] = over_limit
+
+    if not ranks:
+        return pd.DataFrame(columns=["exchange_idx", "unity_idx", "score"])
+
+    order = np.argsort(np.concatenate(ranks), kind="mergesort")
+    return pd.DataFrame({
+        "exchange_idx": np.concatenate(e_ids)[order],
+        "unity_idx": np.concatenate(u_ids)[order],
+        "score": np.concatenate(scores)[order],
+    })
+
+
+def _fuzzy_match_iterrows(
+    missing_exchange: pd.DataFrame,
+    extra_unity: pd.DataFrame,
+    params: ReconcileParams,
+) -> pd.DataFrame:
     b = missing_exchange.copy()
     u = extra_unity.copy()
 
@@ -151,15 +471,4 @@ def _reconcile_fuzzy(
             used_unity.add(best_uid)
             matched_rows.append({"exchange_idx": int(brow["_idx"]), "unity_idx": int(best_uid), "score": float(best_score)})
 
-    matched_fuzzy = pd.DataFrame(matched_rows, columns=["exchange_idx", "unity_idx", "score"])
-
-    if not matched_fuzzy.empty:
-        matched_b = set(matched_fuzzy["exchange_idx"].tolist())
-        matched_u = set(matched_fuzzy["unity_idx"].tolist())
-        missing_after = missing_exchange[~missing_exchange.index.isin(matched_b)].copy()
-        extra_after = extra_unity[~extra_unity.index.isin(matched_u)].copy()
-    else:
-        missing_after = missing_exchange
-        extra_after = extra_unity
-
-    return matched_fuzzy, missing_after, extra_after
+    return pd.DataFrame(matched_rows, columns=["exchange_idx", "unity_idx", "score"])
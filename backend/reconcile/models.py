@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from datetime import date
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 
 @dataclass(frozen=True)
@@ -16,6 +17,9 @@ class ReconcileParams:
     okx_contract_value_autodetect: bool = True
     okx_contract_value_snap: bool = True
     okx_contract_value_candidates: Tuple[float, ...] = (1.0, 0.1, 0.01, 0.001, 0.0001)
+    okx_contract_registry: bool = True
+    okx_contract_registry_min_confidence: float = 0.9
+    okx_contract_registry_recheck: bool = False
 
     bybit_utc_offset_hours: Optional[int] = 0
     bybit_filter_trade_actions: bool = True
@@ -24,8 +28,17 @@ class ReconcileParams:
     price_decimals: int = 8
 
     enable_fuzzy: bool = True
+    fuzzy_engine: str = "vectorized"
+    fuzzy_strategy: str = "greedy"
+    fuzzy_optimal_max_component: int = 400
     time_window_seconds: int = 180
 
+    execution_mode: str = "serial"
+    parallel_workers: int = 0
+    parallel_min_rows: int = 50_000
+    chunk_rows: int = 1_000_000
+    chunk_window_minutes: int = 60
+
     qty_rel_tol: float = 1e-6
     qty_abs_tol: float = 0.0
 
@@ -49,6 +62,33 @@ class ReconcileParams:
     export_debug_sheets: bool = False
     export_mode: str = "compact"
 
+    profile_stages: bool = False
+    profile_dump: bool = False
+
+    batch_workers: int = 0
+
+
+NORMALIZE_PARAM_FIELDS: Tuple[str, ...] = (
+    "unity_utc_offset_hours",
+    "okx_utc_offset_hours",
+    "okx_filter_trade_actions",
+    "okx_contract_value_overrides",
+    "okx_contract_value_autodetect",
+    "okx_contract_value_snap",
+    "okx_contract_value_candidates",
+    "okx_contract_registry",
+    "okx_contract_registry_min_confidence",
+    "okx_contract_registry_recheck",
+    "bybit_utc_offset_hours",
+    "bybit_filter_trade_actions",
+    "qty_decimals",
+    "price_decimals",
+    "notional_decimals",
+    "notional_use_minute_bucket",
+    "binance_delimiter",
+    "export_debug_sheets",
+)
+
 
 @dataclass(frozen=True)
 class ReconcileSummary:
@@ -78,9 +118,62 @@ class ReconcileSummary:
     unity_time_range_utc: str
     warning: str = ""
 
+    fuzzy_strategy: str = "greedy"
+    fuzzy_components: int = 0
+    fuzzy_component_max_size: int = 0
+    fuzzy_component_mean_size: float = 0.0
+    fuzzy_components_over_limit: int = 0
+    fuzzy_partitions: int = 0
+    chunk_windows: int = 0
+
+    reused_stages: Tuple[str, ...] = ()
+    stage_profile: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
 
 @dataclass(frozen=True)
 class ReconcileResult:
     report_id: str
     report_path: Path
     summary: ReconcileSummary
+    parts_dir: Optional[Path] = None
+
+
+@dataclass(frozen=True)
+class BatchReconcileResult:
+    batch_id: str
+    report_path: Path
+    results: Dict[str, ReconcileResult]
+    rows_unity: int
+    rows_unity_unassigned: int
+    tables_dirs: Dict[str, Path]
+
+
+@dataclass(frozen=True)
+class OkxContractValue:
+    symbol: str
+    contract_value: float
+    confidence: float
+    samples: int = 1
+    last_seen: Optional[date] = None
+
+
+@dataclass
+class StageTimings:
+    seconds: Dict[str, float] = field(default_factory=dict)
+    spans: List[Tuple[str, float, float]] = field(default_factory=list)
+    profile: bool = False
+    cpu_seconds: Dict[str, float] = field(default_factory=dict)
+    rss_delta: Dict[str, int] = field(default_factory=dict)
+    rows: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class PendingReport:
+    report_id: str
+    report_path: Path
+    summary: ReconcileSummary
+    params: ReconcileParams
+    tables: Dict[str, Any]
+    debug: Dict[str, Any] = field(default_factory=dict)
+    parts_dir: Optional[Path] = None
+    timings: StageTimings = field(default_factory=StageTimings)
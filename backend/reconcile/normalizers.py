@@ -1,19 +1,164 @@
 from __future__ import annotations
 
-from typing import Any, Callable, Dict, Optional, Tuple
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
-from .models import ReconcileParams
+from .contracts import OKX_CONTRACT_SNAP_TOL, OkxContractRegistry, _contract_confidence
+from .models import OkxContractValue, ReconcileParams
 from .utils import (
-    _detect_unity_offset_hours_from_text,
     _extract_symbol_from_unity,
+    _extract_symbol_plain,
+    _map_symbols,
+    _parse_trade_times,
     _to_numeric_series,
     _qround_str,
+    _qround_ticks,
     _snap_value,
+    _ticks_to_str,
+    TICKS_NA,
 )
 
+log = logging.getLogger(__name__)
+
+MATCH_KEY_PARTS = ["symbol", "side", "qty_ticks", "price_ticks"]
+TICK_SOURCES: Dict[str, Tuple[str, str]] = {
+    "qty_ticks": ("qty", "qty_decimals"),
+    "price_ticks": ("price", "price_decimals"),
+    "notional_ticks": ("notional", "notional_decimals"),
+}
+
+UNITY_USECOLS = [
+    "ID",
+    "Instrument",
+    "Side",
+    "Transact time",
+    "Price",
+    "Absolute amount",
+    "Amount",
+    "Net commission amount",
+]
+
+UNITY_REPORT_COLS = ["ID", "Transact time", "Instrument", "Net commission amount"]
+EXCHANGE_REPORT_COLS = ["Insert Time", "Trade ID", "Order ID", "Fee", "Commission Asset"]
+
+
+def _add_key_ticks(out: pd.DataFrame, params: ReconcileParams) -> None:
+    out["qty_ticks"] = _qround_ticks(out["qty"], params.qty_decimals)
+    out["price_ticks"] = _qround_ticks(out["price"], params.price_decimals)
+    out["notional"] = out["qty"] * out["price"]
+    out["notional_ticks"] = _qround_ticks(out["notional"], params.notional_decimals)
+
+
+def _notional_key_parts(params: ReconcileParams) -> List[str]:
+    if params.notional_use_minute_bucket:
+        return ["symbol", "side", "minute_utc", "notional_ticks"]
+    return ["symbol", "side", "notional_ticks"]
+
+
+def _joint_codes(a: pd.Series, b: pd.Series) -> Tuple[np.ndarray, np.ndarray, int]:
+    av = a.to_numpy()
+    bv = b.to_numpy()
+    if np.issubdtype(av.dtype, np.datetime64):
+        av = av.astype("datetime64[ns]").view(np.int64)
+        bv = bv.astype("datetime64[ns]").view(np.int64)
+    codes, uniques = pd.factorize(np.concatenate([av, bv]), use_na_sentinel=False)
+    codes = codes.astype(np.int64, copy=False)
+    return codes[: len(av)], codes[len(av):], len(uniques)
+
+
+def _tick_overflow(df: pd.DataFrame, part: str) -> np.ndarray:
+    source = TICK_SOURCES[part][0]
+    ticks = df[part].to_numpy(dtype=np.int64)
+    return (ticks == TICKS_NA) & np.isfinite(pd.to_numeric(df[source], errors="coerce").to_numpy(dtype=float))
+
+
+def _tick_key_values(df: pd.DataFrame, part: str, params: ReconcileParams) -> pd.Series:
+    over = _tick_overflow(df, part)
+    if not over.any():
+        return df[part]
+    source, decimals = TICK_SOURCES[part]
+    out = df[part].astype(object)
+    out[over] = [_qround_str(v, getattr(params, decimals)) for v in df[source].to_numpy()[over]]
+    return out
+
+
+def _ticks_display(df: pd.DataFrame, part: str, params: ReconcileParams) -> np.ndarray:
+    source, decimals = TICK_SOURCES[part]
+    out = _ticks_to_str(df[part], getattr(params, decimals))
+    over = _tick_overflow(df, part)
+    if over.any():
+        out[over] = [_qround_str(v, getattr(params, decimals)) for v in df[source].to_numpy()[over]]
+    return out
+
+
+def _pack_key_codes(
+    unity_n: pd.DataFrame,
+    exchange_n: pd.DataFrame,
+    parts: List[str],
+    params: Optional[ReconcileParams] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    cols = []
+    by_str = False
+    for p in parts:
+        if params is not None and p in TICK_SOURCES:
+            u, e = _tick_key_values(unity_n, p, params), _tick_key_values(exchange_n, p, params)
+            by_str = by_str or u.dtype == object or e.dtype == object
+        else:
+            u, e = unity_n[p], exchange_n[p]
+        cols.append(_joint_codes(u, e))
+
+    total = 1
+    for _, _, n in cols:
+        total *= max(int(n), 1)
+
+    if not by_str and total < 2 ** 63:
+        packed_u = np.zeros(len(unity_n), dtype=np.int64)
+        packed_e = np.zeros(len(exchange_n), dtype=np.int64)
+        for cu, ce, n in cols:
+            packed_u = packed_u * max(int(n), 1) + cu
+            packed_e = packed_e * max(int(n), 1) + ce
+        return packed_u, packed_e
+
+    both = pd.DataFrame({
+        str(i): np.concatenate([cu, ce]) for i, (cu, ce, _) in enumerate(cols)
+    })
+    ng = both.groupby(list(both.columns), sort=False).ngroup().to_numpy(dtype=np.int64)
+    return ng[: len(unity_n)], ng[len(unity_n):]
+
+
+def _assign_notional_codes(unity_n: pd.DataFrame, exchange_n: pd.DataFrame, params: ReconcileParams) -> None:
+    unity_n["notional_code"], exchange_n["notional_code"] = _pack_key_codes(
+        unity_n, exchange_n, _notional_key_parts(params), params
+    )
+
+
+def _assign_match_codes(unity_n: pd.DataFrame, exchange_n: pd.DataFrame, params: ReconcileParams) -> None:
+    unity_n["match_code"], exchange_n["match_code"] = _pack_key_codes(unity_n, exchange_n, MATCH_KEY_PARTS, params)
+    _assign_notional_codes(unity_n, exchange_n, params)
+
+
+def _match_key_display(df: pd.DataFrame, params: ReconcileParams) -> pd.Series:
+    return (
+        df["symbol"].astype(str) + "|" +
+        df["side"].astype(str) + "|" +
+        _ticks_display(df, "qty_ticks", params) + "|" +
+        _ticks_display(df, "price_ticks", params)
+    )
+
+
+def _notional_key_display(df: pd.DataFrame, params: ReconcileParams) -> pd.Series:
+    key = df["symbol"].astype(str) + "|" + df["side"].astype(str) + "|"
+    if params.notional_use_minute_bucket:
+        key = key + df["minute_utc"].astype(str) + "|"
+    return key + _ticks_display(df, "notional_ticks", params)
+
+
+def _carry_columns(df: pd.DataFrame, cols: List[str]) -> pd.DataFrame:
+    return pd.DataFrame({c: df[c] for c in cols if c in df.columns}, index=df.index, copy=False)
+
 
 def _normalize_unity(df: pd.DataFrame, params: ReconcileParams) -> Tuple[pd.DataFrame, int]:
     need_cols = ["Instrument", "Side", "Transact time", "Price"]
@@ -21,55 +166,35 @@ def _normalize_unity(df: pd.DataFrame, params: ReconcileParams) -> Tuple[pd.Data
         if c not in df.columns:
             raise ValueError(f"Unity file missing required column: {c}")
 
-    out = df.copy()
-    out["symbol"] = out["Instrument"].map(_extract_symbol_from_unity)
-    out["side"] = out["Side"].astype(str).str.strip().str.upper()
-
-    qty_col = "Absolute amount" if "Absolute amount" in out.columns else ("Amount" if "Amount" in out.columns else None)
+    qty_col = "Absolute amount" if "Absolute amount" in df.columns else ("Amount" if "Amount" in df.columns else None)
     if not qty_col:
         raise ValueError("Unity file must contain 'Absolute amount' or 'Amount'")
 
-    out["qty"] = _to_numeric_series(out[qty_col]).abs()
-    out["price"] = _to_numeric_series(out["Price"])
+    out = _carry_columns(df, UNITY_REPORT_COLS)
+    out["symbol"] = _map_symbols(df["Instrument"], _extract_symbol_from_unity)
+    out["side"] = df["Side"].astype(str).str.strip().str.upper()
+    out["qty"] = _to_numeric_series(df[qty_col]).abs()
+    out["price"] = _to_numeric_series(df["Price"])
 
+    trade_dt_local, parsed_offset = _parse_trade_times(df["Transact time"], "unity", utc_suffix=True)
     offset = params.unity_utc_offset_hours
     if offset is None:
-        sample = out["Transact time"].dropna().astype(str).head(20).tolist()
-        offset = _detect_unity_offset_hours_from_text(sample[0], default_hours=5) if sample else 5
+        offset = parsed_offset if parsed_offset is not None else 5
 
-    tt = out["Transact time"].astype(str).str.replace(r"\s*\(UTC[^\)]*\)\s*", "", regex=True).str.strip()
-    out["trade_dt_local"] = pd.to_datetime(tt, dayfirst=True, errors="coerce")
-    out["trade_dt_utc"] = out["trade_dt_local"] - pd.Timedelta(hours=int(offset))
+    out["trade_dt_local"] = trade_dt_local
+    out["trade_dt_utc"] = trade_dt_local - pd.Timedelta(hours=int(offset))
     out["minute_utc"] = out["trade_dt_utc"].dt.floor("min")
 
-    out["qty_r"] = out["qty"].map(lambda x: _qround_str(x, params.qty_decimals))
-    out["price_r"] = out["price"].map(lambda x: _qround_str(x, params.price_decimals))
-
-    out["match_key"] = (
-        out["symbol"].astype(str) + "|" +
-        out["side"].astype(str) + "|" +
-        out["qty_r"].astype(str) + "|" +
-        out["price_r"].astype(str)
-    )
+    _add_key_ticks(out, params)
 
-    out["notional"] = out["qty"] * out["price"]
-    out["notional_r"] = out["notional"].map(lambda x: _qround_str(x, params.notional_decimals))
+    return out, int(offset)
 
-    if params.notional_use_minute_bucket:
-        out["notional_key"] = (
-            out["symbol"].astype(str) + "|" +
-            out["side"].astype(str) + "|" +
-            out["minute_utc"].astype(str) + "|" +
-            out["notional_r"].astype(str)
-        )
-    else:
-        out["notional_key"] = (
-            out["symbol"].astype(str) + "|" +
-            out["side"].astype(str) + "|" +
-            out["notional_r"].astype(str)
-        )
 
-    return out, int(offset)
+def _unity_for_exchange(unity_n: pd.DataFrame, exchange_type: str, params: ReconcileParams) -> pd.DataFrame:
+    if exchange_type == "BYBIT":
+        unity_n["qty"] = unity_n["qty"] * 100
+        _add_key_ticks(unity_n, params)
+    return unity_n
 
 
 def _normalize_exchange_common(
@@ -77,7 +202,7 @@ def _normalize_exchange_common(
     params: ReconcileParams,
     *,
     time_offset_hours: int = 0,
-    symbol_mapper: Callable[[Any], str] = lambda x: str(x).upper().strip() if x is not None else "",
+    symbol_mapper: Callable[[Any], str] = _extract_symbol_plain,
     action_filter: Optional[set] = None,
     contract_value_map: Optional[Dict[str, float]] = None,
     trading_unit_col: Optional[str] = None,
@@ -87,66 +212,38 @@ def _normalize_exchange_common(
         if c not in df.columns:
             raise ValueError(f"Exchange file missing required column: {c}. Available: {list(df.columns)}")
 
-    out = df.copy()
-
-    out["Symbol"] = out["Symbol"].map(symbol_mapper)
-    out["Side"] = out["Side"].astype(str).str.strip().str.upper()
+    out = _carry_columns(df, EXCHANGE_REPORT_COLS)
+    out["symbol"] = _map_symbols(df["Symbol"], symbol_mapper)
+    out["side"] = df["Side"].astype(str).str.strip().str.upper()
+    out["qty"] = _to_numeric_series(df["Quantity"]).abs()
+    out["price"] = _to_numeric_series(df["Price"])
 
-    qty_raw = _to_numeric_series(out["Quantity"]).abs()
-    price = _to_numeric_series(out["Price"])
+    has_unit = bool(trading_unit_col) and trading_unit_col in df.columns
+    if has_unit:
+        out["_unit"] = df[trading_unit_col]
 
     if action_filter is not None:
-        mask = out["Side"].isin(action_filter)
-        out = out.loc[mask].copy()
-        qty_raw = qty_raw.loc[mask]
-        price = price.loc[mask]
+        out = out.take(np.flatnonzero(out["side"].isin(action_filter).to_numpy()))
 
-    out["symbol"] = out["Symbol"].astype(str).str.strip().str.upper()
-    out["side"] = out["Side"].astype(str).str.strip().str.upper()
+    out["symbol"] = out["symbol"].astype(str).str.strip().str.upper()
 
     mult = pd.Series(1.0, index=out.index)
     if contract_value_map:
         mult = out["symbol"].map(lambda s: float(contract_value_map.get(str(s), 1.0))).astype(float)
 
-    if trading_unit_col and trading_unit_col in out.columns:
-        unit = out[trading_unit_col].astype(str).str.strip().str.lower()
+    if has_unit:
+        unit = out.pop("_unit").astype(str).str.strip().str.lower()
         is_cont = unit.isin(["cont", "contract", "contracts"])
-        out["qty"] = qty_raw * np.where(is_cont, mult, 1.0)
+        out["qty"] = out["qty"] * np.where(is_cont, mult, 1.0)
     else:
-        out["qty"] = qty_raw * mult
+        out["qty"] = out["qty"] * mult
 
-    out["price"] = price
-
-    out["trade_dt_local"] = pd.to_datetime(out["Insert Time"], dayfirst=True, errors="coerce")
-    out["trade_dt_utc"] = out["trade_dt_local"] - pd.Timedelta(hours=int(time_offset_hours))
+    trade_dt_local, _ = _parse_trade_times(out["Insert Time"], "exchange")
+    out["trade_dt_local"] = trade_dt_local
+    out["trade_dt_utc"] = trade_dt_local - pd.Timedelta(hours=int(time_offset_hours))
     out["minute_utc"] = out["trade_dt_utc"].dt.floor("min")
 
-    out["qty_r"] = out["qty"].map(lambda x: _qround_str(x, params.qty_decimals))
-    out["price_r"] = out["price"].map(lambda x: _qround_str(x, params.price_decimals))
-
-    out["match_key"] = (
-        out["symbol"].astype(str) + "|" +
-        out["side"].astype(str) + "|" +
-        out["qty_r"].astype(str) + "|" +
-        out["price_r"].astype(str)
-    )
-
-    out["notional"] = out["qty"] * out["price"]
-    out["notional_r"] = out["notional"].map(lambda x: _qround_str(x, params.notional_decimals))
-
-    if params.notional_use_minute_bucket:
-        out["notional_key"] = (
-            out["symbol"].astype(str) + "|" +
-            out["side"].astype(str) + "|" +
-            out["minute_utc"].astype(str) + "|" +
-            out["notional_r"].astype(str)
-        )
-    else:
-        out["notional_key"] = (
-            out["symbol"].astype(str) + "|" +
-            out["side"].astype(str) + "|" +
-            out["notional_r"].astype(str)
-        )
+    _add_key_ticks(out, params)
 
     return out
 
@@ -157,39 +254,65 @@ def _infer_okx_contract_value_map(
     symbol_mapper: Callable[[Any], str],
     action_filter: Optional[set],
     params: ReconcileParams,
+    registry: Optional[OkxContractRegistry] = None,
 ) -> Dict[str, float]:
 
+    out: Dict[str, float] = dict(params.okx_contract_value_overrides)
     if not params.okx_contract_value_autodetect:
-        return dict(params.okx_contract_value_overrides)
+        return out
+
+    u_tot = unity_n.groupby("symbol")["qty"].sum()
+    known = registry.known(params.okx_contract_registry_min_confidence) if registry is not None else {}
+    out.update({sym: known[sym] for sym in u_tot.index if sym in known and sym not in out})
+    recheck = params.okx_contract_registry_recheck
+    pending = [sym for sym in u_tot.index if sym not in params.okx_contract_value_overrides and (recheck or sym not in known)]
+    if not pending:
+        return out
 
     if "Quantity" not in okx_std.columns or "Symbol" not in okx_std.columns:
-        return dict(params.okx_contract_value_overrides)
+        return out
 
-    tmp = okx_std.copy()
-    tmp["Symbol"] = tmp["Symbol"].map(symbol_mapper)
-    tmp["Side"] = tmp["Side"].astype(str).str.strip().str.upper()
+    symbol = _map_symbols(okx_std["Symbol"], symbol_mapper).astype(str).str.strip().str.upper()
+    mask = symbol.isin(pending)
     if action_filter is not None:
-        tmp = tmp[tmp["Side"].isin(action_filter)].copy()
-
-    tmp["symbol"] = tmp["Symbol"].astype(str).str.strip().str.upper()
-    qty_contracts = _to_numeric_series(tmp["Quantity"]).abs()
-    e_tot = qty_contracts.groupby(tmp["symbol"]).sum()
-
-    u_tot = unity_n.groupby("symbol")["qty"].sum()
-
-    out: Dict[str, float] = dict(params.okx_contract_value_overrides)
-    for sym in (set(u_tot.index) & set(e_tot.index)):
-        if sym in out:
-            continue
-        denom = float(e_tot.loc[sym])
+        mask &= okx_std["Side"].astype(str).str.strip().str.upper().isin(action_filter)
+    rows = np.flatnonzero(mask.to_numpy())
+    qty_contracts = _to_numeric_series(okx_std["Quantity"].take(rows)).abs()
+    e_tot = qty_contracts.groupby(symbol.take(rows).to_numpy()).sum()
+
+    learned: List[OkxContractValue] = []
+    disputed: List[str] = []
+    last_seen = unity_n.groupby("symbol")["trade_dt_utc"].max() if registry is not None else None
+    for sym in pending:
+        denom = float(e_tot.loc[sym]) if sym in e_tot.index else 0.0
         num = float(u_tot.loc[sym])
         if denom <= 0 or num <= 0:
             continue
         ratio = num / denom
-        if params.okx_contract_value_snap:
-            snapped = _snap_value(ratio, params.okx_contract_value_candidates, rel_tol=0.10)
-            out[sym] = float(snapped if snapped is not None else ratio)
+        snapped = _snap_value(ratio, params.okx_contract_value_candidates, rel_tol=OKX_CONTRACT_SNAP_TOL)
+        confidence = _contract_confidence(ratio, params.okx_contract_value_candidates)
+        if sym in known:
+            if abs(ratio - known[sym]) / known[sym] > OKX_CONTRACT_SNAP_TOL:
+                log.warning(
+                    "okx contract value for %s disputed: registry=%s, observed ratio=%s", sym, known[sym], ratio
+                )
+                disputed.append(sym)
+            continue
+        if params.okx_contract_value_snap and snapped is not None:
+            out[sym] = float(snapped)
         else:
             out[sym] = float(ratio)
-
+        if last_seen is not None and confidence > 0 and snapped is not None:
+            seen = last_seen.get(sym)
+            learned.append(
+                OkxContractValue(
+                    symbol=sym,
+                    contract_value=float(snapped),
+                    confidence=confidence,
+                    last_seen=seen.date() if pd.notna(seen) else None,
+                )
+            )
+
+    if learned or disputed:
+        registry.learn(learned, disputed)
     return out
@@ -1,28 +1,83 @@
 from __future__ import annotations
 
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional
 
 import numpy as np
 import pandas as pd
 
 from .utils import _pick_col, _pick_col_optional
 
+OKX_COLUMNS: Dict[str, List[str]] = {
+    "time": ["Time", "Trade Time", "Fill Time", "Timestamp"],
+    "symbol": ["Symbol", "Instrument", "Inst", "Trading Pair", "Currency Pair"],
+    "side": ["Action", "Side", "Direction"],
+    "qty": ["Amount", "Quantity", "Size", "Filled Amount", "Qty"],
+    "price": ["Filled Price", "Price", "Fill Price", "Avg Price"],
+    "trade_id": ["id", "Trade ID", "Fill ID", "trade id", "﻿id"],
+    "order_id": ["Order id", "Order ID", "order id"],
+    "fee": ["Fee", "Trading Fee", "Commission"],
+    "fee_unit": ["Fee Unit", "Commission Asset", "Fee Currency", "Fee Coin"],
+    "unit": ["Trading Unit", "Unit"],
+}
+
+BINANCE_COLUMNS: Dict[str, List[str]] = {
+    "time": ["Insert Time", "Time", "Date(UTC)", "Date (UTC)", "Trade Time"],
+    "symbol": ["Symbol", "Pair", "Market", "Instrument"],
+    "side": ["Side", "Action", "Direction"],
+    "price": ["Price", "Avg Price", "Filled Price"],
+    "qty": ["Quantity", "Qty", "Executed", "Amount"],
+    "trade_id": ["Trade ID", "TradeId", "ID", "id"],
+    "order_id": ["Order ID", "OrderId", "Order id", "Order No.", "Order No"],
+    "fee": ["Fee", "Commission", "Trading Fee"],
+    "fee_asset": ["Commission Asset", "Fee Unit", "Fee Asset", "Commission Coin"],
+}
+
+BYBIT_COLUMNS: Dict[str, List[str]] = {
+    "time": [
+        "Transaction Time(UTC+0)",
+        "Transaction Time (UTC+0)",
+        "Transaction Time",
+        "Time",
+        "Date(UTC)",
+        "Date (UTC)",
+    ],
+    "symbol": ["Market", "Symbol", "Pair", "Instrument"],
+    "side": ["Direction", "Side", "Action"],
+    "qty": ["Filled Quantity", "Qty", "Quantity", "Executed", "Amount", "Size"],
+    "price": ["Filled Price", "Price", "Avg Price", "Executed Price"],
+    "trade_id": ["Transaction ID", "Trasaction ID", "Trade ID", "Exec ID", "Fill ID", "ID", "id"],
+    "order_id": ["Order No.", "Order No", "Order ID", "OrderId", "Order id"],
+    "fee": ["Trading Fee", "Fee", "Commission", "ExecFeeV2", "Exec Fee", "ExecFee"],
+    "fee_asset": ["feeCoin", "Fee Coin", "Commission Asset", "Fee Unit", "Fee Asset"],
+}
+
+
+TEXT_ROLES = ["symbol", "side", "fee_asset", "fee_unit", "unit"]
+
+
+def _usecols(columns: Dict[str, List[str]]) -> List[str]:
+    return [c for cands in columns.values() for c in cands]
+
+
+def _text_cols(columns: Dict[str, List[str]]) -> List[str]:
+    return [c for role in TEXT_ROLES for c in columns.get(role, [])]
+
 
 def _prepare_okx_to_standard(df: pd.DataFrame) -> pd.DataFrame:
-    out = df.copy()
-    out.columns = [str(c).replace("﻿", "").strip() for c in out.columns]
+    out = df
 
-    col_time = _pick_col(out, ["Time", "Trade Time", "Fill Time", "Timestamp"], "Insert Time(Time)")
-    col_symbol = _pick_col(out, ["Symbol", "Instrument", "Inst", "Trading Pair", "Currency Pair"], "Symbol")
-    col_side = _pick_col(out, ["Action", "Side", "Direction"], "Side")
-    col_qty = _pick_col(out, ["Amount", "Quantity", "Size", "Filled Amount", "Qty"], "Quantity")
-    col_price = _pick_col(out, ["Filled Price", "Price", "Fill Price", "Avg Price"], "Price")
+    c = OKX_COLUMNS
+    col_time = _pick_col(out, c["time"], "Insert Time(Time)")
+    col_symbol = _pick_col(out, c["symbol"], "Symbol")
+    col_side = _pick_col(out, c["side"], "Side")
+    col_qty = _pick_col(out, c["qty"], "Quantity")
+    col_price = _pick_col(out, c["price"], "Price")
 
-    col_trade_id = _pick_col_optional(out, ["id", "Trade ID", "Fill ID", "trade id", "﻿id"])
-    col_order_id = _pick_col_optional(out, ["Order id", "Order ID", "order id"])
-    col_fee = _pick_col_optional(out, ["Fee", "Trading Fee", "Commission"])
-    col_fee_unit = _pick_col_optional(out, ["Fee Unit", "Commission Asset", "Fee Currency", "Fee Coin"])
-    col_unit = _pick_col_optional(out, ["Trading Unit", "Unit"])
+    col_trade_id = _pick_col_optional(out, c["trade_id"])
+    col_order_id = _pick_col_optional(out, c["order_id"])
+    col_fee = _pick_col_optional(out, c["fee"])
+    col_fee_unit = _pick_col_optional(out, c["fee_unit"])
+    col_unit = _pick_col_optional(out, c["unit"])
 
     std = pd.DataFrame()
     std["Insert Time"] = out[col_time]
@@ -46,16 +101,16 @@ def _prepare_okx_to_standard(df: pd.DataFrame) -> pd.DataFrame:
 
 
 def _prepare_binance_to_standard(df: pd.DataFrame) -> pd.DataFrame:
-    out = df.copy()
-    out.columns = [str(c).replace("﻿", "").strip() for c in out.columns]
+    out = df
 
-    col_time = _pick_col(out, ["Insert Time", "Time", "Date(UTC)", "Date (UTC)", "Trade Time"], "Insert Time")
-    col_symbol = _pick_col(out, ["Symbol", "Pair", "Market", "Instrument"], "Symbol")
-    col_side = _pick_col(out, ["Side", "Action", "Direction"], "Side")
-    col_price = _pick_col(out, ["Price", "Avg Price", "Filled Price"], "Price")
+    c = BINANCE_COLUMNS
+    col_time = _pick_col(out, c["time"], "Insert Time")
+    col_symbol = _pick_col(out, c["symbol"], "Symbol")
+    col_side = _pick_col(out, c["side"], "Side")
+    col_price = _pick_col(out, c["price"], "Price")
 
     col_qty = None
-    for cand in ["Quantity", "Qty", "Executed", "Amount"]:
+    for cand in c["qty"]:
         try:
             col_qty = _pick_col(out, [cand], "Quantity")
             break
@@ -64,10 +119,10 @@ def _prepare_binance_to_standard(df: pd.DataFrame) -> pd.DataFrame:
     if not col_qty:
         raise ValueError(f"Не найдена колонка количества (Quantity/Qty/Executed/Amount). Колонки: {list(out.columns)}")
 
-    col_trade_id = _pick_col_optional(out, ["Trade ID", "TradeId", "ID", "id"])
-    col_order_id = _pick_col_optional(out, ["Order ID", "OrderId", "Order id", "Order No.", "Order No"])
-    col_fee = _pick_col_optional(out, ["Fee", "Commission", "Trading Fee"])
-    col_fee_asset = _pick_col_optional(out, ["Commission Asset", "Fee Unit", "Fee Asset", "Commission Coin"])
+    col_trade_id = _pick_col_optional(out, c["trade_id"])
+    col_order_id = _pick_col_optional(out, c["order_id"])
+    col_fee = _pick_col_optional(out, c["fee"])
+    col_fee_asset = _pick_col_optional(out, c["fee_asset"])
 
     std = pd.DataFrame()
     std["Insert Time"] = out[col_time]
@@ -119,31 +174,20 @@ def _map_bybit_side(v: Any) -> str:
 
 
 def _prepare_bybit_to_standard(df: pd.DataFrame) -> pd.DataFrame:
-    out = df.copy()
-    out.columns = [str(c).replace("﻿", "").strip() for c in out.columns]
-
-    col_time = _pick_col(
-        out,
-        [
-            "Transaction Time(UTC+0)",
-            "Transaction Time (UTC+0)",
-            "Transaction Time",
-            "Time",
-            "Date(UTC)",
-            "Date (UTC)",
-        ],
-        "Insert Time",
-    )
-
-    col_symbol = _pick_col(out, ["Market", "Symbol", "Pair", "Instrument"], "Symbol")
-    col_side = _pick_col(out, ["Direction", "Side", "Action"], "Side")
-    col_qty = _pick_col(out, ["Filled Quantity", "Qty", "Quantity", "Executed", "Amount", "Size"], "Quantity")
-    col_price = _pick_col(out, ["Filled Price", "Price", "Avg Price", "Executed Price"], "Price")
-
-    col_trade_id = _pick_col_optional(out, ["Transaction ID", "Trasaction ID", "Trade ID", "Exec ID", "Fill ID", "ID", "id"])
-    col_order_id = _pick_col_optional(out, ["Order No.", "Order No", "Order ID", "OrderId", "Order id"])
-    col_fee = _pick_col_optional(out, ["Trading Fee", "Fee", "Commission", "ExecFeeV2", "Exec Fee", "ExecFee"])
-    col_fee_asset = _pick_col_optional(out, ["feeCoin", "Fee Coin", "Commission Asset", "Fee Unit", "Fee Asset"])
+    out = df
+
+    c = BYBIT_COLUMNS
+    col_time = _pick_col(out, c["time"], "Insert Time")
+
+    col_symbol = _pick_col(out, c["symbol"], "Symbol")
+    col_side = _pick_col(out, c["side"], "Side")
+    col_qty = _pick_col(out, c["qty"], "Quantity")
+    col_price = _pick_col(out, c["price"], "Price")
+
+    col_trade_id = _pick_col_optional(out, c["trade_id"])
+    col_order_id = _pick_col_optional(out, c["order_id"])
+    col_fee = _pick_col_optional(out, c["fee"])
+    col_fee_asset = _pick_col_optional(out, c["fee_asset"])
 
     std = pd.DataFrame()
     std["Insert Time"] = out[col_time]
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import os
+import pstats
+import resource
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .models import StageTimings
+
+PROFILE_DUMP_LINES = 80
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+@contextmanager
+def _rss_sampler(interval: float) -> Iterator[List[Tuple[float, int]]]:
+    samples: List[Tuple[float, int]] = [(time.perf_counter(), _rss_bytes())]
+    done = threading.Event()
+
+    def _sample() -> None:
+        while not done.is_set():
+            samples.append((time.perf_counter(), _rss_bytes()))
+            time.sleep(interval)
+
+    sampler = threading.Thread(target=_sample, daemon=True)
+    sampler.start()
+    try:
+        yield samples
+    finally:
+        done.set()
+        sampler.join()
+        samples.append((time.perf_counter(), _rss_bytes()))
+
+
+@contextmanager
+def _stage(timings: Optional[StageTimings], name: str) -> Iterator[None]:
+    if timings is None:
+        yield
+        return
+    cpu0 = time.process_time() if timings.profile else 0.0
+    rss0 = _rss_bytes() if timings.profile else 0
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        t1 = time.perf_counter()
+        timings.seconds[name] = timings.seconds.get(name, 0.0) + (t1 - t0)
+        timings.spans.append((name, t0, t1))
+        if timings.profile:
+            timings.cpu_seconds[name] = timings.cpu_seconds.get(name, 0.0) + (time.process_time() - cpu0)
+            delta = _rss_bytes() - rss0
+            timings.rss_delta[name] = max(timings.rss_delta.get(name, delta), delta)
+
+
+def _stage_rows(timings: Optional[StageTimings], name: str, rows: int) -> None:
+    if timings is not None:
+        timings.rows[name] = timings.rows.get(name, 0) + int(rows)
+
+
+def _stage_profile(timings: StageTimings) -> Dict[str, Dict[str, float]]:
+    if not timings.profile:
+        return {}
+    return {
+        name: {
+            "wall_seconds": round(seconds, 4),
+            "cpu_seconds": round(timings.cpu_seconds.get(name, 0.0), 4),
+            "rows": int(timings.rows.get(name, 0)),
+            "rss_delta_mb": round(timings.rss_delta.get(name, 0) / 2**20, 1),
+        }
+        for name, seconds in timings.seconds.items()
+    }
+
+
+@contextmanager
+def _cprofiled(path: Optional[Path]) -> Iterator[None]:
+    if path is None:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(path))
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(PROFILE_DUMP_LINES)
+        path.with_suffix(".txt").write_text(out.getvalue(), encoding="utf-8")
@@ -1,17 +1,184 @@
 from __future__ import annotations
 
+import csv
+import re
+from itertools import chain, islice
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
+from openpyxl import load_workbook
+from openpyxl.cell.cell import ERROR_CODES
+from pandas.errors import EmptyDataError
+from pandas.io.parsers import TextParser
 
+from .utils import _norm_col
 
-def _read_delimited_text(path: Path, delimiter: Optional[str]) -> pd.DataFrame:
+XLSX_SNIFF_ROWS = 25
+CSV_SNIFF_BYTES = 64 * 1024
+CSV_SNIFF_LINES = 50
+CSV_DELIMITERS = [";", ",", "\t", "|"]
+
+
+def _convert_xlsx_value(v: Any) -> Any:
+    if v is None:
+        return ""
+    if isinstance(v, bool):
+        return v
+    if isinstance(v, (int, float)):
+        iv = int(v)
+        return iv if iv == v else float(v)
+    if isinstance(v, str) and v in ERROR_CODES:
+        return np.nan
+    return v
+
+
+def _row_has_data(row: Sequence[Any]) -> bool:
+    return any(v is not None and v != "" for v in row)
+
+
+def _xlsx_frame(data: List[List[Any]], projected: bool) -> pd.DataFrame:
+    if not projected:
+        for r in data:
+            while r and r[-1] == "":
+                r.pop()
+        width = max(len(r) for r in data)
+        data = [r + [""] * (width - len(r)) for r in data]
+
+    try:
+        return TextParser(data, header=0, skip_blank_lines=False).read()
+    except EmptyDataError:
+        return pd.DataFrame()
+
+
+def _iter_xlsx_projected(
+    path: Path,
+    *,
+    usecols: Optional[Iterable[str]] = None,
+    header_row: int = 0,
+    header_detector: Optional[Callable[[List[Tuple[Any, ...]]], int]] = None,
+    sniff_rows: int = XLSX_SNIFF_ROWS,
+    chunk_rows: Optional[int] = None,
+) -> Iterator[Tuple[pd.DataFrame, List[Tuple[Any, ...]]]]:
+    wanted = {_norm_col(c) for c in usecols} if usecols is not None else None
+
+    wb = load_workbook(path, read_only=True, data_only=True, keep_links=False)
+    try:
+        ws = wb.worksheets[0]
+        ws.reset_dimensions()
+        rows = ws.iter_rows(values_only=True)
+
+        head = list(islice(rows, sniff_rows))
+        hdr = header_detector(head) if header_detector is not None else header_row
+        if hdr >= len(head):
+            head.extend(islice(rows, hdr - len(head) + 1))
+        if hdr >= len(head):
+            yield pd.DataFrame(), head
+            return
+
+        header = [_convert_xlsx_value(v) for v in head[hdr]]
+        if wanted is None:
+            positions = None
+        else:
+            positions = [i for i, h in enumerate(header) if h != "" and _norm_col(h) in wanted]
+
+        header = header if positions is None else [header[i] for i in positions]
+        header_last = 0 if _row_has_data(head[hdr]) else -1
+        data: List[List[Any]] = [list(header)]
+        last_with_data = header_last
+        start = 0
+        for row in chain(head[hdr + 1:], rows):
+            if positions is None:
+                data.append([_convert_xlsx_value(v) for v in row])
+            else:
+                n = len(row)
+                data.append([_convert_xlsx_value(row[i]) if i < n else "" for i in positions])
+            if _row_has_data(row):
+                last_with_data = len(data) - 1
+            if chunk_rows and last_with_data >= chunk_rows:
+                df = _xlsx_frame(data[: last_with_data + 1], positions is None)
+                df.index = pd.RangeIndex(start, start + len(df))
+                start += len(df)
+                yield df, head
+                data = [list(header)] + data[last_with_data + 1:]
+                last_with_data = header_last
+    finally:
+        wb.close()
+
+    data = data[: last_with_data + 1]
+    if start and len(data) <= 1:
+        return
+    df = _xlsx_frame(data, positions is None) if data else pd.DataFrame()
+    if start:
+        df.index = pd.RangeIndex(start, start + len(df))
+    yield df, head
+
+
+def _read_xlsx_projected(
+    path: Path,
+    *,
+    usecols: Optional[Iterable[str]] = None,
+    header_row: int = 0,
+    header_detector: Optional[Callable[[List[Tuple[Any, ...]]], int]] = None,
+    sniff_rows: int = XLSX_SNIFF_ROWS,
+) -> Tuple[pd.DataFrame, List[Tuple[Any, ...]]]:
+    return list(_iter_xlsx_projected(
+        path, usecols=usecols, header_row=header_row, header_detector=header_detector, sniff_rows=sniff_rows
+    ))[0]
+
+
+def _read_excel_file(path: Path, usecols: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    if path.suffix.lower() == ".xls":
+        return pd.read_excel(path)
+    df, _ = _read_xlsx_projected(path, usecols=usecols)
+    return df
+
+
+def _iter_excel_file(path: Path, usecols: Optional[Iterable[str]] = None, chunk_rows: Optional[int] = None) -> Iterator[pd.DataFrame]:
+    if path.suffix.lower() == ".xls":
+        yield pd.read_excel(path)
+        return
+    for df, _ in _iter_xlsx_projected(path, usecols=usecols, chunk_rows=chunk_rows):
+        yield df
+
+
+def _read_unity_xlsx(path: Path, usecols: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    return _read_excel_file(path, usecols)
+
+
+def _iter_unity_xlsx(path: Path, usecols: Optional[Iterable[str]] = None, chunk_rows: Optional[int] = None) -> Iterator[pd.DataFrame]:
+    return _iter_excel_file(path, usecols, chunk_rows)
+
+
+def _sniff_delimiter(path: Path, delimiter: Optional[str], sample_bytes: int = CSV_SNIFF_BYTES) -> Optional[Tuple[str, List[str]]]:
+    with open(path, "rb") as f:
+        sample = f.read(sample_bytes)
+    text = sample.decode("utf-8-sig", errors="replace")
+    lines = text.splitlines()
+    if len(sample) >= sample_bytes and lines:
+        lines = lines[:-1]
+    lines = [ln for ln in lines if ln.strip()]
+    if not lines:
+        return None
+
+    for sep in ([delimiter] if delimiter else []) + CSV_DELIMITERS:
+        try:
+            rows = list(csv.reader(lines[:CSV_SNIFF_LINES], delimiter=sep))
+        except csv.Error:
+            continue
+        header = rows[0]
+        if len(header) > 1 and all(len(r) <= len(header) for r in rows[1:]):
+            return sep, header
+    return None
+
+
+def _read_delimited_text_slow(path: Path, delimiter: Optional[str]) -> pd.DataFrame:
     if delimiter:
         df = pd.read_csv(path, sep=delimiter, engine="python")
         if df.shape[1] > 1:
             return df
-    for sep in [";", ",", "\t", "|"]:
+    for sep in CSV_DELIMITERS:
         try:
             df = pd.read_csv(path, sep=sep, engine="python")
             if df.shape[1] > 1:
@@ -21,35 +188,105 @@ def _read_delimited_text(path: Path, delimiter: Optional[str]) -> pd.DataFrame:
     return pd.read_csv(path, engine="python")
 
 
-def _read_binance_file(path: Path, delimiter: Optional[str]) -> pd.DataFrame:
+def _csv_read_kwargs(
+    header: List[str],
+    usecols: Optional[Iterable[str]],
+    text_cols: Optional[Iterable[str]],
+) -> Dict[str, Any]:
+    wanted = {_norm_col(c) for c in usecols} if usecols is not None else None
+    text = {_norm_col(c) for c in text_cols} if text_cols is not None else set()
+    dtype = {h: str for h in header if _norm_col(h) in text}
+    return {
+        "engine": "c",
+        "usecols": (lambda c: _norm_col(c) in wanted) if wanted is not None else None,
+        "dtype": dtype or None,
+        "low_memory": False,
+    }
+
+
+def _read_delimited_text(
+    path: Path,
+    delimiter: Optional[str],
+    usecols: Optional[Iterable[str]] = None,
+    text_cols: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
+    sniffed = _sniff_delimiter(path, delimiter)
+    if sniffed is None:
+        return _read_delimited_text_slow(path, delimiter)
+    sep, header = sniffed
+
+    try:
+        return pd.read_csv(path, sep=sep, **_csv_read_kwargs(header, usecols, text_cols))
+    except (pd.errors.ParserError, UnicodeDecodeError, ValueError):
+        return _read_delimited_text_slow(path, delimiter)
+
+
+def _iter_delimited_text(
+    path: Path,
+    delimiter: Optional[str],
+    usecols: Optional[Iterable[str]] = None,
+    text_cols: Optional[Iterable[str]] = None,
+    chunksize: int = 1_000_000,
+) -> Iterator[pd.DataFrame]:
+    sniffed = _sniff_delimiter(path, delimiter)
+    if sniffed is None:
+        yield _read_delimited_text_slow(path, delimiter)
+        return
+    sep, header = sniffed
+
+    with pd.read_csv(path, sep=sep, chunksize=chunksize, **_csv_read_kwargs(header, usecols, text_cols)) as reader:
+        yield from reader
+
+
+def _read_binance_file(
+    path: Path,
+    delimiter: Optional[str],
+    usecols: Optional[Iterable[str]] = None,
+    text_cols: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
     suf = path.suffix.lower()
     if suf in {".xlsx", ".xls"}:
-        df = pd.read_excel(path)
+        df = _read_excel_file(path, usecols)
         df.columns = [str(c).replace("﻿", "").strip() for c in df.columns]
         return df
-    return _read_delimited_text(path, delimiter)
+    return _read_delimited_text(path, delimiter, usecols, text_cols)
+
 
+def _iter_exchange_file(
+    path: Path,
+    delimiter: Optional[str],
+    usecols: Optional[Iterable[str]] = None,
+    text_cols: Optional[Iterable[str]] = None,
+    chunk_rows: int = 1_000_000,
+) -> Iterator[pd.DataFrame]:
+    if path.suffix.lower() in {".xlsx", ".xls"}:
+        for df in _iter_excel_file(path, usecols, chunk_rows):
+            df.columns = [str(c).replace("﻿", "").strip() for c in df.columns]
+            yield df
+        return
+    yield from _iter_delimited_text(path, delimiter, usecols, text_cols, chunk_rows)
 
-def _read_bybit_file(path: Path, delimiter: Optional[str] = None) -> pd.DataFrame:
+
+def _read_bybit_file(
+    path: Path,
+    delimiter: Optional[str] = None,
+    usecols: Optional[Iterable[str]] = None,
+    text_cols: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
     suf = path.suffix.lower()
     if suf in {".xlsx", ".xls"}:
-        df = pd.read_excel(path)
+        df = _read_excel_file(path, usecols)
         df.columns = [str(c).replace("﻿", "").strip() for c in df.columns]
         return df
-    return _read_delimited_text(path, delimiter)
-
+    return _read_delimited_text(path, delimiter, usecols, text_cols)
 
-def _detect_okx_header_row(path: Path, max_rows: int = 25) -> int:
-    try:
-        raw = pd.read_excel(path, header=None, nrows=max_rows)
-    except Exception:
-        return 1
 
+def _detect_okx_header_row(head: List[Tuple[Any, ...]], max_rows: int = XLSX_SNIFF_ROWS) -> int:
     def row_text(vals):
         return " | ".join([str(v) for v in vals if v is not None]).lower()
 
-    for i in range(min(max_rows, len(raw))):
-        s = row_text(raw.iloc[i].tolist())
+    for i in range(min(max_rows, len(head))):
+        s = row_text(head[i])
         has_time = "time" in s
         has_symbol = ("symbol" in s) or ("instrument" in s) or ("inst" in s)
         has_action = ("action" in s) or ("side" in s) or ("direction" in s)
@@ -59,24 +296,38 @@ def _detect_okx_header_row(path: Path, max_rows: int = 25) -> int:
     return 1
 
 
-def _read_okx_xlsx(path: Path) -> Tuple[pd.DataFrame, Optional[int]]:
-    tz_offset = None
-    try:
-        head = pd.read_excel(path, header=None, nrows=5)
-        for v in head.values.flatten().tolist():
+def _detect_okx_tz_offset(head: List[Tuple[Any, ...]], max_rows: int = 5) -> Optional[int]:
+    for row in head[:max_rows]:
+        for v in row:
             if v is None:
                 continue
-            import re
-            txt = str(v)
-            m = re.search(r"UTC\s*([+-])\s*(\d{1,2})", txt, flags=re.IGNORECASE)
+            m = re.search(r"UTC\s*([+-])\s*(\d{1,2})", str(v), flags=re.IGNORECASE)
             if m:
                 sign = 1 if m.group(1) == "+" else -1
-                tz_offset = sign * int(m.group(2))
-                break
-    except Exception:
-        tz_offset = None
+                return sign * int(m.group(2))
+    return None
+
+
+def _read_okx_xlsx(path: Path, usecols: Optional[Iterable[str]] = None) -> Tuple[pd.DataFrame, Optional[int]]:
+    if path.suffix.lower() == ".xls":
+        head_df = pd.read_excel(path, header=None, nrows=XLSX_SNIFF_ROWS)
+        head = [tuple(None if pd.isna(v) else v for v in r) for r in head_df.itertuples(index=False)]
+        df = pd.read_excel(path, header=_detect_okx_header_row(head))
+        tz_offset = _detect_okx_tz_offset(head)
+    else:
+        df, head = _read_xlsx_projected(path, usecols=usecols, header_detector=_detect_okx_header_row)
+        tz_offset = _detect_okx_tz_offset(head)
 
-    header_row = _detect_okx_header_row(path)
-    df = pd.read_excel(path, header=header_row)
     df.columns = [str(c).replace("﻿", "").strip() for c in df.columns]
     return df, tz_offset
+
+
+def _iter_okx_xlsx(
+    path: Path, usecols: Optional[Iterable[str]] = None, chunk_rows: Optional[int] = None
+) -> Iterator[Tuple[pd.DataFrame, Optional[int]]]:
+    if path.suffix.lower() == ".xls":
+        yield _read_okx_xlsx(path, usecols)
+        return
+    for df, head in _iter_xlsx_projected(path, usecols=usecols, header_detector=_detect_okx_header_row, chunk_rows=chunk_rows):
+        df.columns = [str(c).replace("﻿", "").strip() for c in df.columns]
+        yield df, _detect_okx_tz_offset(head)
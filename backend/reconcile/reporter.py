@@ -1,18 +1,27 @@
 from __future__ import annotations
 
 import hashlib
+import io
+import json
 import re
-from typing import Any, Dict, List, Optional, Set
+import warnings
+import zipfile
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 import numpy as np
 import pandas as pd
-from openpyxl import load_workbook
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import Workbook
+from openpyxl.cell import Cell
 from openpyxl.formatting.rule import FormulaRule
-from openpyxl.styles import Alignment, Font, PatternFill
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.styles.cell_style import StyleArray
 from openpyxl.utils import get_column_letter
 from openpyxl.worksheet.table import Table, TableStyleInfo
 
-from .models import ReconcileParams, ReconcileSummary
+from .models import ReconcileParams, ReconcileSummary, StageTimings
+from .profiling import _stage, _stage_rows
 
 SHEET_SUMMARY = "Сводка"
 SHEET_MATCHES = "Совпадения"
@@ -21,6 +30,15 @@ SHEET_EXTRA = "Лишнее в Unity"
 SHEET_UNITY_STATUS = "Статус Unity"
 SHEET_VOL_SYMBOL = "Объем Инстр"
 SHEET_VOL_SYMBOL_SIDE = "Объем Инстр+Side"
+SHEET_UNITY_UNASSIGNED = "Unity без биржи"
+BATCH_VENUE_COLUMN = "Биржа"
+
+REPORT_ARCHIVE_FORMATS = {"csv_zip": "csv", "parquet": "parquet"}
+EXCEL_WRITE_BLOCK_ROWS = 50_000
+HEADER_FILL = PatternFill("solid", fgColor="F2F2F2")
+HEADER_FONT = Font(bold=False)
+HEADER_ALIGN = Alignment(horizontal="center", vertical="center", wrap_text=True)
+HEADER_BORDER = Border(left=Side(style="thin"), right=Side(style="thin"), top=Side(style="thin"), bottom=Side(style="thin"))
 
 
 def _cols(df: pd.DataFrame, ordered: List[str]) -> List[str]:
@@ -68,6 +86,107 @@ def _make_table_name(ws_title: str, idx: int) -> str:
     return name[:255]
 
 
+def _volume_pretty(v: Optional[pd.DataFrame], exchange_name: str) -> Optional[pd.DataFrame]:
+    if v is None:
+        return None
+    vv = v.copy()
+    vv = _safe_rename(vv, {
+        "symbol": "Символ",
+        "side": "Сторона",
+        "trades_exchange": f"Сделок_{exchange_name}",
+        "trades_unity": "Сделок_Unity",
+        "qty_sum_exchange": f"Qty_{exchange_name}",
+        "qty_sum_unity": "Qty_Unity",
+        "qty_diff": "ΔQty",
+        "notional_sum_exchange": f"Объем_{exchange_name}",
+        "notional_sum_unity": "Объем_Unity",
+        "notional_diff": "ΔОбъем",
+        "first_time_exchange": f"Время_первое_{exchange_name}",
+        "last_time_exchange": f"Время_последнее_{exchange_name}",
+        "first_time_unity": "Время_первое_Unity",
+        "last_time_unity": "Время_последнее_Unity",
+        "status": "Статус",
+    })
+    if "ΔОбъем" in vv.columns:
+        vv["_absV"] = pd.to_numeric(vv["ΔОбъем"], errors="coerce").abs()
+        vv = vv.sort_values(["_absV"], ascending=False).drop(columns=["_absV"])
+
+    front_cols = _cols(vv, [
+        "Статус", "Символ", "Сторона",
+        f"Qty_{exchange_name}", "Qty_Unity", "ΔQty",
+        f"Объем_{exchange_name}", "Объем_Unity", "ΔОбъем",
+        f"Сделок_{exchange_name}", "Сделок_Unity",
+    ])
+    rest2 = [c for c in vv.columns if c not in front_cols]
+    return vv[front_cols + rest2].copy()
+
+
+def _label_positions(index: pd.Index, labels: pd.Series) -> np.ndarray:
+    keys = pd.to_numeric(labels, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    valid = np.isfinite(keys)
+    ikeys = np.where(valid, keys, -1).astype(np.int64)
+    if isinstance(index, pd.RangeIndex) and index.step == 1:
+        pos = ikeys - index.start
+        pos[(pos < 0) | (pos >= len(index))] = -1
+    else:
+        pos = index.get_indexer(ikeys)
+    pos[~valid] = -1
+    return pos
+
+
+def _take_rows(df: pd.DataFrame, pos: np.ndarray) -> pd.DataFrame:
+    if (pos >= 0).all():
+        out = df.take(pos)
+    else:
+        out = df.set_axis(pd.RangeIndex(len(df))).reindex(pos)
+    return out.set_axis(pd.RangeIndex(len(pos)))
+
+
+def _lookup_str(df: pd.DataFrame, col: str, pos: np.ndarray) -> np.ndarray:
+    if col not in df.columns:
+        return np.full(len(pos), "", dtype=object)
+    table = np.append(df[col].astype(str).to_numpy(dtype=object), "")
+    return table[pos]
+
+
+def _renamed_view(df: pd.DataFrame, mapping: Dict[str, str], ordered: List[str]) -> pd.DataFrame:
+    names = [mapping.get(c, c) for c in df.columns]
+    first: Dict[str, int] = {}
+    for i, n in enumerate(names):
+        first.setdefault(n, i)
+    found = [c for c in ordered if c in first]
+    out = df.take([first[c] for c in found], axis=1)
+    out.columns = found
+    return out
+
+
+def _sorted_pretty(df: pd.DataFrame, mapping: Dict[str, str], ordered: List[str]) -> pd.DataFrame:
+    out = _renamed_view(df, mapping, ordered)
+    if not len(out.columns):
+        out = _safe_rename(df, mapping)
+    if "Символ" in out.columns and "Время" in out.columns:
+        out = out.sort_values(["Символ", "Время"], ascending=[True, True])
+    return out
+
+
+def _unity_rows_pretty(df: pd.DataFrame) -> pd.DataFrame:
+    return _sorted_pretty(
+        df,
+        {
+            "ID": "ID",
+            "Transact time": "Время",
+            "Instrument": "Instrument",
+            "symbol": "Символ",
+            "side": "Сторона",
+            "qty": "Qty",
+            "price": "Цена",
+            "notional": "Объем",
+            "Net commission amount": "Комиссия",
+        },
+        ["ID", "Время", "Instrument", "Символ", "Сторона", "Qty", "Цена", "Объем", "Комиссия"],
+    )
+
+
 def _build_pretty_tables(
     matched_all: pd.DataFrame,
     exchange_n: pd.DataFrame,
@@ -86,29 +205,7 @@ def _build_pretty_tables(
     prefix = "B" if exn == "binance" else ("O" if exn == "okx" else ("Y" if exn == "bybit" else "X"))
     p = f"{prefix}_"
 
-    ex_sel = exchange_n.reset_index().rename(columns={"index": "exchange_idx"})
-    u_sel = unity_n.reset_index().rename(columns={"index": "unity_idx"})
-
-    ex_keep = _cols(ex_sel, [
-        "exchange_idx",
-        "Trade ID", "Order ID", "Insert Time",
-        "trade_dt_utc",
-        "symbol", "side", "qty", "price", "notional",
-        "Fee", "Commission Asset",
-    ])
-    u_keep = _cols(u_sel, [
-        "unity_idx",
-        "ID", "Transact time",
-        "trade_dt_utc",
-        "Instrument",
-        "symbol", "side", "qty", "price", "notional",
-        "Net commission amount",
-    ])
-
-    ex_view = ex_sel[ex_keep].copy()
-    u_view = u_sel[u_keep].copy()
-
-    ex_view = _safe_rename(ex_view, {
+    ex_rename = {
         "Trade ID": f"{p}TradeID",
         "Order ID": f"{p}OrderID",
         "Insert Time": f"{p}Время",
@@ -120,9 +217,8 @@ def _build_pretty_tables(
         "notional": f"{p}Объем",
         "Fee": f"{p}Fee",
         "Commission Asset": f"{p}Комиссия_Asset",
-    })
-
-    u_view = _safe_rename(u_view, {
+    }
+    u_rename = {
         "ID": "U_ID",
         "Transact time": "U_Время",
         "trade_dt_utc": "U_UTC",
@@ -133,15 +229,26 @@ def _build_pretty_tables(
         "price": "U_Цена",
         "notional": "U_Объем",
         "Net commission amount": "U_Комиссия",
-    })
+    }
+    ex_keep = _cols(exchange_n, list(ex_rename))
+    u_keep = _cols(unity_n, list(u_rename))
 
-    m = matched_all.copy()
+    m = matched_all.reset_index(drop=True)
     if "score" not in m.columns:
         m["score"] = np.nan
     if "key_used" not in m.columns:
         m["key_used"] = ""
 
-    m = m.merge(ex_view, on="exchange_idx", how="left").merge(u_view, on="unity_idx", how="left")
+    ex_pos = _label_positions(exchange_n.index, m["exchange_idx"])
+    u_pos = _label_positions(unity_n.index, m["unity_idx"])
+    m = pd.concat(
+        [
+            m,
+            _take_rows(exchange_n[ex_keep], ex_pos).rename(columns=ex_rename),
+            _take_rows(unity_n[u_keep], u_pos).rename(columns=u_rename),
+        ],
+        axis=1,
+    )
 
     ex_utc = f"{p}UTC"
     ex_qty = f"{p}Qty"
@@ -168,149 +275,83 @@ def _build_pretty_tables(
         "score": "Score",
     })
 
-    if "ΔОбъем" in m.columns:
-        m["_abs_diff"] = pd.to_numeric(m["ΔОбъем"], errors="coerce").abs()
-        m = m.sort_values(["_abs_diff"], ascending=False).drop(columns=["_abs_diff"])
-
     full_front = [c for c in [
         "Тип_совпадения", "Score", "Δt_sec", "ΔQty", "ΔЦена", "ΔОбъем",
         f"{p}TradeID", f"{p}OrderID",
         f"{p}Время", f"{p}UTC", f"{p}Символ", f"{p}Сторона", f"{p}Qty", f"{p}Цена", f"{p}Объем",
         "U_ID", "U_Время", "U_UTC", "U_Instrument", "U_Символ", "U_Сторона", "U_Qty", "U_Цена", "U_Объем",
     ] if c in m.columns]
-    rest = [c for c in m.columns if c not in full_front]
-    m_pretty = m[full_front + rest].copy()
-
     if params.export_mode == "compact":
-        m_pretty = m_pretty[full_front].copy()
-
-    miss = missing_in_unity.copy()
-    miss = _safe_rename(miss, {
-        "Trade ID": "TradeID",
-        "Order ID": "OrderID",
-        "Insert Time": "Время",
-        "symbol": "Символ",
-        "side": "Сторона",
-        "qty": "Qty",
-        "price": "Цена",
-        "notional": "Объем",
-        "Fee": "Fee",
-        "Commission Asset": "Комиссия_Asset",
-    })
-    miss_cols = _cols(miss, ["TradeID", "OrderID", "Время", "Символ", "Сторона", "Qty", "Цена", "Объем", "Fee", "Комиссия_Asset"])
-    miss_pretty = miss[miss_cols].copy() if miss_cols else miss
-    if "Символ" in miss_pretty.columns and "Время" in miss_pretty.columns:
-        miss_pretty = miss_pretty.sort_values(["Символ", "Время"], ascending=[True, True])
-
-    extra = extra_in_unity.copy()
-    extra = _safe_rename(extra, {
-        "ID": "ID",
-        "Transact time": "Время",
-        "Instrument": "Instrument",
-        "symbol": "Символ",
-        "side": "Сторона",
-        "qty": "Qty",
-        "price": "Цена",
-        "notional": "Объем",
-        "Net commission amount": "Комиссия",
-    })
-    extra_cols = _cols(extra, ["ID", "Время", "Instrument", "Символ", "Сторона", "Qty", "Цена", "Объем", "Комиссия"])
-    extra_pretty = extra[extra_cols].copy() if extra_cols else extra
-    if "Символ" in extra_pretty.columns and "Время" in extra_pretty.columns:
-        extra_pretty = extra_pretty.sort_values(["Символ", "Время"], ascending=[True, True])
-
-    exs = ex_status.copy()
-    uns = uni_status.copy()
-
-    u_id_map: Dict[int, Any] = unity_n["ID"].to_dict() if "ID" in unity_n.columns else {}
-    if "matched_unity_idx" in exs.columns:
-        def _map_uid(x: Any) -> str:
-            try:
-                if pd.isna(x):
-                    return ""
-                return str(u_id_map.get(int(x), ""))
-            except Exception:
-                return ""
-        exs["matched_unity_id"] = exs["matched_unity_idx"].map(_map_uid)
+        pretty_cols = full_front
     else:
-        exs["matched_unity_id"] = ""
+        pretty_cols = full_front + [c for c in m.columns if c not in full_front]
 
-    exs = _safe_rename(exs, {
-        "status": "Статус",
-        "Trade ID": "TradeID",
-        "Order ID": "OrderID",
-        "Insert Time": "Время",
-        "symbol": "Символ",
-        "side": "Сторона",
-        "qty": "Qty",
-        "price": "Цена",
-        "notional": "Объем",
-        "matched_unity_id": "Связанный_Unity_ID",
-    })
-    exs_cols = _cols(exs, ["Статус", "TradeID", "OrderID", "Время", "Символ", "Сторона", "Qty", "Цена", "Объем", "Связанный_Unity_ID"])
-    exs_pretty = exs[exs_cols].copy() if exs_cols else exs
-
-    ex_tid_map: Dict[int, Any] = exchange_n["Trade ID"].to_dict() if "Trade ID" in exchange_n.columns else {}
-    if "matched_exchange_idx" in uns.columns:
-        def _map_etid(x: Any) -> str:
-            try:
-                if pd.isna(x):
-                    return ""
-                return str(ex_tid_map.get(int(x), ""))
-            except Exception:
-                return ""
-        uns["matched_trade_id"] = uns["matched_exchange_idx"].map(_map_etid)
+    if "ΔОбъем" in m.columns:
+        order = pd.to_numeric(m["ΔОбъем"], errors="coerce").abs().sort_values(ascending=False).index
+        m_pretty = m[pretty_cols].take(order.to_numpy())
     else:
-        uns["matched_trade_id"] = ""
+        m_pretty = m[pretty_cols]
 
-    uns = _safe_rename(uns, {
-        "status": "Статус",
-        "ID": "ID",
-        "Transact time": "Время",
-        "Instrument": "Instrument",
-        "symbol": "Символ",
-        "side": "Сторона",
-        "qty": "Qty",
-        "price": "Цена",
-        "notional": "Объем",
-        "matched_trade_id": f"Связанный_{exchange_name}_TradeID",
-    })
-    uns_cols = _cols(uns, ["Статус", "ID", "Время", "Instrument", "Символ", "Сторона", "Qty", "Цена", "Объем", f"Связанный_{exchange_name}_TradeID"])
-    uns_pretty = uns[uns_cols].copy() if uns_cols else uns
-
-    def _vol_pretty(v: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
-        if v is None:
-            return None
-        vv = v.copy()
-        vv = _safe_rename(vv, {
+    miss_pretty = _sorted_pretty(
+        missing_in_unity,
+        {
+            "Trade ID": "TradeID",
+            "Order ID": "OrderID",
+            "Insert Time": "Время",
             "symbol": "Символ",
             "side": "Сторона",
-            "trades_exchange": f"Сделок_{exchange_name}",
-            "trades_unity": "Сделок_Unity",
-            "qty_sum_exchange": f"Qty_{exchange_name}",
-            "qty_sum_unity": "Qty_Unity",
-            "qty_diff": "ΔQty",
-            "notional_sum_exchange": f"Объем_{exchange_name}",
-            "notional_sum_unity": "Объем_Unity",
-            "notional_diff": "ΔОбъем",
-            "first_time_exchange": f"Время_первое_{exchange_name}",
-            "last_time_exchange": f"Время_последнее_{exchange_name}",
-            "first_time_unity": "Время_первое_Unity",
-            "last_time_unity": "Время_последнее_Unity",
+            "qty": "Qty",
+            "price": "Цена",
+            "notional": "Объем",
+            "Fee": "Fee",
+            "Commission Asset": "Комиссия_Asset",
+        },
+        ["TradeID", "OrderID", "Время", "Символ", "Сторона", "Qty", "Цена", "Объем", "Fee", "Комиссия_Asset"],
+    )
+
+    extra_pretty = _unity_rows_pretty(extra_in_unity)
+
+    exs_pretty = _renamed_view(
+        ex_status,
+        {
             "status": "Статус",
-        })
-        if "ΔОбъем" in vv.columns:
-            vv["_absV"] = pd.to_numeric(vv["ΔОбъем"], errors="coerce").abs()
-            vv = vv.sort_values(["_absV"], ascending=False).drop(columns=["_absV"])
-
-        front_cols = _cols(vv, [
-            "Статус", "Символ", "Сторона",
-            f"Qty_{exchange_name}", "Qty_Unity", "ΔQty",
-            f"Объем_{exchange_name}", "Объем_Unity", "ΔОбъем",
-            f"Сделок_{exchange_name}", "Сделок_Unity",
-        ])
-        rest2 = [c for c in vv.columns if c not in front_cols]
-        return vv[front_cols + rest2].copy()
+            "Trade ID": "TradeID",
+            "Order ID": "OrderID",
+            "Insert Time": "Время",
+            "symbol": "Символ",
+            "side": "Сторона",
+            "qty": "Qty",
+            "price": "Цена",
+            "notional": "Объем",
+        },
+        ["Статус", "TradeID", "OrderID", "Время", "Символ", "Сторона", "Qty", "Цена", "Объем"],
+    )
+    if "matched_unity_idx" in ex_status.columns:
+        u_ids = _lookup_str(unity_n, "ID", _label_positions(unity_n.index, ex_status["matched_unity_idx"]))
+    else:
+        u_ids = ""
+    exs_pretty["Связанный_Unity_ID"] = u_ids
+
+    uns_pretty = _renamed_view(
+        uni_status,
+        {
+            "status": "Статус",
+            "ID": "ID",
+            "Transact time": "Время",
+            "Instrument": "Instrument",
+            "symbol": "Символ",
+            "side": "Сторона",
+            "qty": "Qty",
+            "price": "Цена",
+            "notional": "Объем",
+        },
+        ["Статус", "ID", "Время", "Instrument", "Символ", "Сторона", "Qty", "Цена", "Объем"],
+    )
+    if "matched_exchange_idx" in uni_status.columns:
+        ex_tids = _lookup_str(exchange_n, "Trade ID", _label_positions(exchange_n.index, uni_status["matched_exchange_idx"]))
+    else:
+        ex_tids = ""
+    uns_pretty[f"Связанный_{exchange_name}_TradeID"] = ex_tids
 
     return {
         "matched": m_pretty,
@@ -318,30 +359,12 @@ def _build_pretty_tables(
         "extra": extra_pretty,
         "ex_status": exs_pretty,
         "uni_status": uns_pretty,
-        "vol_sym": _vol_pretty(volume_by_symbol),
-        "vol_ss": _vol_pretty(volume_by_symbol_side),
+        "vol_sym": _volume_pretty(volume_by_symbol, exchange_name),
+        "vol_ss": _volume_pretty(volume_by_symbol_side, exchange_name),
     }
 
 
-def _export_report_xlsx(
-    report_path,
-    summary: ReconcileSummary,
-    params: ReconcileParams,
-    exchange_name: str,
-    matched_pretty: pd.DataFrame,
-    missing_pretty: pd.DataFrame,
-    extra_pretty: pd.DataFrame,
-    ex_status_pretty: pd.DataFrame,
-    unity_status_pretty: pd.DataFrame,
-    volume_by_symbol_pretty: Optional[pd.DataFrame],
-    volume_by_symbol_side_pretty: Optional[pd.DataFrame],
-    top_diffs_strict: Optional[pd.DataFrame] = None,
-    top_diffs_notional: Optional[pd.DataFrame] = None,
-    raw_exchange: Optional[pd.DataFrame] = None,
-    raw_unity: Optional[pd.DataFrame] = None,
-) -> None:
-    report_path.parent.mkdir(parents=True, exist_ok=True)
-
+def _summary_frame(summary: ReconcileSummary, exchange_name: str) -> pd.DataFrame:
     summary_df = pd.DataFrame(
         {
             "Показатель": [
@@ -391,40 +414,294 @@ def _export_report_xlsx(
         }
     )
 
-    sheet_exchange_status = f"Статус {exchange_name}"[:31]
+    if summary.fuzzy_strategy == "optimal":
+        fuzzy_rows = pd.DataFrame({
+            "Показатель": [
+                "FUZZY: компонент",
+                "FUZZY: макс. размер компоненты",
+                "FUZZY: средний размер компоненты",
+                "FUZZY: компонент сверх лимита (greedy)",
+            ],
+            "Значение": [
+                summary.fuzzy_components,
+                summary.fuzzy_component_max_size,
+                round(summary.fuzzy_component_mean_size, 2),
+                summary.fuzzy_components_over_limit,
+            ],
+        })
+        summary_df = pd.concat([summary_df, fuzzy_rows], ignore_index=True)
+
+    return summary_df
+
+
+def _report_suffix(params: ReconcileParams) -> str:
+    return ".zip" if params.export_mode in REPORT_ARCHIVE_FORMATS else ".xlsx"
+
+
+def _export_report(
+    report_path,
+    summary: ReconcileSummary,
+    params: ReconcileParams,
+    exchange_name: str,
+    matched_pretty: pd.DataFrame,
+    missing_pretty: pd.DataFrame,
+    extra_pretty: pd.DataFrame,
+    ex_status_pretty: pd.DataFrame,
+    unity_status_pretty: pd.DataFrame,
+    volume_by_symbol_pretty: Optional[pd.DataFrame],
+    volume_by_symbol_side_pretty: Optional[pd.DataFrame],
+    top_diffs_strict: Optional[pd.DataFrame] = None,
+    top_diffs_notional: Optional[pd.DataFrame] = None,
+    raw_exchange: Optional[pd.DataFrame] = None,
+    raw_unity: Optional[pd.DataFrame] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    timings: Optional[StageTimings] = None,
+) -> None:
+    sheets: List[Tuple[str, str, Optional[pd.DataFrame]]] = [
+        ("summary", SHEET_SUMMARY, _summary_frame(summary, exchange_name)),
+        ("matches", SHEET_MATCHES, matched_pretty),
+        ("missing", SHEET_MISSING, missing_pretty),
+        ("extra", SHEET_EXTRA, extra_pretty),
+        ("exchange_status", f"Статус {exchange_name}"[:31], ex_status_pretty),
+        ("unity_status", SHEET_UNITY_STATUS, unity_status_pretty),
+        ("volume_symbol", SHEET_VOL_SYMBOL, volume_by_symbol_pretty),
+        ("volume_symbol_side", SHEET_VOL_SYMBOL_SIDE, volume_by_symbol_side_pretty),
+    ]
+    if params.export_debug_sheets:
+        sheets += [
+            ("top_diffs_strict", "TopDiffs STRICT"[:31], top_diffs_strict),
+            ("top_diffs_notional", "TopDiffs Notional"[:31], top_diffs_notional),
+            ("raw_exchange", f"RAW {exchange_name}"[:31], raw_exchange),
+            ("raw_unity", "RAW Unity"[:31], raw_unity),
+        ]
+    _write_sheets(report_path, summary.__dict__, sheets, params, progress, timings)
+
+
+def _venue_frame(df: Optional[pd.DataFrame], exchange_name: str) -> Optional[pd.DataFrame]:
+    if df is None:
+        return None
+    out = df.rename(columns=lambda c: c.replace(exchange_name, BATCH_VENUE_COLUMN) if isinstance(c, str) else c)
+    out.insert(0, BATCH_VENUE_COLUMN, exchange_name)
+    return out
+
+
+def _batch_summary_frame(summaries: Dict[str, ReconcileSummary], rows_unity: int, rows_unassigned: int) -> pd.DataFrame:
+    frames = [_summary_frame(s, BATCH_VENUE_COLUMN).set_index("Показатель")["Значение"].rename(name) for name, s in summaries.items()]
+    out = pd.concat(frames, axis=1).reset_index()
+    totals = pd.DataFrame({"Показатель": ["Строк Unity (весь файл)", "Строк Unity без биржи"]})
+    for name in summaries:
+        totals[name] = [rows_unity, rows_unassigned]
+    return pd.concat([out, totals], ignore_index=True)
+
+
+def _export_batch_report(
+    report_path,
+    summaries: Dict[str, ReconcileSummary],
+    tables: Dict[str, Dict[str, Optional[pd.DataFrame]]],
+    unassigned_unity: pd.DataFrame,
+    rows_unity: int,
+    params: ReconcileParams,
+    progress: Optional[Callable[[int, int], None]] = None,
+    timings: Optional[StageTimings] = None,
+) -> None:
+    def _combined(key: str) -> Optional[pd.DataFrame]:
+        frames = [_venue_frame(t.get(key), name) for name, t in tables.items() if t.get(key) is not None]
+        return pd.concat(frames, ignore_index=True) if frames else None
+
+    sheets: List[Tuple[str, str, Optional[pd.DataFrame]]] = [
+        ("summary", SHEET_SUMMARY, _batch_summary_frame(summaries, rows_unity, len(unassigned_unity))),
+        ("missing", SHEET_MISSING, _combined("missing")),
+        ("extra", SHEET_EXTRA, _combined("extra")),
+        ("volume_symbol", SHEET_VOL_SYMBOL, _combined("vol_sym")),
+        ("volume_symbol_side", SHEET_VOL_SYMBOL_SIDE, _combined("vol_ss")),
+        ("unity_unassigned", SHEET_UNITY_UNASSIGNED, _unity_rows_pretty(unassigned_unity)),
+    ]
+    payload = {
+        "exchanges": {name: s.__dict__ for name, s in summaries.items()},
+        "rows_unity": rows_unity,
+        "rows_unity_unassigned": int(len(unassigned_unity)),
+    }
+    _write_sheets(report_path, payload, sheets, params, progress, timings)
+
 
-    with pd.ExcelWriter(report_path, engine="openpyxl") as writer:
-        _clean_df_for_excel(summary_df).to_excel(writer, sheet_name=SHEET_SUMMARY, index=False)
-        _clean_df_for_excel(matched_pretty).to_excel(writer, sheet_name=SHEET_MATCHES, index=False)
-        _clean_df_for_excel(missing_pretty).to_excel(writer, sheet_name=SHEET_MISSING, index=False)
-        _clean_df_for_excel(extra_pretty).to_excel(writer, sheet_name=SHEET_EXTRA, index=False)
-        _clean_df_for_excel(ex_status_pretty).to_excel(writer, sheet_name=sheet_exchange_status, index=False)
-        _clean_df_for_excel(unity_status_pretty).to_excel(writer, sheet_name=SHEET_UNITY_STATUS, index=False)
+def _write_sheets(
+    report_path,
+    summary_payload: Dict[str, Any],
+    sheets: List[Tuple[str, str, Optional[pd.DataFrame]]],
+    params: ReconcileParams,
+    progress: Optional[Callable[[int, int], None]] = None,
+    timings: Optional[StageTimings] = None,
+) -> None:
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    total = sum(len(df) for _, _, df in sheets if df is not None)
+    written = 0
+
+    def _advance(rows: int) -> None:
+        nonlocal written
+        written += rows
+        if progress is not None:
+            progress(written, total)
+
+    fmt = REPORT_ARCHIVE_FORMATS.get(params.export_mode)
+    if fmt is None:
+        _stage_rows(timings, "xlsx_write", total)
+        _write_report_xlsx(report_path, sheets, params, _advance, timings)
+    else:
+        _stage_rows(timings, "archive_write", total)
+        with _stage(timings, "archive_write"):
+            _write_report_archive(report_path, summary_payload, sheets, fmt, _advance)
 
-        if volume_by_symbol_pretty is not None:
-            _clean_df_for_excel(volume_by_symbol_pretty).to_excel(writer, sheet_name=SHEET_VOL_SYMBOL, index=False)
-        if volume_by_symbol_side_pretty is not None:
-            _clean_df_for_excel(volume_by_symbol_side_pretty).to_excel(writer, sheet_name=SHEET_VOL_SYMBOL_SIDE, index=False)
 
-        if params.export_debug_sheets:
-            if top_diffs_strict is not None:
-                _clean_df_for_excel(top_diffs_strict).to_excel(writer, sheet_name="TopDiffs STRICT"[:31], index=False)
-            if top_diffs_notional is not None:
-                _clean_df_for_excel(top_diffs_notional).to_excel(writer, sheet_name="TopDiffs Notional"[:31], index=False)
-            if raw_exchange is not None:
-                _clean_df_for_excel(raw_exchange).to_excel(writer, sheet_name=f"RAW {exchange_name}"[:31], index=False)
-            if raw_unity is not None:
-                _clean_df_for_excel(raw_unity).to_excel(writer, sheet_name="RAW Unity"[:31], index=False)
+def _write_report_xlsx(
+    report_path,
+    sheets: List[Tuple[str, str, Optional[pd.DataFrame]]],
+    params: ReconcileParams,
+    advance: Callable[[int], None],
+    timings: Optional[StageTimings] = None,
+) -> None:
+    wb = Workbook(write_only=True)
+    used_table_names: Set[str] = set()
+    for _, title, df in sheets:
+        if df is not None:
+            with _stage(timings, "xlsx_write"):
+                df = _clean_df_for_excel(df)
+            _write_sheet(wb, title, df, params, used_table_names, len(wb.worksheets) + 1, advance, timings)
+    with _stage(timings, "xlsx_write"):
+        wb.save(report_path)
+
+
+def _to_arrow(df: pd.DataFrame, preserve_index: bool) -> pa.Table:
+    try:
+        return pa.Table.from_pandas(df, preserve_index=preserve_index)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        fixed = df.copy()
+        for c in fixed.columns:
+            if fixed[c].dtype == object:
+                fixed[c] = fixed[c].where(fixed[c].isna(), fixed[c].astype(str))
+        return pa.Table.from_pandas(fixed, preserve_index=preserve_index)
+
+
+def _write_report_archive(
+    report_path,
+    summary_payload: Dict[str, Any],
+    sheets: List[Tuple[str, str, Optional[pd.DataFrame]]],
+    fmt: str,
+    advance: Callable[[int], None],
+) -> None:
+    compression = zipfile.ZIP_DEFLATED if fmt == "csv" else zipfile.ZIP_STORED
+    with zipfile.ZipFile(report_path, "w", compression=compression) as zf:
+        zf.writestr("summary.json", json.dumps(summary_payload, ensure_ascii=False, default=str, indent=2))
+        for name, _, df in sheets:
+            if df is None:
+                continue
+            df = df.set_axis(_make_unique_headers(list(df.columns)), axis=1)
+            if fmt == "csv":
+                with zf.open(f"{name}.csv", "w") as raw, io.TextIOWrapper(raw, encoding="utf-8", newline="") as f:
+                    df.to_csv(f, index=False)
+            else:
+                with zf.open(f"{name}.parquet", "w") as f:
+                    pq.write_table(_to_arrow(df, preserve_index=False), f)
+            advance(len(df))
+
+
+def _style_template(ws, **attrs: Any) -> StyleArray:
+    cell = Cell(ws, row=1, column=1)
+    for k, v in attrs.items():
+        setattr(cell, k, v)
+    return cell._style
+
+
+def _decimal_format(decimals: int) -> str:
+    return "0." + ("0" * max(0, int(decimals)))
+
+
+def _column_number_format(header: Any, params: ReconcileParams) -> Optional[str]:
+    if not isinstance(header, str):
+        return None
+    h = header.strip()
+    if ("UTC" in h) or ("Время" in h) or ("Time" in h):
+        return "yyyy-mm-dd hh:mm:ss"
+    if h in {"Score", "Δt_sec"}:
+        return "0.00"
+    if ("Qty" in h) or (h == "ΔQty"):
+        return _decimal_format(params.qty_decimals)
+    if ("Цена" in h) or ("Price" in h):
+        return _decimal_format(params.price_decimals)
+    if ("Объем" in h) or (h == "ΔОбъем") or ("Notional" in h) or ("Volume" in h):
+        return _decimal_format(params.notional_decimals)
+    return None
+
 
-    _style_workbook(report_path, params)
+def _column_widths(df: pd.DataFrame, sample_rows: int = 2000) -> List[int]:
+    head = df.head(max(sample_rows - 1, 0))
+    widths = []
+    for i, h in enumerate(df.columns):
+        s = head.iloc[:, i]
+        s = s[s.notna()]
+        best = max(8, len(str(h)), int(s.astype(str).str.len().max()) if len(s) else 0)
+        widths.append(min(max(best + 2, 10), 60))
+    return widths
 
 
-def _apply_excel_table(ws, used_names: Set[str], idx: int) -> None:
-    if ws.max_row < 2 or ws.max_column < 1:
+def _excel_values(s: pd.Series) -> List[Any]:
+    if s.dtype.kind in "iub":
+        return s.tolist()
+    return s.astype(object).where(s.notna(), None).tolist()
+
+
+def _write_sheet(
+    wb: Workbook,
+    title: str,
+    df: pd.DataFrame,
+    params: ReconcileParams,
+    used_table_names: Set[str],
+    idx: int,
+    advance: Callable[[int], None],
+    timings: Optional[StageTimings] = None,
+) -> None:
+    ws = wb.create_sheet(title)
+    n_rows, n_cols = len(df), len(df.columns)
+    ws.freeze_panes = "A2" if n_rows else "A1"
+    if n_cols == 0:
         return
 
-    headers = [ws.cell(row=1, column=c).value for c in range(1, ws.max_column + 1)]
-    headers_norm = [str(h).strip() if h is not None else "" for h in headers]
+    with _stage(timings, "xlsx_styling"):
+        for col, width in enumerate(_column_widths(df), start=1):
+            ws.column_dimensions[get_column_letter(col)].width = width
+        ws.row_dimensions[1].height = 22
+
+        header_style = _style_template(ws, fill=HEADER_FILL, font=HEADER_FONT, alignment=HEADER_ALIGN, border=HEADER_BORDER)
+        ws.append([Cell(ws, row=1, column=1, value=h, style_array=header_style) for h in df.columns])
+
+        styles = []
+        for h in df.columns:
+            fmt = _column_number_format(h, params)
+            styles.append(_style_template(ws, number_format=fmt) if fmt else None)
+        styled = [i for i, st in enumerate(styles) if st is not None]
+
+    for start in range(0, n_rows, EXCEL_WRITE_BLOCK_ROWS):
+        block = df.iloc[start:start + EXCEL_WRITE_BLOCK_ROWS]
+        with _stage(timings, "xlsx_write"):
+            columns = [_excel_values(block.iloc[:, i]) for i in range(n_cols)]
+        with _stage(timings, "xlsx_styling"):
+            for i in styled:
+                st = styles[i]
+                columns[i] = [Cell(ws, row=1, column=1, value=v, style_array=st) for v in columns[i]]
+        with _stage(timings, "xlsx_write"):
+            for row in zip(*columns):
+                ws.append(row)
+        advance(len(block))
+
+    if n_rows:
+        with _stage(timings, "xlsx_styling"):
+            ref = f"A1:{get_column_letter(n_cols)}{n_rows + 1}"
+            ws.auto_filter.ref = ref
+            _add_excel_table(ws, ref, [str(h) for h in df.columns], used_table_names, idx)
+            _add_conditional_styles(ws, list(df.columns), f"A2:{get_column_letter(n_cols)}{n_rows + 1}")
+
+
+def _add_excel_table(ws, ref: str, headers: List[str], used_names: Set[str], idx: int) -> None:
+    headers_norm = [h.strip() for h in headers]
     if any(h == "" for h in headers_norm):
         return
     if len(set(headers_norm)) != len(headers_norm):
@@ -437,7 +714,10 @@ def _apply_excel_table(ws, used_names: Set[str], idx: int) -> None:
         name = (name[:240] + f"_{j}")[:255]
     used_names.add(name)
 
-    tab = Table(displayName=name, ref=ws.calculate_dimension())
+    tab = Table(displayName=name, ref=ref)
+    tab._initialise_columns()
+    for col, h in zip(tab.tableColumns, headers):
+        col.name = h
     tab.tableStyleInfo = TableStyleInfo(
         name="TableStyleMedium2",
         showFirstColumn=False,
@@ -445,115 +725,25 @@ def _apply_excel_table(ws, used_names: Set[str], idx: int) -> None:
         showRowStripes=True,
         showColumnStripes=False,
     )
-    ws.add_table(tab)
-
-
-def _style_workbook(report_path, params: ReconcileParams) -> None:
-    wb = load_workbook(report_path)
-    used_table_names: Set[str] = set()
-
-    for i, ws in enumerate(wb.worksheets, start=1):
-        if ws.max_row < 1 or ws.max_column < 1:
-            continue
-
-        _apply_sheet_basics(ws)
-        _apply_header_style(ws)
-        _apply_auto_filter(ws)
-        _apply_excel_table(ws, used_table_names, i)
-        _apply_column_formats(ws, params)
-        _apply_conditional_styles(ws)
-        _autosize_columns(ws)
-
-    wb.save(report_path)
-
-
-def _apply_sheet_basics(ws) -> None:
-    ws.freeze_panes = "A2" if ws.max_row >= 2 else "A1"
-
-
-def _apply_header_style(ws) -> None:
-    if ws.max_row < 1 or ws.max_column < 1:
-        return
-    header_fill = PatternFill("solid", fgColor="F2F2F2")
-    header_font = Font(bold=False)
-    header_align = Alignment(horizontal="center", vertical="center", wrap_text=True)
-    for col in range(1, ws.max_column + 1):
-        cell = ws.cell(row=1, column=col)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = header_align
-    ws.row_dimensions[1].height = 22
-
-
-def _apply_auto_filter(ws) -> None:
-    if ws.max_row >= 2 and ws.max_column >= 1:
-        ws.auto_filter.ref = ws.dimensions
-
-
-def _find_col_by_header(ws, header_name: str) -> Optional[int]:
-    for col in range(1, ws.max_column + 1):
-        v = ws.cell(row=1, column=col).value
-        if isinstance(v, str) and v.strip() == header_name:
-            return col
-    return None
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        ws.add_table(tab)
 
 
-def _apply_column_formats(ws, params: ReconcileParams) -> None:
-    if ws.max_row < 2 or ws.max_column < 1:
-        return
-
-    qty_fmt = "0." + ("0" * max(0, int(params.qty_decimals)))
-    price_fmt = "0." + ("0" * max(0, int(params.price_decimals)))
-    notional_fmt = "0." + ("0" * max(0, int(params.notional_decimals)))
-    score_fmt = "0.00"
-    dt_fmt = "yyyy-mm-dd hh:mm:ss"
-
-    for col in range(1, ws.max_column + 1):
-        header = ws.cell(row=1, column=col).value
-        if not isinstance(header, str):
-            continue
-        h = header.strip()
-
-        if ("UTC" in h) or ("Время" in h) or ("Time" in h):
-            for r in range(2, ws.max_row + 1):
-                ws.cell(row=r, column=col).number_format = dt_fmt
-            continue
-
-        if h in {"Score", "Δt_sec"}:
-            for r in range(2, ws.max_row + 1):
-                ws.cell(row=r, column=col).number_format = score_fmt
-            continue
-
-        if ("Qty" in h) or (h == "ΔQty"):
-            for r in range(2, ws.max_row + 1):
-                ws.cell(row=r, column=col).number_format = qty_fmt
-            continue
-
-        if ("Цена" in h) or ("Price" in h):
-            for r in range(2, ws.max_row + 1):
-                ws.cell(row=r, column=col).number_format = price_fmt
-            continue
-
-        if ("Объем" in h) or (h == "ΔОбъем") or ("Notional" in h) or ("Volume" in h):
-            for r in range(2, ws.max_row + 1):
-                ws.cell(row=r, column=col).number_format = notional_fmt
-            continue
-
-
-def _apply_conditional_styles(ws) -> None:
-    if ws.max_row < 2 or ws.max_column < 1:
-        return
-
-    full_range = f"A2:{get_column_letter(ws.max_column)}{ws.max_row}"
-
+def _add_conditional_styles(ws, headers: List[Any], full_range: str) -> None:
     fill_ok = PatternFill("solid", fgColor="E8F5E9")
     fill_warn = PatternFill("solid", fgColor="FFF8E1")
     fill_bad = PatternFill("solid", fgColor="FFEBEE")
     fill_info = PatternFill("solid", fgColor="E3F2FD")
 
-    status_col = _find_col_by_header(ws, "Статус")
-    if status_col:
-        colL = get_column_letter(status_col)
+    def _col_letter(name: str) -> Optional[str]:
+        for i, h in enumerate(headers, start=1):
+            if isinstance(h, str) and h.strip() == name:
+                return get_column_letter(i)
+        return None
+
+    colL = _col_letter("Статус")
+    if colL:
         ws.conditional_formatting.add(full_range, FormulaRule(formula=[f'${colL}2="OK"'], fill=fill_ok))
         ws.conditional_formatting.add(full_range, FormulaRule(formula=[f'${colL}2="Расхождение"'], fill=fill_bad))
         ws.conditional_formatting.add(full_range, FormulaRule(formula=[f'LEFT(${colL}2,5)="Только"'], fill=fill_warn))
@@ -561,26 +751,8 @@ def _apply_conditional_styles(ws) -> None:
         ws.conditional_formatting.add(full_range, FormulaRule(formula=[f'LEFT(${colL}2,4)="НЕТ_"'], fill=fill_bad))
         ws.conditional_formatting.add(full_range, FormulaRule(formula=[f'LEFT(${colL}2,7)="ЛИШНЕЕ_"'], fill=fill_warn))
 
-    mt_col = _find_col_by_header(ws, "Тип_совпадения")
-    if mt_col:
-        colM = get_column_letter(mt_col)
+    colM = _col_letter("Тип_совпадения")
+    if colM:
         ws.conditional_formatting.add(full_range, FormulaRule(formula=[f'${colM}2="STRICT"'], fill=fill_ok))
         ws.conditional_formatting.add(full_range, FormulaRule(formula=[f'${colM}2="FUZZY"'], fill=fill_warn))
         ws.conditional_formatting.add(full_range, FormulaRule(formula=[f'${colM}2="NOTIONAL"'], fill=fill_info))
-
-
-def _autosize_columns(ws, sample_rows: int = 2000) -> None:
-    if ws.max_column < 1:
-        return
-    max_r = min(ws.max_row, sample_rows)
-    for col in range(1, ws.max_column + 1):
-        letter = get_column_letter(col)
-        best = 8
-        for row in range(1, max_r + 1):
-            v = ws.cell(row=row, column=col).value
-            if v is None:
-                continue
-            s = str(v)
-            if len(s) > best:
-                best = len(s)
-        ws.column_dimensions[letter].width = min(max(best + 2, 10), 60)
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from .cache import _restore_object_nans
+from .models import PendingReport
+from .reporter import _to_arrow
+
+RESULT_TABLES: Dict[str, str] = {
+    "matches": "matched",
+    "missing": "missing",
+    "extra": "extra",
+    "exchange_status": "ex_status",
+    "unity_status": "uni_status",
+    "volume_symbol": "vol_sym",
+    "volume_symbol_side": "vol_ss",
+}
+RESULT_PAGE_LIMIT = 200
+RESULT_PAGE_MAX_LIMIT = 5000
+RESULT_ROW_GROUP_ROWS = 10_000
+RESULT_STATUS_COLUMNS = ["Статус", "Тип_совпадения"]
+RESULT_SYMBOL_COLUMN = "Символ"
+
+
+def _result_tables_dir(pending: PendingReport) -> Path:
+    if pending.parts_dir is not None:
+        return pending.parts_dir
+    return pending.report_path.parent / f"{pending.report_path.name.split('.')[0]}_tables"
+
+
+def save_result_tables(pending: PendingReport) -> Path:
+    out = _result_tables_dir(pending)
+    for table, key in RESULT_TABLES.items():
+        target = out / table
+        if target.exists():
+            continue
+        df = pending.tables.get(key)
+        if df is None or df.empty:
+            continue
+        target.mkdir(parents=True, exist_ok=True)
+        pq.write_table(
+            _to_arrow(df, preserve_index=False), target / "part-00000.parquet", row_group_size=RESULT_ROW_GROUP_ROWS
+        )
+    out.mkdir(parents=True, exist_ok=True)
+    return out
+
+
+def _cursor_query(sort: Optional[str], status: Optional[str], symbol: Optional[str]) -> Dict[str, Optional[str]]:
+    return {"sort": sort or None, "status": status or None, "symbol": symbol or None}
+
+
+def _encode_cursor(offset: int, query: Dict[str, Optional[str]]) -> str:
+    payload = json.dumps({"offset": offset, **query}, sort_keys=True)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, query: Dict[str, Optional[str]]) -> int:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        offset = int(payload["offset"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise ValueError("Некорректный cursor")
+    if offset < 0:
+        raise ValueError("Некорректный cursor")
+    if any(payload.get(k) != v for k, v in query.items()):
+        raise ValueError("cursor не соответствует параметрам sort/status/symbol")
+    return offset
+
+
+def _result_parts(tables_dir: Path, table: str) -> List[pq.ParquetFile]:
+    return [pq.ParquetFile(p) for p in sorted((tables_dir / table).glob("part-*.parquet"))]
+
+
+def _row_group_bounds(parts: List[pq.ParquetFile]) -> Tuple[np.ndarray, List[Tuple[int, int]]]:
+    sizes: List[int] = []
+    groups: List[Tuple[int, int]] = []
+    for i, pf in enumerate(parts):
+        for g in range(pf.metadata.num_row_groups):
+            sizes.append(pf.metadata.row_group(g).num_rows)
+            groups.append((i, g))
+    return np.concatenate([[0], np.cumsum(sizes, dtype=np.int64)]), groups
+
+
+def _concat(tables: List[pa.Table]) -> pa.Table:
+    if len(tables) == 1:
+        return tables[0]
+    return pa.concat_tables(tables, promote_options="permissive")
+
+
+def _with_columns(t: pa.Table, columns: List[str]) -> pa.Table:
+    for c in columns:
+        if c not in t.column_names:
+            t = t.append_column(c, pa.nulls(t.num_rows, type=pa.string()))
+    return t.select(columns)
+
+
+def _read_columns(parts: List[pq.ParquetFile], columns: List[str]) -> pa.Table:
+    return _concat([_with_columns(pf.read(columns=[c for c in columns if c in pf.schema_arrow.names]), columns) for pf in parts])
+
+
+def _take_rows(parts: List[pq.ParquetFile], rows: np.ndarray, columns: List[str]) -> pa.Table:
+    bounds, groups = _row_group_bounds(parts)
+    gid = np.searchsorted(bounds, rows, side="right") - 1
+    pieces: List[pa.Table] = []
+    positions: List[np.ndarray] = []
+    for g in np.unique(gid):
+        sel = np.flatnonzero(gid == g)
+        part, group = groups[g]
+        pieces.append(_with_columns(parts[part].read_row_group(group), columns).take(pa.array(rows[sel] - bounds[g])))
+        positions.append(sel)
+    page = _concat(pieces)
+    return page.take(pa.array(np.argsort(np.concatenate(positions), kind="stable")))
+
+
+def _filter_columns(names: List[str], status: Optional[str], symbol: Optional[str]) -> Tuple[Optional[str], List[str]]:
+    status_col = None
+    if status:
+        status_col = next((c for c in RESULT_STATUS_COLUMNS if c in names), None)
+        if status_col is None:
+            raise ValueError("Таблица не поддерживает фильтр по статусу")
+    symbol_cols: List[str] = []
+    if symbol:
+        symbol_cols = [c for c in names if c == RESULT_SYMBOL_COLUMN or c.endswith(f"_{RESULT_SYMBOL_COLUMN}")]
+        if not symbol_cols:
+            raise ValueError("Таблица не поддерживает фильтр по символу")
+    return status_col, symbol_cols
+
+
+def _filter_mask(
+    t: pa.Table, status_col: Optional[str], status: Optional[str], symbol_cols: List[str], symbol: Optional[str]
+) -> Optional[pa.ChunkedArray]:
+    mask = None
+    if status_col is not None:
+        values = pa.array([s.strip() for s in status.split(",") if s.strip()], type=pa.string())
+        mask = pc.is_in(pc.cast(t[status_col], pa.string()), value_set=values)
+    if symbol_cols:
+        wanted = symbol.strip().upper()
+        sym_mask = None
+        for c in symbol_cols:
+            m = pc.equal(pc.utf8_upper(pc.cast(t[c], pa.string())), wanted)
+            sym_mask = m if sym_mask is None else pc.or_kleene(sym_mask, m)
+        mask = sym_mask if mask is None else pc.and_kleene(mask, sym_mask)
+    return mask
+
+
+def _selected_rows(
+    parts: List[pq.ParquetFile], names: List[str], sort: Optional[str], status: Optional[str], symbol: Optional[str]
+) -> np.ndarray:
+    status_col, symbol_cols = _filter_columns(names, status, symbol)
+    sort_col = sort.lstrip("-+") if sort else None
+    if sort_col is not None and sort_col not in names:
+        raise ValueError(f"Неизвестная колонка сортировки: {sort_col}")
+    keys = list(dict.fromkeys(c for c in [status_col, *symbol_cols, sort_col] if c is not None))
+    t = _read_columns(parts, keys)
+    rows = np.arange(t.num_rows, dtype=np.int64)
+    mask = _filter_mask(t, status_col, status, symbol_cols, symbol)
+    if mask is not None:
+        keep = pc.fill_null(mask, False).to_numpy(zero_copy_only=False)
+        rows = rows[keep]
+    if sort_col is not None:
+        order = "descending" if sort.startswith("-") else "ascending"
+        sorted_idx = pc.sort_indices(t.select([sort_col]).take(pa.array(rows)), sort_keys=[(sort_col, order)])
+        rows = rows[sorted_idx.to_numpy()]
+    return rows
+
+
+def _page_records(page: pa.Table) -> List[Dict[str, Any]]:
+    df = _restore_object_nans(page.to_pandas())
+    return df.astype(object).where(df.notna(), None).to_dict(orient="records")
+
+
+def read_result_page(
+    tables_dir: Path,
+    table: str,
+    *,
+    cursor: Optional[str] = None,
+    offset: int = 0,
+    limit: int = RESULT_PAGE_LIMIT,
+    sort: Optional[str] = None,
+    status: Optional[str] = None,
+    symbol: Optional[str] = None,
+) -> Dict[str, Any]:
+    if table not in RESULT_TABLES:
+        raise ValueError(f"Неизвестная таблица: {table}. Допустимые: {', '.join(RESULT_TABLES)}")
+    limit = max(1, min(int(limit), RESULT_PAGE_MAX_LIMIT))
+    query = _cursor_query(sort, status, symbol)
+    offset = _decode_cursor(cursor, query) if cursor else max(int(offset), 0)
+
+    parts = _result_parts(Path(tables_dir), table)
+    columns: List[str] = list(pa.unify_schemas([pf.schema_arrow for pf in parts]).names) if parts else []
+    if columns and (sort or status or symbol):
+        rows = _selected_rows(parts, columns, sort, status, symbol)
+        total = len(rows)
+        page_rows = rows[offset:offset + limit]
+    else:
+        total = int(_row_group_bounds(parts)[0][-1]) if columns else 0
+        page_rows = np.arange(offset, min(offset + limit, total), dtype=np.int64)
+
+    end = offset + len(page_rows)
+    page = _take_rows(parts, page_rows, columns) if len(page_rows) else None
+    return {
+        "table": table,
+        "columns": columns,
+        "rows": _page_records(page) if page is not None else [],
+        "offset": offset,
+        "limit": limit,
+        "total": total,
+        "next_cursor": _encode_cursor(end, query) if end < total else None,
+    }
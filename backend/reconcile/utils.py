@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import re
 from decimal import Decimal, ROUND_HALF_UP
-from typing import Any, List, Optional, Tuple
+from functools import lru_cache
+from typing import Any, Callable, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
+from pandas.tseries.api import guess_datetime_format
 
 
 def _norm_col(s: Any) -> str:
@@ -68,13 +70,78 @@ def _qround_float(v: Any, decimals: int) -> float:
     return float(d.quantize(q, rounding=ROUND_HALF_UP))
 
 
-def _detect_unity_offset_hours_from_text(s: Any, default_hours: int = 5) -> int:
-    if s is None or (isinstance(s, float) and np.isnan(s)):
-        return default_hours
-    txt = str(s)
+TICKS_NA = np.iinfo(np.int64).min
+
+
+def _half_up_scaled(x: np.ndarray, decimals: int) -> Tuple[np.ndarray, np.ndarray]:
+    y = np.abs(x) * (10.0 ** decimals)
+    frac = y - np.floor(y)
+    exact = (y < 2.0 ** 52) & (np.abs(frac - 0.5) > np.maximum(y, 1.0) * 2.0 ** -45)
+    return np.copysign(np.floor(y + 0.5), x), exact
+
+
+def _qround_ticks(values: Any, decimals: int) -> np.ndarray:
+    v = np.asarray(pd.to_numeric(values, errors="coerce"), dtype=np.float64)
+    out = np.full(v.shape, TICKS_NA, dtype=np.int64)
+    finite = np.isfinite(v)
+    if not finite.any():
+        return out
+
+    x = v[finite]
+    scaled, exact = _half_up_scaled(x, decimals)
+
+    ticks = np.zeros(x.shape, dtype=np.int64)
+    ticks[exact] = scaled[exact].astype(np.int64)
+
+    if not exact.all():
+        q = Decimal("1").scaleb(-decimals)
+        for i in np.flatnonzero(~exact):
+            d = Decimal(str(float(x[i]))).quantize(q, rounding=ROUND_HALF_UP).scaleb(decimals)
+            t = int(d)
+            ticks[i] = t if TICKS_NA < t <= np.iinfo(np.int64).max else TICKS_NA
+
+    out[finite] = ticks
+    return out
+
+
+def _qround_float_array(values: Any, decimals: int) -> np.ndarray:
+    v = np.asarray(pd.to_numeric(values, errors="coerce"), dtype=np.float64)
+    out = np.full(v.shape, np.nan, dtype=np.float64)
+    finite = np.isfinite(v)
+    if not finite.any():
+        return out
+
+    x = v[finite]
+    scaled, exact = _half_up_scaled(x, decimals)
+    res = scaled / (10.0 ** decimals)
+
+    if not exact.all():
+        for i in np.flatnonzero(~exact):
+            res[i] = _qround_float(float(x[i]), decimals)
+
+    out[finite] = res
+    return out
+
+
+def _ticks_to_str(ticks: Any, decimals: int) -> np.ndarray:
+    t = np.asarray(ticks, dtype=np.int64)
+    na = t == TICKS_NA
+    a = np.abs(np.where(na, 0, t))
+    scale = 10 ** decimals
+    s = pd.Series(a // scale).astype(str)
+    if decimals > 0:
+        s = s + "." + pd.Series(a % scale).astype(str).str.zfill(decimals)
+    out = s.to_numpy(dtype=object)
+    neg = t < 0
+    out[neg & ~na] = "-" + s[neg & ~na]
+    out[na] = ""
+    return out
+
+
+def _utc_offset_from_text(txt: str) -> Optional[int]:
     m = re.search(r"\(UTC\s*([+-])\s*(\d{1,2})(?::(\d{2}))?\)", txt, flags=re.IGNORECASE)
     if not m:
-        return default_hours
+        return None
 
     sign = 1 if m.group(1) == "+" else -1
     hh = int(m.group(2))
@@ -84,6 +151,132 @@ def _detect_unity_offset_hours_from_text(s: Any, default_hours: int = 5) -> int:
     return sign * hh
 
 
+TIME_NAT_STRINGS = {"", "NaT", "nat", "NAT", "nan", "NaN", "NAN"}
+TIME_UTC_SUFFIX_RE = r"\s*\(UTC[^\)]*\)\s*"
+TIME_PARSE_CHUNK = 262_144
+TIME_FIELDS = {
+    "%Y": ("year", 4, 1, 9999),
+    "%m": ("month", 2, 1, 12),
+    "%d": ("day", 2, 1, 31),
+    "%H": ("hour", 2, 0, 23),
+    "%M": ("minute", 2, 0, 59),
+    "%S": ("second", 2, 0, 59),
+}
+
+
+@lru_cache(maxsize=128)
+def _time_layout(source: str, fmt: str, shape: str) -> Optional[Tuple[Tuple[str, int, int], ...]]:
+    fields: List[Tuple[str, int, int]] = []
+    i = 0
+    j = 0
+    while j < len(fmt):
+        if fmt[j] == "%":
+            d = fmt[j:j + 2]
+            j += 2
+            if d == "%f":
+                w = len(shape[i:]) - len(shape[i:].lstrip("9"))
+                if not 1 <= w <= 9:
+                    return None
+                fields.append(("ns", i, w))
+            elif d in TIME_FIELDS:
+                name, w, _, _ = TIME_FIELDS[d]
+                if shape[i:i + w] != "9" * w:
+                    return None
+                fields.append((name, i, w))
+            else:
+                return None
+            i += w
+        else:
+            if fmt[j].isdigit() or i >= len(shape) or shape[i] != fmt[j]:
+                return None
+            i += 1
+            j += 1
+
+    names = {f[0] for f in fields}
+    if i != len(shape) or not {"year", "month", "day"} <= names or len(names) != len(fields):
+        return None
+    return tuple(fields)
+
+
+def _parse_times_slow(values: pd.Series, utc_suffix: bool, fmt: Optional[str]) -> pd.Series:
+    if utc_suffix:
+        values = values.str.replace(TIME_UTC_SUFFIX_RE, "", regex=True).str.strip()
+    if fmt is None:
+        return pd.to_datetime(values, dayfirst=True, errors="coerce")
+    return pd.to_datetime(values, format=fmt, dayfirst=True, errors="coerce")
+
+
+def _parse_trade_times(
+    values: pd.Series,
+    source: str,
+    *,
+    utc_suffix: bool = False,
+) -> Tuple[pd.Series, Optional[int]]:
+    offset: Optional[int] = None
+    if utc_suffix:
+        first = values.dropna()
+        offset = _utc_offset_from_text(str(first.iloc[0])) if len(first) else None
+        values = values.astype(str)
+    elif values.dtype != object or pd.api.types.infer_dtype(values, skipna=True) != "string":
+        return pd.to_datetime(values, dayfirst=True, errors="coerce"), None
+
+    raw = values.to_numpy(dtype=object)
+    sample = body = None
+    for v in raw:
+        if not isinstance(v, str):
+            continue
+        b = re.sub(TIME_UTC_SUFFIX_RE, "", v).strip() if utc_suffix else v
+        if b not in TIME_NAT_STRINGS:
+            sample, body = v, b
+            break
+    if sample is None:
+        return _parse_times_slow(values, utc_suffix, None), offset
+
+    fmt = guess_datetime_format(body, dayfirst=True)
+    if fmt is None:
+        return _parse_times_slow(values, utc_suffix, None), offset
+
+    start = sample.find(body)
+    iso = fmt.startswith("%Y-%m-%d")
+    layout = _time_layout(source, fmt, re.sub(r"\d", "9", body)) if start >= 0 and not iso else None
+    if layout is None:
+        return _parse_times_slow(values, utc_suffix, fmt), offset
+
+    width = len(sample) + 1
+    ref = np.array([sample], dtype=f"U{width}").view(np.uint32)
+    is_field = np.zeros(width, dtype=bool)
+    for _, pos, w in layout:
+        is_field[start + pos:start + pos + w] = True
+    literal = np.flatnonzero(~is_field)
+
+    n = len(raw)
+    ok = np.zeros(n, dtype=bool)
+    parts = {name: np.zeros(n, dtype=np.int64) for name, _, _ in layout}
+    for lo in range(0, n, TIME_PARSE_CHUNK):
+        block = np.array(raw[lo:lo + TIME_PARSE_CHUNK], dtype=f"U{width}").view(np.uint32).reshape(-1, width)
+        good = (block[:, literal] == ref[literal]).all(axis=1)
+        for name, pos, w in layout:
+            digits = block[:, start + pos:start + pos + w].astype(np.int64) - 48
+            good &= ((digits >= 0) & (digits <= 9)).all(axis=1)
+            parts[name][lo:lo + len(block)] = digits @ (10 ** np.arange(w - 1, -1, -1, dtype=np.int64))
+        ok[lo:lo + len(block)] = good
+
+    for name, _, lo_v, hi_v in TIME_FIELDS.values():
+        if name in parts:
+            ok &= (parts[name] >= lo_v) & (parts[name] <= hi_v)
+    for name, _, w in layout:
+        if name == "ns":
+            parts["ns"] *= 10 ** (9 - w)
+
+    out = np.full(n, np.datetime64("NaT"), dtype="datetime64[ns]")
+    if ok.any():
+        out[ok] = pd.to_datetime(pd.DataFrame({k: v[ok] for k, v in parts.items()}), errors="coerce").to_numpy()
+    rest = ~ok
+    if rest.any():
+        out[rest] = _parse_times_slow(values[rest], utc_suffix, fmt).to_numpy(dtype="datetime64[ns]")
+    return pd.Series(out, index=values.index), offset
+
+
 def _extract_symbol_from_unity(inst: Any) -> str:
     if inst is None or (isinstance(inst, float) and np.isnan(inst)):
         return ""
@@ -98,6 +291,13 @@ def _extract_symbol_from_unity(inst: Any) -> str:
     return s
 
 
+def _extract_venue_from_unity(inst: Any) -> str:
+    if inst is None or (isinstance(inst, float) and np.isnan(inst)):
+        return ""
+    m = re.match(r"\s*\[(?P<venue>[^\]]+)\]", str(inst).upper())
+    return m.group("venue").strip() if m else ""
+
+
 def _extract_symbol_from_okx(sym: Any) -> str:
     if sym is None or (isinstance(sym, float) and np.isnan(sym)):
         return ""
@@ -114,6 +314,31 @@ def _extract_symbol_basic(sym: Any) -> str:
     return re.sub(r"[^A-Z0-9]", "", str(sym).upper().strip())
 
 
+def _extract_symbol_plain(sym: Any) -> str:
+    return str(sym).upper().strip() if sym is not None else ""
+
+
+SYMBOL_CACHE_SIZE = 65_536
+
+
+@lru_cache(maxsize=SYMBOL_CACHE_SIZE)
+def _cached_symbol(mapper: Callable[[Any], str], value: str) -> str:
+    return mapper(value)
+
+
+def _map_symbols(values: pd.Series, mapper: Callable[[Any], str]) -> pd.Series:
+    if values.dtype != object or pd.api.types.infer_dtype(values, skipna=True) != "string":
+        return values.map(mapper)
+
+    codes, uniques = pd.factorize(values)
+    mapped = np.array([_cached_symbol(mapper, u) for u in uniques] + [""], dtype=object)
+    out = mapped[codes]
+    na = codes == -1
+    if na.any():
+        out[na] = [mapper(v) for v in values.to_numpy(dtype=object)[na]]
+    return pd.Series(out, index=values.index, name=values.name)
+
+
 def _snap_value(x: float, candidates: Tuple[float, ...], rel_tol: float = 0.05) -> Optional[float]:
     if not np.isfinite(x) or x <= 0:
         return None
@@ -137,3 +362,8 @@ def _within_tol(bv: float, uv: float, rel: float, abs_tol: float) -> bool:
     diff = abs(float(uv) - float(bv))
     thresh = max(abs_tol, rel * abs(float(bv)))
     return diff <= thresh
+
+
+def _within_tol_array(bv: np.ndarray, uv: np.ndarray, rel: float, abs_tol: float) -> np.ndarray:
+    with np.errstate(invalid="ignore"):
+        return np.abs(uv - bv) <= np.maximum(abs_tol, rel * np.abs(bv))
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 from .models import ReconcileParams
-from .utils import _within_tol, _qround_float
+from .utils import _qround_float_array, _within_tol_array
+
+VOLUME_STATUS_ONLY_UNITY = "Только Unity"
+VOLUME_STATUS_ONLY_EXCHANGE = "Только Биржа"
+VOLUME_STATUS_OK = "OK"
+VOLUME_STATUS_DIFF = "Расхождение"
 
 
 def _agg_volume(df: pd.DataFrame, by_side: bool) -> pd.DataFrame:
@@ -24,6 +30,30 @@ def _agg_volume(df: pd.DataFrame, by_side: bool) -> pd.DataFrame:
     return g
 
 
+def _merge_volume_aggs(parts: List[pd.DataFrame], by_side: bool) -> pd.DataFrame:
+    keys = ["symbol"] + (["side"] if by_side else [])
+    if not parts:
+        return pd.DataFrame(columns=keys + ["trades", "qty_sum", "notional_sum", "first_time", "last_time"])
+    return (
+        pd.concat(parts, ignore_index=True)
+        .groupby(keys, dropna=False)
+        .agg(
+            trades=("trades", "sum"),
+            qty_sum=("qty_sum", "sum"),
+            notional_sum=("notional_sum", "sum"),
+            first_time=("first_time", "min"),
+            last_time=("last_time", "max"),
+        )
+        .reset_index()
+    )
+
+
+def _volume_levels(agg: pd.DataFrame, by_side: bool) -> Tuple[pd.DataFrame, Optional[pd.DataFrame]]:
+    if not by_side:
+        return agg, None
+    return _merge_volume_aggs([agg], by_side=False), agg
+
+
 def _compare_volume(
     agg_ex: pd.DataFrame,
     agg_u: pd.DataFrame,
@@ -46,32 +76,33 @@ def _compare_volume(
     m["qty_diff"] = m["qty_sum_unity"] - m["qty_sum_exchange"]
     m["notional_diff"] = m["notional_sum_unity"] - m["notional_sum_exchange"]
 
-    statuses: List[str] = []
-    for tb, tu, qb, qu, nb, nu in zip(
-        m["trades_exchange"], m["trades_unity"],
-        m["qty_sum_exchange"], m["qty_sum_unity"],
-        m["notional_sum_exchange"], m["notional_sum_unity"],
-    ):
-        if tb == 0 and tu > 0:
-            statuses.append("Только Unity")
-            continue
-        if tu == 0 and tb > 0:
-            statuses.append("Только Биржа")
-            continue
-
-        qty_ok = _within_tol(float(qb), float(qu), params.volume_qty_rel_tol, params.volume_qty_abs_tol)
-        not_ok = _within_tol(float(nb), float(nu), params.volume_notional_rel_tol, params.volume_notional_abs_tol)
-        statuses.append("OK" if (qty_ok and not_ok) else "Расхождение")
-
-    m["status"] = statuses
-
-    m["qty_sum_exchange"] = m["qty_sum_exchange"].map(lambda x: _qround_float(x, params.qty_decimals))
-    m["qty_sum_unity"] = m["qty_sum_unity"].map(lambda x: _qround_float(x, params.qty_decimals))
-    m["qty_diff"] = m["qty_diff"].map(lambda x: _qround_float(x, params.qty_decimals))
-
-    m["notional_sum_exchange"] = m["notional_sum_exchange"].map(lambda x: _qround_float(x, params.notional_decimals))
-    m["notional_sum_unity"] = m["notional_sum_unity"].map(lambda x: _qround_float(x, params.notional_decimals))
-    m["notional_diff"] = m["notional_diff"].map(lambda x: _qround_float(x, params.notional_decimals))
+    tb = m["trades_exchange"].to_numpy(dtype=np.float64)
+    tu = m["trades_unity"].to_numpy(dtype=np.float64)
+    qty_ok = _within_tol_array(
+        m["qty_sum_exchange"].to_numpy(dtype=np.float64),
+        m["qty_sum_unity"].to_numpy(dtype=np.float64),
+        params.volume_qty_rel_tol,
+        params.volume_qty_abs_tol,
+    )
+    not_ok = _within_tol_array(
+        m["notional_sum_exchange"].to_numpy(dtype=np.float64),
+        m["notional_sum_unity"].to_numpy(dtype=np.float64),
+        params.volume_notional_rel_tol,
+        params.volume_notional_abs_tol,
+    )
+    m["status"] = np.select(
+        [(tb == 0) & (tu > 0), (tu == 0) & (tb > 0), qty_ok & not_ok],
+        [VOLUME_STATUS_ONLY_UNITY, VOLUME_STATUS_ONLY_EXCHANGE, VOLUME_STATUS_OK],
+        default=VOLUME_STATUS_DIFF,
+    ).astype(object)
+
+    m["qty_sum_exchange"] = _qround_float_array(m["qty_sum_exchange"], params.qty_decimals)
+    m["qty_sum_unity"] = _qround_float_array(m["qty_sum_unity"], params.qty_decimals)
+    m["qty_diff"] = _qround_float_array(m["qty_diff"], params.qty_decimals)
+
+    m["notional_sum_exchange"] = _qround_float_array(m["notional_sum_exchange"], params.notional_decimals)
+    m["notional_sum_unity"] = _qround_float_array(m["notional_sum_unity"], params.notional_decimals)
+    m["notional_diff"] = _qround_float_array(m["notional_diff"], params.notional_decimals)
 
     m["_abs_not"] = pd.to_numeric(m["notional_diff"], errors="coerce").abs()
     m = m.sort_values("_abs_not", ascending=False).drop(columns=["_abs_not"])
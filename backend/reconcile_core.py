@@ -1,15 +1,37 @@
 from reconcile import (
+    ParsedUploadCache,
+    OKX_CONTRACT_REGISTRY,
+    OkxContractRegistry,
+    PendingReport,
     ReconcileParams,
     ReconcileSummary,
     ReconcileResult,
+    BatchReconcileResult,
     reconcile_to_report,
+    reconcile_batch_to_report,
     reconcile_to_report_with_preview,
+    prepare_reconcile_report,
+    write_pending_report,
+    RESULT_TABLES,
+    read_result_page,
+    save_result_tables,
 )
 
 __all__ = [
+    "ParsedUploadCache",
+    "OKX_CONTRACT_REGISTRY",
+    "OkxContractRegistry",
+    "PendingReport",
     "ReconcileParams",
     "ReconcileSummary",
     "ReconcileResult",
+    "BatchReconcileResult",
     "reconcile_to_report",
+    "reconcile_batch_to_report",
     "reconcile_to_report_with_preview",
+    "prepare_reconcile_report",
+    "write_pending_report",
+    "RESULT_TABLES",
+    "read_result_page",
+    "save_result_tables",
 ]
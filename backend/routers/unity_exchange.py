@@ -2,16 +2,32 @@ import json
 import logging
 import os
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, Form, Header, HTTPException, Query, UploadFile
 from fastapi.concurrency import run_in_threadpool
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 
+from core.config import PARSE_CACHE_DIR, PARSE_CACHE_MAX_MB, REPORT_EXPORT_WORKERS
 from core.constants import VALID_EXCHANGE_TYPES
 from core.deps import get_current_user
-from reconcile_core import ReconcileParams, reconcile_to_report
+from db.okx_contracts import get_okx_contract_values, save_okx_contract_values
+from reconcile_core import (
+    OKX_CONTRACT_REGISTRY,
+    RESULT_TABLES,
+    BatchReconcileResult,
+    PendingReport,
+    ParsedUploadCache,
+    ReconcileParams,
+    prepare_reconcile_report,
+    reconcile_batch_to_report,
+    read_result_page,
+    save_result_tables,
+    write_pending_report,
+)
 from utils.cache import CACHE_LOCK, LAST_UNITY_EXCHANGE_BY_USER, UNITY_EXCHANGE_CACHE, cleanup_unity_exchange_cache
 from utils.files import cleanup_files, save_upload_file
 
@@ -21,6 +37,35 @@ router = APIRouter()
 BASE_DIR = Path(__file__).resolve().parent.parent
 UNITY_EXCHANGE_REPORT_DIR = BASE_DIR / "client_reports" / "unity_exchange"
 UNITY_EXCHANGE_REPORT_DIR.mkdir(parents=True, exist_ok=True)
+UNITY_EXCHANGE_PROFILE_DIR = UNITY_EXCHANGE_REPORT_DIR / "profiles"
+PROFILE_PHASES = ("prepare", "write")
+
+PARSE_CACHE = ParsedUploadCache(Path(PARSE_CACHE_DIR), PARSE_CACHE_MAX_MB * 1024 * 1024)
+OKX_CONTRACT_REGISTRY.attach(get_okx_contract_values, save_okx_contract_values)
+REPORT_EXECUTOR = ThreadPoolExecutor(max_workers=max(REPORT_EXPORT_WORKERS, 1), thread_name_prefix="unity-exchange-report")
+
+REPORT_MEDIA_TYPES = {
+    ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ".zip": "application/zip",
+}
+
+
+def _accepts(accept: str, media_type: str) -> bool:
+    main_type = media_type.split("/")[0]
+    for item in (accept or "*/*").split(","):
+        parts = [p.strip() for p in item.split(";")]
+        q = 1.0
+        for p in parts[1:]:
+            if p.startswith("q="):
+                try:
+                    q = float(p[2:])
+                except ValueError:
+                    q = 0.0
+        if q <= 0:
+            continue
+        if parts[0] in {"*/*", media_type, f"{main_type}/*"}:
+            return True
+    return False
 
 
 @router.post("/api/v1/unity-exchange/run")
@@ -29,6 +74,7 @@ async def run_unity_exchange(
     exchange_file: UploadFile = File(...),
     exchange_type: str = Form("BINANCE"),
     params_json: str = Form("{}"),
+    preview_limit: int = Form(200),
     current_user: str = Depends(get_current_user),
 ):
     cleanup_unity_exchange_cache()
@@ -49,29 +95,43 @@ async def run_unity_exchange(
         except Exception:
             params_dict = {}
 
-        result = await run_in_threadpool(
-            _process_unity_exchange_sync, unity_path, ex_path, exchange_type, params_dict
+        run_id = uuid.uuid4().hex
+        pending, tables_dir, pages = await run_in_threadpool(
+            _prepare_unity_exchange_sync, run_id, unity_path, ex_path, exchange_type, params_dict, preview_limit
         )
+        summary = {**pending.summary.__dict__, "reused_stages": list(pending.summary.reused_stages)}
 
-        run_id = uuid.uuid4().hex
         with CACHE_LOCK:
             UNITY_EXCHANGE_CACHE[run_id] = {
                 "created_at": datetime.now(),
                 "owner": current_user,
-                "report_path": result["report_path"],
-                "exchange_name": result["exchange_name"],
+                "report_path": str(pending.report_path),
+                "parts_dir": str(pending.parts_dir) if pending.parts_dir else None,
+                "tables_dir": str(tables_dir),
+                "stage_profile": pending.summary.stage_profile,
+                "profile_files": [str(p) for p in _profile_files(run_id)] if pending.params.profile_dump else [],
+                "exchange_name": pending.summary.exchange_name,
+                "report_status": "pending",
+                "progress": 0.0,
+                "error": None,
             }
             LAST_UNITY_EXCHANGE_BY_USER[current_user] = run_id
 
+        REPORT_EXECUTOR.submit(_write_report_job, run_id, pending)
         cleanup_unity_exchange_cache()
 
         return {
             "status": "success",
             "run_id": run_id,
-            "exchange_name": result["exchange_name"],
-            "report_filename": result["report_filename"],
-            "summary": result["summary"],
-            "preview": result.get("preview"),
+            "exchange_name": pending.summary.exchange_name,
+            "report_filename": os.path.basename(str(pending.report_path)),
+            "report_status": "pending",
+            "summary": summary,
+            "reused_stages": summary["reused_stages"],
+            "stage_profile": pending.summary.stage_profile,
+            "preview": {t: p["rows"] for t, p in pages.items()},
+            "preview_totals": {t: p["total"] for t, p in pages.items()},
+            "preview_cursors": {t: p["next_cursor"] for t, p in pages.items()},
         }
     except HTTPException:
         raise
@@ -82,9 +142,98 @@ async def run_unity_exchange(
         cleanup_files(unity_path, ex_path)
 
 
+@router.post("/api/v1/unity-exchange/batch")
+async def run_unity_exchange_batch(
+    unity_file: UploadFile = File(...),
+    exchange_files: List[UploadFile] = File(...),
+    exchange_types: str = Form(...),
+    params_json: str = Form("{}"),
+    current_user: str = Depends(get_current_user),
+):
+    cleanup_unity_exchange_cache()
+    unity_path = None
+    ex_paths: List[str] = []
+    try:
+        types = [t.strip().upper() for t in (exchange_types or "").split(",") if t.strip()]
+        if len(types) != len(exchange_files):
+            raise HTTPException(400, "exchange_types must list one type per exchange file")
+        invalid = [t for t in types if t not in VALID_EXCHANGE_TYPES]
+        if invalid:
+            raise HTTPException(400, f"exchange_type must be one of: {', '.join(VALID_EXCHANGE_TYPES)}")
+        if len(set(types)) != len(types):
+            raise HTTPException(400, "Each exchange_type may appear only once in a batch")
+
+        unity_path = save_upload_file(unity_file)
+        ex_paths = [save_upload_file(f) for f in exchange_files]
+
+        try:
+            params_dict = json.loads(params_json or "{}")
+            if not isinstance(params_dict, dict):
+                params_dict = {}
+        except Exception:
+            params_dict = {}
+
+        result: BatchReconcileResult = await run_in_threadpool(
+            _run_unity_exchange_batch_sync, unity_path, list(zip(types, ex_paths)), params_dict
+        )
+
+        batch_run_id = uuid.uuid4().hex
+        exchanges: Dict[str, Any] = {}
+        with CACHE_LOCK:
+            now = datetime.now()
+            UNITY_EXCHANGE_CACHE[batch_run_id] = {
+                "created_at": now,
+                "owner": current_user,
+                "report_path": str(result.report_path),
+                "exchange_name": "batch",
+                "report_status": "ready",
+                "progress": 1.0,
+                "error": None,
+            }
+            for exchange_type, res in result.results.items():
+                run_id = uuid.uuid4().hex
+                UNITY_EXCHANGE_CACHE[run_id] = {
+                    "created_at": now,
+                    "owner": current_user,
+                    "report_path": str(res.report_path),
+                    "tables_dir": str(result.tables_dirs[exchange_type]),
+                    "exchange_name": res.summary.exchange_name,
+                    "report_status": "ready",
+                    "progress": 1.0,
+                    "error": None,
+                }
+                exchanges[exchange_type] = {
+                    "run_id": run_id,
+                    "exchange_name": res.summary.exchange_name,
+                    "report_filename": os.path.basename(str(res.report_path)),
+                    "summary": {**res.summary.__dict__, "reused_stages": list(res.summary.reused_stages)},
+                }
+        cleanup_unity_exchange_cache()
+
+        return {
+            "status": "success",
+            "run_id": batch_run_id,
+            "report_filename": os.path.basename(str(result.report_path)),
+            "rows_unity": result.rows_unity,
+            "rows_unity_unassigned": result.rows_unity_unassigned,
+            "exchanges": exchanges,
+        }
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(400, detail=str(e))
+    except Exception as e:
+        log.error("unity-exchange batch error: %s", e, exc_info=True)
+        raise HTTPException(500, detail=str(e))
+    finally:
+        cleanup_files(unity_path, *ex_paths)
+
+
 @router.get("/api/v1/unity-exchange/export/{run_id}")
 async def export_unity_exchange_report(
-    run_id: str, current_user: str = Depends(get_current_user)
+    run_id: str,
+    accept: str = Header("*/*"),
+    current_user: str = Depends(get_current_user),
 ):
     cleanup_unity_exchange_cache()
     with CACHE_LOCK:
@@ -93,30 +242,188 @@ async def export_unity_exchange_report(
         raise HTTPException(404, "Report expired or not found")
     if cached.get("owner") != current_user:
         raise HTTPException(403, "Forbidden")
+    status = cached.get("report_status", "ready")
+    if status == "pending":
+        return JSONResponse(
+            status_code=202,
+            content={"status": "pending", "run_id": run_id, "progress": cached.get("progress", 0.0)},
+            headers={"Retry-After": "1"},
+        )
+    if status == "failed":
+        raise HTTPException(500, detail=cached.get("error") or "Report generation failed")
     report_path = cached.get("report_path")
     if not report_path or not os.path.exists(report_path):
         raise HTTPException(404, "Report file not found")
+    media_type = REPORT_MEDIA_TYPES.get(Path(report_path).suffix.lower(), "application/octet-stream")
+    if not _accepts(accept, media_type):
+        raise HTTPException(406, f"Report is available as {media_type}")
     return FileResponse(
         report_path,
         filename=os.path.basename(report_path),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        media_type=media_type,
+        headers={"Vary": "Accept"},
     )
 
 
-def _process_unity_exchange_sync(
-    unity_path: str, exchange_path: str, exchange_type: str, params_dict: dict
+@router.get("/api/v1/unity-exchange/results/{run_id}/{table}")
+async def get_unity_exchange_results(
+    run_id: str,
+    table: str,
+    cursor: Optional[str] = Query(None),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(200, ge=1),
+    sort: Optional[str] = Query(None),
+    status: Optional[str] = Query(None),
+    symbol: Optional[str] = Query(None),
+    current_user: str = Depends(get_current_user),
+):
+    cleanup_unity_exchange_cache()
+    with CACHE_LOCK:
+        cached = UNITY_EXCHANGE_CACHE.get(run_id)
+    if not cached:
+        raise HTTPException(404, "Results expired or not found")
+    if cached.get("owner") != current_user:
+        raise HTTPException(403, "Forbidden")
+    if table not in RESULT_TABLES:
+        raise HTTPException(404, f"table must be one of: {', '.join(RESULT_TABLES)}")
+    tables_dir = cached.get("tables_dir")
+    if not tables_dir:
+        raise HTTPException(404, "Results not available for this run")
+    try:
+        page = await run_in_threadpool(
+            read_result_page,
+            Path(tables_dir),
+            table,
+            cursor=cursor,
+            offset=offset,
+            limit=limit,
+            sort=sort,
+            status=status,
+            symbol=symbol,
+        )
+    except ValueError as e:
+        raise HTTPException(400, detail=str(e))
+    return {"status": "success", "run_id": run_id, **page}
+
+
+@router.get("/api/v1/unity-exchange/profile/{run_id}")
+async def get_unity_exchange_profile(run_id: str, current_user: str = Depends(get_current_user)):
+    cached = _owned_entry(run_id, current_user)
+    return {
+        "status": "success",
+        "run_id": run_id,
+        "report_status": cached.get("report_status", "ready"),
+        "stage_profile": cached.get("stage_profile") or {},
+        "dumps": [Path(p).name for p in cached.get("profile_files") or [] if os.path.exists(p)],
+    }
+
+
+@router.get("/api/v1/unity-exchange/profile/{run_id}/{phase}")
+async def download_unity_exchange_profile(
+    run_id: str,
+    phase: str,
+    format: str = Query("prof", pattern="^(prof|txt)$"),
+    current_user: str = Depends(get_current_user),
 ):
+    _owned_entry(run_id, current_user)
+    if phase not in PROFILE_PHASES:
+        raise HTTPException(404, f"phase must be one of: {', '.join(PROFILE_PHASES)}")
+    path = _profile_path(run_id, phase).with_suffix(f".{format}")
+    if not path.exists():
+        raise HTTPException(404, "Profile dump not found")
+    media_type = "text/plain; charset=utf-8" if format == "txt" else "application/octet-stream"
+    return FileResponse(str(path), filename=path.name, media_type=media_type)
+
+
+@router.get("/api/v1/unity-exchange/okx-contracts")
+async def list_okx_contract_values(current_user: str = Depends(get_current_user)):
+    values = await run_in_threadpool(OKX_CONTRACT_REGISTRY.snapshot)
+    return {
+        "status": "success",
+        "items": [
+            {
+                "symbol": v.symbol,
+                "contract_value": v.contract_value,
+                "confidence": v.confidence,
+                "samples": v.samples,
+                "last_seen": v.last_seen.isoformat() if v.last_seen else None,
+            }
+            for v in sorted(values.values(), key=lambda v: v.symbol)
+        ],
+    }
+
+
+def _owned_entry(run_id: str, current_user: str) -> Dict[str, Any]:
+    cleanup_unity_exchange_cache()
+    with CACHE_LOCK:
+        cached = UNITY_EXCHANGE_CACHE.get(run_id)
+    if not cached:
+        raise HTTPException(404, "Run expired or not found")
+    if cached.get("owner") != current_user:
+        raise HTTPException(403, "Forbidden")
+    return cached
+
+
+def _profile_path(run_id: str, phase: str) -> Path:
+    return UNITY_EXCHANGE_PROFILE_DIR / f"{run_id}_{phase}.prof"
+
+
+def _profile_files(run_id: str) -> List[Path]:
+    return [_profile_path(run_id, phase).with_suffix(ext) for phase in PROFILE_PHASES for ext in (".prof", ".txt")]
+
+
+def _run_unity_exchange_batch_sync(
+    unity_path: str, exchange_files: List[Tuple[str, str]], params_dict: dict
+) -> BatchReconcileResult:
+    return reconcile_batch_to_report(
+        unity_xlsx_path=Path(unity_path),
+        exchange_files=[(t, Path(p)) for t, p in exchange_files],
+        report_dir=UNITY_EXCHANGE_REPORT_DIR,
+        params=ReconcileParams(**(params_dict or {})),
+        parse_cache=PARSE_CACHE,
+    )
+
+
+def _prepare_unity_exchange_sync(
+    run_id: str, unity_path: str, exchange_path: str, exchange_type: str, params_dict: dict, preview_limit: int
+) -> Tuple[PendingReport, Path, Dict[str, Dict[str, Any]]]:
     params = ReconcileParams(**(params_dict or {}))
-    res = reconcile_to_report(
+    pending = prepare_reconcile_report(
         unity_xlsx_path=Path(unity_path),
         exchange_path=Path(exchange_path),
         report_dir=UNITY_EXCHANGE_REPORT_DIR,
         exchange_type=exchange_type,
         params=params,
+        parse_cache=PARSE_CACHE,
+        profile_path=_profile_path(run_id, "prepare") if params.profile_dump else None,
     )
-    return {
-        "report_path": str(res.report_path),
-        "report_filename": os.path.basename(str(res.report_path)),
-        "exchange_name": res.summary.exchange_name,
-        "summary": res.summary.__dict__,
-    }
+    tables_dir = save_result_tables(pending)
+    pages = {t: read_result_page(tables_dir, t, limit=preview_limit) for t in RESULT_TABLES}
+    return pending, tables_dir, pages
+
+
+def _update_report_state(run_id: str, **fields) -> bool:
+    with CACHE_LOCK:
+        cached = UNITY_EXCHANGE_CACHE.get(run_id)
+        if cached is None:
+            return False
+        cached.update(fields)
+        return True
+
+
+def _write_report_job(run_id: str, pending: PendingReport) -> None:
+    def _progress(done: int, total: int) -> None:
+        _update_report_state(run_id, progress=round(done / total, 3) if total else 1.0)
+
+    profile_path = _profile_path(run_id, "write") if pending.params.profile_dump else None
+    try:
+        result = write_pending_report(pending, _progress, profile_path)
+    except Exception as e:
+        log.error("unity-exchange report error: %s", e, exc_info=True)
+        _update_report_state(run_id, report_status="failed", error=str(e))
+        return
+
+    if not _update_report_state(
+        run_id, report_status="ready", progress=1.0, stage_profile=result.summary.stage_profile
+    ):
+        cleanup_files(str(pending.report_path), *[str(p) for p in _profile_files(run_id)])
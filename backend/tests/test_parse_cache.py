@@ -0,0 +1,47 @@
+import threading
+
+import pandas as pd
+
+from reconcile import cache as cache_mod
+from reconcile.cache import ParsedUploadCache
+
+READERS = 4
+
+
+def test_get_frames_reads_parquet_outside_lock(tmp_path, monkeypatch):
+    parse_cache = ParsedUploadCache(tmp_path, 1 << 30)
+    frame = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+    assert parse_cache.put_frames("k", {"frame": frame}, {"rows": 3})
+
+    barrier = threading.Barrier(READERS, timeout=5)
+    read_parquet = pd.read_parquet
+
+    def _read_parquet(path, *args, **kwargs):
+        barrier.wait()
+        return read_parquet(path, *args, **kwargs)
+
+    monkeypatch.setattr(cache_mod.pd, "read_parquet", _read_parquet)
+    results = [None] * READERS
+
+    def _get(i):
+        results[i] = parse_cache.get_frames("k")
+
+    threads = [threading.Thread(target=_get, args=(i,)) for i in range(READERS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not barrier.broken
+    for frames, meta in results:
+        pd.testing.assert_frame_equal(frames["frame"], frame)
+        assert meta == {"rows": 3}
+
+
+def test_get_frames_drops_unreadable_entry(tmp_path):
+    parse_cache = ParsedUploadCache(tmp_path, 1 << 30)
+    assert parse_cache.put_frames("k", {"frame": pd.DataFrame({"a": [1]})})
+    (tmp_path / "k" / "frame.parquet").write_bytes(b"broken")
+
+    assert parse_cache.get_frames("k") is None
+    assert not (tmp_path / "k").exists()
@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+from reconcile.models import ReconcileParams
+from reconcile.reporter import _write_report_xlsx
+
+
+def test_empty_cells_keep_column_number_format(tmp_path):
+    df = pd.DataFrame(
+        {
+            "Символ": ["BTCUSDT", "ETHUSDT", "SOLUSDT"],
+            "Score": [0.5, np.nan, 1.25],
+            "Qty": [np.nan, 0.1, 2.0],
+        }
+    )
+    path = tmp_path / "report.xlsx"
+    _write_report_xlsx(path, [("matched", "Matches", df)], ReconcileParams(qty_decimals=3), lambda rows: None)
+
+    ws = load_workbook(path)["Matches"]
+    assert [ws.cell(row=r, column=2).number_format for r in range(2, 5)] == ["0.00"] * 3
+    assert [ws.cell(row=r, column=3).number_format for r in range(2, 5)] == ["0.000"] * 3
+    assert ws.cell(row=3, column=2).value is None
+    assert ws.cell(row=2, column=3).value is None
+    assert ws.cell(row=2, column=1).number_format == "General"
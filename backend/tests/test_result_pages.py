@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from reconcile.models import PendingReport, ReconcileParams, ReconcileSummary
+from reconcile.results import RESULT_ROW_GROUP_ROWS, read_result_page, save_result_tables
+
+ROWS = 3 * RESULT_ROW_GROUP_ROWS + 17
+
+
+def _summary() -> ReconcileSummary:
+    return ReconcileSummary(
+        exchange_name="BINANCE",
+        rows_exchange=ROWS,
+        rows_unity=ROWS,
+        matched_strict=ROWS,
+        matched_fuzzy=0,
+        matched_notional=0,
+        missing_in_unity=0,
+        extra_in_unity=0,
+        volume_symbols_exchange=0,
+        volume_symbols_unity=0,
+        volume_symbols_ok=0,
+        volume_symbols_diff=0,
+        volume_symbols_only_exchange=0,
+        volume_symbols_only_unity=0,
+        volume_total_qty_exchange=0.0,
+        volume_total_qty_unity=0.0,
+        volume_total_notional_exchange=0.0,
+        volume_total_notional_unity=0.0,
+        exchange_time_range_utc="",
+        unity_time_range_utc="",
+    )
+
+
+@pytest.fixture
+def tables_dir(tmp_path):
+    matched = pd.DataFrame(
+        {
+            "n": np.arange(ROWS),
+            "Тип_совпадения": np.where(np.arange(ROWS) < RESULT_ROW_GROUP_ROWS, "STRICT", "FUZZY"),
+            "Биржа_Символ": "BTCUSDT",
+        }
+    )
+    pending = PendingReport(
+        report_id="r",
+        report_path=tmp_path / "report.xlsx",
+        summary=_summary(),
+        params=ReconcileParams(),
+        tables={"matched": matched},
+    )
+    return save_result_tables(pending)
+
+
+@pytest.fixture
+def row_group_reads(monkeypatch):
+    reads = []
+    original = pq.ParquetFile.read_row_group
+
+    def _read_row_group(self, i, *args, **kwargs):
+        reads.append(i)
+        return original(self, i, *args, **kwargs)
+
+    monkeypatch.setattr(pq.ParquetFile, "read_row_group", _read_row_group)
+    return reads
+
+
+def test_results_written_in_row_groups(tables_dir):
+    meta = pq.ParquetFile(tables_dir / "matches" / "part-00000.parquet").metadata
+    assert meta.num_row_groups == 4
+    assert meta.row_group(0).num_rows == RESULT_ROW_GROUP_ROWS
+
+
+def test_page_reads_only_its_row_group(tables_dir, row_group_reads):
+    page = read_result_page(tables_dir, "matches", offset=2 * RESULT_ROW_GROUP_ROWS + 5, limit=50)
+    assert row_group_reads == [2]
+    assert [r["n"] for r in page["rows"]] == list(range(2 * RESULT_ROW_GROUP_ROWS + 5, 2 * RESULT_ROW_GROUP_ROWS + 55))
+    assert page["total"] == ROWS
+
+
+def test_filtered_page_reads_only_its_row_group(tables_dir, row_group_reads):
+    page = read_result_page(tables_dir, "matches", status="STRICT", symbol="btcusdt", limit=20)
+    assert row_group_reads == [0]
+    assert page["total"] == RESULT_ROW_GROUP_ROWS
+    assert [r["n"] for r in page["rows"]] == list(range(20))
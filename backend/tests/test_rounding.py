@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from reconcile.models import ReconcileParams
+from reconcile.normalizers import _add_key_ticks, _assign_match_codes, _match_key_display, _notional_key_display
+from reconcile.utils import (
+    TICKS_NA,
+    _half_up_scaled,
+    _qround_float,
+    _qround_float_array,
+    _qround_str,
+    _qround_ticks,
+    _ticks_to_str,
+)
+
+
+def _frame(qty, price):
+    df = pd.DataFrame({
+        "symbol": "SHIBUSDT",
+        "side": "BUY",
+        "qty": np.asarray(qty, dtype=float),
+        "price": np.asarray(price, dtype=float),
+        "minute_utc": pd.Timestamp("2024-01-02 10:00"),
+    })
+    _add_key_ticks(df, ReconcileParams())
+    return df
+
+
+def test_qround_ticks_overflow_is_na_instead_of_raising():
+    ticks = _qround_ticks(pd.Series([1.5e11, 2.0]), 8)
+    assert ticks[0] == TICKS_NA
+    assert ticks[1] == 200_000_000
+
+
+def test_overflowing_qty_is_keyed_by_decimal_string():
+    params = ReconcileParams()
+    unity_n = _frame([1.5e11, 1.6e11, np.nan, 2.0], [1e-5, 1e-5, 1e-5, 3.0])
+    exchange_n = _frame([1.6e11, 1.5e11, 1.7e11, 2.0], [1e-5, 1e-5, 1e-5, 3.0])
+    _assign_match_codes(unity_n, exchange_n, params)
+
+    u, e = unity_n["match_code"].to_numpy(), exchange_n["match_code"].to_numpy()
+    assert u[0] == e[1]
+    assert u[1] == e[0]
+    assert u[3] == e[3]
+    assert len({u[0], u[1], u[2], e[2], u[3]}) == 5
+    assert _match_key_display(unity_n, params).iloc[0] == "SHIBUSDT|BUY|150000000000.00000000|0.00001000"
+
+
+def test_overflowing_notional_is_keyed_by_decimal_string():
+    params = ReconcileParams()
+    unity_n = _frame([1e13, 2e13], [1.0, 1.0])
+    exchange_n = _frame([2e13, 1e13], [1.0, 1.0])
+    assert (unity_n["notional_ticks"] == TICKS_NA).all()
+    _assign_match_codes(unity_n, exchange_n, params)
+
+    u, e = unity_n["notional_code"].to_numpy(), exchange_n["notional_code"].to_numpy()
+    assert u[0] == e[1] and u[1] == e[0] and u[0] != u[1]
+    assert _notional_key_display(unity_n, params).iloc[0].endswith("|10000000000000.000000")
+
+
+DECIMALS = (0, 2, 3, 6, 8)
+
+
+def _sample_values(decimals, n=4000, seed=0):
+    rng = np.random.default_rng(seed + decimals)
+    magnitude = 10.0 ** rng.uniform(-decimals - 1, 9 - decimals, n)
+    random = np.array([round(float(v), int(d)) for v, d in zip(magnitude * rng.uniform(0.1, 1.0, n), rng.integers(0, 12, n))])
+    half = (rng.integers(0, 10 ** 6, n) + 0.5) / 10.0 ** decimals
+    edge = np.array([0.0, 0.5, 1.5, 2.5, 0.005, 0.015, 1.005, 2.675, 1e-9, 999999.9999995, 0.125, 0.375])
+    return np.concatenate([random, half, edge / 10.0 ** max(decimals - 2, 0), edge])
+
+
+def _reference_str(values, decimals):
+    return np.array([_qround_str(float(v), decimals) for v in values], dtype=object)
+
+
+@pytest.mark.parametrize("decimals", DECIMALS)
+def test_qround_ticks_matches_decimal_reference(decimals):
+    values = _sample_values(decimals)
+    got = _ticks_to_str(_qround_ticks(values, decimals), decimals)
+    expected = _reference_str(values, decimals)
+    bad = np.flatnonzero(got != expected)
+    assert not len(bad), [(values[i], got[i], expected[i]) for i in bad[:10]]
+
+
+@pytest.mark.parametrize("decimals", DECIMALS)
+def test_qround_float_array_matches_decimal_reference(decimals):
+    values = np.concatenate([_sample_values(decimals), -_sample_values(decimals, seed=7)])
+    got = _qround_float_array(values, decimals)
+    expected = np.array([_qround_float(float(v), decimals) for v in values])
+    bad = np.flatnonzero(got != expected)
+    assert not len(bad), [(values[i], got[i], expected[i]) for i in bad[:10]]
+
+
+@pytest.mark.parametrize("decimals", DECIMALS)
+def test_half_up_scaled_marks_only_safe_values_exact(decimals):
+    values = _sample_values(decimals)
+    scaled, exact = _half_up_scaled(values, decimals)
+    expected = np.array([float(_qround_str(float(v), decimals)) for v in values]) * 10.0 ** decimals
+    assert np.array_equal(scaled[exact], np.round(expected[exact]))
+
+
+def test_qround_ticks_handles_nan_and_negative():
+    ticks = _qround_ticks(pd.Series([np.nan, -1.005, -2.5, None]), 2)
+    assert ticks[0] == TICKS_NA and ticks[3] == TICKS_NA
+    assert list(_ticks_to_str(ticks[1:3], 2)) == [_qround_str(-1.005, 2), _qround_str(-2.5, 2)]
+
+
+@pytest.mark.parametrize("value, decimals", [(1.5e11, 8), (9.3e12, 6), (-2.0e11, 8), (9.3e18, 0)])
+def test_qround_ticks_int64_overflow(value, decimals):
+    ticks = _qround_ticks(np.array([value, 1.0]), decimals)
+    assert ticks[0] == TICKS_NA
+    assert ticks[1] == 10 ** decimals
+    assert _qround_float_array(np.array([value]), decimals)[0] == _qround_float(value, decimals)
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from reconcile.engine import _combine_matches, _status_frame
+
+
+def _legacy_status(exchange_n, unity_n, matched_strict, matched_fuzzy, matched_notional):
+    ex_status = exchange_n.copy()
+    ex_status["status"] = "НЕТ_В_UNITY"
+    ex_status["matched_unity_idx"] = np.nan
+
+    uni_status = unity_n.copy()
+    uni_status["status"] = "ЛИШНЕЕ_В_UNITY"
+    uni_status["matched_exchange_idx"] = np.nan
+
+    def _apply_matches(mdf, label):
+        if mdf is None or mdf.empty:
+            return
+        for _, r in mdf.iterrows():
+            eidx = int(r["exchange_idx"])
+            uidx = int(r["unity_idx"])
+            ex_status.loc[eidx, "status"] = f"СОВПАЛО_{label}"
+            ex_status.loc[eidx, "matched_unity_idx"] = uidx
+            uni_status.loc[uidx, "status"] = f"СОВПАЛО_{label}"
+            uni_status.loc[uidx, "matched_exchange_idx"] = eidx
+
+    _apply_matches(matched_strict, "STRICT")
+    _apply_matches(matched_fuzzy, "FUZZY")
+    _apply_matches(matched_notional, "ОБЪЕМ")
+    return ex_status, uni_status
+
+
+def _side_frame(rng, n, offset):
+    index = rng.permutation(np.arange(offset, offset + 3 * n, 3))
+    return pd.DataFrame(
+        {
+            "symbol": rng.choice(["BTCUSDT", "ETHUSDT", "SOLUSDT"], n),
+            "side": rng.choice(["BUY", "SELL"], n),
+            "qty": rng.integers(1, 5000, n) / 1000,
+            "price": np.round(rng.uniform(1, 1000, n), 2),
+            "trade_dt_utc": pd.Timestamp("2024-01-02") + pd.to_timedelta(rng.integers(0, 86400, n), unit="s"),
+        },
+        index=index,
+    )
+
+
+def _generated(seed, n_exchange=400, n_unity=380, n_matched=300):
+    rng = np.random.default_rng(seed)
+    exchange_n = _side_frame(rng, n_exchange, 7)
+    unity_n = _side_frame(rng, n_unity, 1000)
+    e_idx = rng.choice(exchange_n.index.to_numpy(), n_matched, replace=False)
+    u_idx = rng.choice(unity_n.index.to_numpy(), n_matched, replace=False)
+    kind = rng.choice(3, n_matched, p=[0.7, 0.2, 0.1])
+    matched_strict = pd.DataFrame({"exchange_idx": e_idx[kind == 0], "unity_idx": u_idx[kind == 0], "key": "k"})
+    matched_fuzzy = pd.DataFrame({"exchange_idx": e_idx[kind == 1], "unity_idx": u_idx[kind == 1], "score": 1.0})
+    matched_notional = pd.DataFrame({"exchange_idx": e_idx[kind == 2], "unity_idx": u_idx[kind == 2], "key": "n"})
+    return exchange_n, unity_n, matched_strict, matched_fuzzy, matched_notional
+
+
+def _assert_status_equal(exchange_n, unity_n, matched_strict, matched_fuzzy, matched_notional):
+    ex_old, uni_old = _legacy_status(exchange_n, unity_n, matched_strict, matched_fuzzy, matched_notional)
+    matched_all = _combine_matches(matched_strict, matched_fuzzy, matched_notional)
+    ex_new = _status_frame(exchange_n, "НЕТ_В_UNITY", "matched_unity_idx", matched_all, "exchange_idx", "unity_idx")
+    uni_new = _status_frame(unity_n, "ЛИШНЕЕ_В_UNITY", "matched_exchange_idx", matched_all, "unity_idx", "exchange_idx")
+    pd.testing.assert_frame_equal(ex_new, ex_old)
+    pd.testing.assert_frame_equal(uni_new, uni_old)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_status_frame_matches_legacy_loop(seed):
+    _assert_status_equal(*_generated(seed))
+
+
+def test_status_frame_without_matches_matches_legacy_loop():
+    exchange_n, unity_n, matched_strict, matched_fuzzy, matched_notional = _generated(11)
+    _assert_status_equal(exchange_n, unity_n, matched_strict.iloc[:0], matched_fuzzy.iloc[:0], matched_notional.iloc[:0])
@@ -1,5 +1,6 @@
 import os
 import logging
+import shutil
 from datetime import datetime, timedelta
 from threading import Lock
 from typing import Dict, Any
@@ -35,6 +36,24 @@ def cleanup_cache():
                 LAST_RESULT_BY_USER.pop(user, None)
 
 
+def _remove_unity_exchange_files(entry: Dict[str, Any]) -> None:
+    try:
+        rp = entry.get("report_path")
+        if rp and os.path.exists(rp):
+            os.remove(rp)
+    except Exception:
+        pass
+    for key in ("parts_dir", "tables_dir"):
+        if entry.get(key):
+            shutil.rmtree(entry[key], ignore_errors=True)
+    for path in entry.get("profile_files") or []:
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+        except Exception:
+            pass
+
+
 def cleanup_unity_exchange_cache():
     now = datetime.now()
     ttl = timedelta(minutes=CACHE_TTL_MINUTES)
@@ -42,22 +61,12 @@ def cleanup_unity_exchange_cache():
     with CACHE_LOCK:
         expired = [k for k, v in UNITY_EXCHANGE_CACHE.items() if (now - v.get("created_at", now)) > ttl]
         for k in expired:
-            try:
-                rp = UNITY_EXCHANGE_CACHE[k].get("report_path")
-                if rp and os.path.exists(rp):
-                    os.remove(rp)
-            except Exception:
-                pass
+            _remove_unity_exchange_files(UNITY_EXCHANGE_CACHE[k])
             UNITY_EXCHANGE_CACHE.pop(k, None)
 
         while len(UNITY_EXCHANGE_CACHE) > CACHE_MAX_ITEMS:
             oldest = min(UNITY_EXCHANGE_CACHE.keys(), key=lambda k: UNITY_EXCHANGE_CACHE[k]["created_at"])
-            try:
-                rp = UNITY_EXCHANGE_CACHE[oldest].get("report_path")
-                if rp and os.path.exists(rp):
-                    os.remove(rp)
-            except Exception:
-                pass
+            _remove_unity_exchange_files(UNITY_EXCHANGE_CACHE[oldest])
             UNITY_EXCHANGE_CACHE.pop(oldest, None)
 
         valid = set(UNITY_EXCHANGE_CACHE.keys())
@@ -12,6 +12,7 @@ const UnityExchangePage = () => {
   const [exchangeFile, setExchangeFile] = useState(null);
   const [loading, setLoading] = useState(false);
   const [loadingExport, setLoadingExport] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [result, setResult] = useState(null);
   const [activeTab, setActiveTab] = useState("matches");
   const [params, setParams] = useState({
@@ -54,7 +55,7 @@ const UnityExchangePage = () => {
       fd.append("exchange_file", exchangeFile);
       fd.append("exchange_type", exchangeType);
       fd.append("params_json", JSON.stringify(params));
-      fd.append("preview_limit", "2000");
+      fd.append("preview_limit", "500");
       const { data } = await api.post("/unity-exchange/run", fd, { headers: { "Content-Type": "multipart/form-data" } });
       setResult(data);
       setActiveTab("matches");
@@ -66,11 +67,33 @@ const UnityExchangePage = () => {
     }
   };
 
+  const loadMore = async () => {
+    const cursor = result?.preview_cursors?.[activeTab];
+    if (!result?.run_id || !cursor) return;
+    setLoadingMore(true);
+    try {
+      const { data } = await api.get(`/unity-exchange/results/${result.run_id}/${activeTab}`, { params: { cursor, limit: 500 } });
+      setResult((prev) => ({
+        ...prev,
+        preview: { ...prev.preview, [activeTab]: [...(prev.preview?.[activeTab] || []), ...data.rows] },
+        preview_cursors: { ...prev.preview_cursors, [activeTab]: data.next_cursor },
+      }));
+    } catch (e) {
+      toast.error(e?.response?.data?.detail || e.message);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const exportExcel = async () => {
     if (!result?.run_id) return toast.error("Нет run_id для экспорта");
     setLoadingExport(true);
     try {
-      const res = await api.get(`/unity-exchange/export/${result.run_id}`, { responseType: "blob" });
+      let res = await api.get(`/unity-exchange/export/${result.run_id}`, { responseType: "blob" });
+      while (res.status === 202) {
+        await new Promise((resolve) => setTimeout(resolve, 1000));
+        res = await api.get(`/unity-exchange/export/${result.run_id}`, { responseType: "blob" });
+      }
       const url = window.URL.createObjectURL(new Blob([res.data]));
       const a = document.createElement("a");
       a.href = url;
@@ -138,7 +161,7 @@ const UnityExchangePage = () => {
           <div style={{ padding: 12, borderBottom: "1px solid #e2e8f0", display: "flex", alignItems: "center", gap: 10, flexWrap: "wrap" }}>
             {tabs.map((t) => (
               <button key={t.id} onClick={() => setActiveTab(t.id)} style={{ padding: "8px 10px", borderRadius: 10, border: "1px solid #e2e8f0", background: activeTab === t.id ? "#0f172a" : "#fff", color: activeTab === t.id ? "#fff" : "#334155", fontWeight: 400, cursor: "pointer" }}>
-                {t.label} <span style={{ marginLeft: 6, fontSize: 12, opacity: 0.85 }}>{result.preview?.[t.id]?.length ?? 0}</span>
+                {t.label} <span style={{ marginLeft: 6, fontSize: 12, opacity: 0.85 }}>{result.preview_totals?.[t.id] ?? result.preview?.[t.id]?.length ?? 0}</span>
               </button>
             ))}
             <div style={{ marginLeft: "auto" }}>
@@ -156,6 +179,14 @@ const UnityExchangePage = () => {
           <div style={{ flex: 1, minHeight: 0, padding: 12 }}>
             <ResultTable rows={result.preview?.[activeTab] || []} />
           </div>
+
+          {result.preview_cursors?.[activeTab] && (
+            <div style={{ padding: 12, borderTop: "1px solid #f1f5f9", display: "flex", justifyContent: "center" }}>
+              <button onClick={loadMore} disabled={loadingMore} style={{ padding: "8px 14px", borderRadius: 10, border: "1px solid #e2e8f0", background: "#fff", color: "#334155", fontWeight: 400, cursor: loadingMore ? "wait" : "pointer", display: "flex", alignItems: "center", gap: 8 }}>
+                {loadingMore ? <Loader size={16} className="spin" /> : null} Загрузить ещё ({result.preview?.[activeTab]?.length ?? 0} из {result.preview_totals?.[activeTab] ?? 0})
+              </button>
+            </div>
+          )}
         </div>
       )}
 